@@ -0,0 +1,12 @@
+#!/usr/bin/env bash
+
+set -e
+
+cd "$(dirname "$0")/../src"
+
+# Fails without a baseline; record one on the machine the benchmarks run on with
+# make bench-baseline first, as results from other machines aren't comparable.
+../venv/bin/python -m benchmarks.suite \
+  --output ../ci/bench/reports/results.json \
+  --baseline ../ci/bench/baseline.json \
+  "$@"
@@ -0,0 +1,66 @@
+import io
+import os
+import random
+import tempfile
+import time
+
+from mars_rover.archive import MissionArchive
+from mars_rover.archive import archive_from_text
+from mars_rover.archive import text_from_archive
+from mars_rover.domain import Rover
+from mars_rover.domain import Surface
+from mars_rover.streaming import MissionReader
+
+
+def mission_text(missions: int, commands: int, seed: int = 0) -> str:
+    generator = random.Random(seed)
+    return ''.join(
+        f'{generator.randrange(1000)} {generator.randrange(1000)} {generator.choice("NESW")}\n'
+        + ''.join(generator.choice('fblr') for _ in range(commands)) + '\n'
+        for _ in range(missions)
+    )
+
+
+def main(missions: int = 2_000, commands: int = 5_000) -> None:
+    surface = Surface.of_size(999)
+    text = mission_text(missions, commands)
+    with tempfile.TemporaryDirectory() as directory:
+        text_path = os.path.join(directory, 'missions.txt')
+        archive_path = os.path.join(directory, 'missions.mrm')
+        with open(text_path, 'w') as text_file:
+            text_file.write(text)
+        started = time.perf_counter()
+        archive_from_text(io.StringIO(text), archive_path, surface)
+        converted = time.perf_counter() - started
+        text_size = os.path.getsize(text_path)
+        archive_size = os.path.getsize(archive_path)
+        print(f'sizes           text {text_size:,} bytes, archive {archive_size:,} bytes')
+        print(f'conversion      {text_size / converted / 1e6:>8.1f} MB of text/s')
+        started = time.perf_counter()
+        with open(text_path, 'rb') as text_file:
+            for _ in MissionReader(surface=surface).reports_from(text_file):
+                pass
+        print(f'text run        {missions * commands / (time.perf_counter() - started):>14,.0f} commands/s')
+        started = time.perf_counter()
+        for mission in MissionArchive.load(archive_path).missions():
+            for _ in mission.pieces():
+                pass
+        decoded = time.perf_counter() - started
+        print(f'archive decode  {missions * commands / decoded:>14,.0f} commands/s'
+              f' ({archive_size / decoded / 1e6:.1f} MB/s)')
+        started = time.perf_counter()
+        with open(os.devnull, 'w') as null:
+            text_from_archive(MissionArchive.load(archive_path), null)
+        print(f'archive to text {text_size / (time.perf_counter() - started) / 1e6:>8.1f} MB of text/s')
+        started = time.perf_counter()
+        for mission in MissionArchive.load(archive_path).missions():
+            rover = Rover(mission.position(), surface)
+            for piece in mission.pieces():
+                rover.execute_until_blocked(piece)
+                if rover.obstacle() is not None:
+                    break
+        print(f'archive run     {missions * commands / (time.perf_counter() - started):>14,.0f} commands/s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+import random
+import time
+
+from mars_rover.domain import CommandDistances
+from mars_rover.domain import Coordinates
+from mars_rover.domain import DenseObstacles
+from mars_rover.domain import Direction
+from mars_rover.domain import Position
+from mars_rover.domain import Surface
+from mars_rover.domain import Unreachable
+
+
+def random_position(generator: random.Random, size: int) -> Position:
+    return Position(
+        Direction.for_symbol(generator.choice('NESW')),
+        Coordinates(generator.randrange(size), generator.randrange(size)),
+    )
+
+
+def main(size: int = 300, sites: int = 20, queries: int = 200_000, updates: int = 50) -> None:
+    generator = random.Random(22)
+    points = [Coordinates(generator.randrange(size), generator.randrange(size)) for _ in range(size * size // 8)]
+    obstacles = DenseObstacles.at(points, size, size)
+    surface = Surface.of_size(size - 1, size - 1, obstacles)
+    started = time.perf_counter()
+    distances = CommandDistances.to_sites(surface, [random_position(generator, size) for _ in range(sites)])
+    elapsed = time.perf_counter() - started
+    print(f'tables of {sites} sites on a {size}x{size} surface: {elapsed:.2f} s'
+          f' ({elapsed / sites * 1e3:.0f} ms a site)')
+
+    positions = [(random_position(generator, size), generator.randrange(sites)) for _ in range(queries)]
+    started = time.perf_counter()
+    for position, site in positions:
+        try:
+            distances.commands_to(position, site)
+        except Unreachable:
+            pass
+    elapsed = time.perf_counter() - started
+    print(f'{queries} queries: {elapsed:.2f} s ({elapsed / queries * 1e9:.0f} ns a query)')
+
+    points = [Coordinates(generator.randrange(size), generator.randrange(size)) for _ in range(updates * 2)]
+    points = [point for point in points if point not in obstacles][:updates]
+    started = time.perf_counter()
+    for point in points:
+        distances.add_obstacle(point)
+        distances.remove_obstacle(point)
+    elapsed = time.perf_counter() - started
+    print(f'{len(points)} obstacles added and removed: {elapsed / len(points) / sites * 1e3:.1f} ms a site each time')
+
+
+if __name__ == '__main__':
+    main()
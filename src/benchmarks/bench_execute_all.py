@@ -0,0 +1,43 @@
+import random
+import time
+
+from mars_rover.application import MarsRoverApplication
+from mars_rover.domain import Surface
+
+
+def command_log(length: int, seed: int = 0) -> str:
+    generator = random.Random(seed)
+    return ''.join(generator.choice('fblr') for _ in range(length))
+
+
+def per_command(commands: str) -> float:
+    app = MarsRoverApplication.landing_with('2 2 N')
+    started = time.perf_counter()
+    for command in commands:
+        app.execute(command)
+    return time.perf_counter() - started
+
+
+def all_at_once(commands: str) -> float:
+    app = MarsRoverApplication.landing_with('2 2 N')
+    started = time.perf_counter()
+    app.execute_all(commands)
+    return time.perf_counter() - started
+
+
+def far_from_the_edges(commands: str) -> float:
+    app = MarsRoverApplication.landing_with('2000000 2000000 N', Surface.of_size(4_000_000))
+    started = time.perf_counter()
+    app.execute_all(commands)
+    return time.perf_counter() - started
+
+
+def main(length: int = 1_000_000) -> None:
+    commands = command_log(length)
+    for name, run in (('execute', per_command), ('execute_all', all_at_once), ('interior', far_from_the_edges)):
+        elapsed = run(commands)
+        print(f'{name:<12} {length / elapsed:>14,.0f} commands/s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,33 @@
+import time
+from typing import Sequence
+
+import numpy as np
+
+from mars_rover.domain import Surface
+from mars_rover.fleet import VectorizedFleet
+
+
+def landed_fleet(size: int, generator: np.random.RandomState) -> VectorizedFleet:
+    return VectorizedFleet(
+        generator.randint(0, 6, size),
+        generator.randint(0, 6, size),
+        generator.randint(0, 4, size),
+        Surface.of_size(5),
+    )
+
+
+def main(sizes: Sequence[int] = (1_000, 100_000, 1_000_000), ticks: int = 20) -> None:
+    generator = np.random.RandomState(0)
+    commands = np.frombuffer(b'fblr', dtype=np.uint8)
+    for size in sizes:
+        fleet = landed_fleet(size, generator)
+        workload = [generator.choice(commands, size) for _ in range(ticks)]
+        started = time.perf_counter()
+        for tick in workload:
+            fleet.tick(tick)
+        elapsed = time.perf_counter() - started
+        print(f'{size:>10,} rovers {elapsed / ticks * 1e3:>10.3f} ms/tick {size * ticks / elapsed:>16,.0f} commands/s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,40 @@
+import contextvars
+import time
+
+from mars_rover.domain import Coordinates
+from mars_rover.domain import Direction
+from mars_rover.domain import Position
+from mars_rover.domain import Rover
+from mars_rover.domain import Surface
+from mars_rover.instrumentation import Registry
+from mars_rover.instrumentation import instrumented
+
+
+def timed(commands: str, surface: Surface, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        rover = Rover(Position(Direction.for_symbol('N'), Coordinates(500, 500)), surface)
+        started = time.perf_counter()
+        rover.execute_all(commands)
+        best = min(best, time.perf_counter() - started)
+    return len(commands) / best
+
+
+def main(length: int = 1_000_000, repeat: int = 5) -> None:
+    commands = ('ffrffrfflbbl' * length)[:length]
+    surface = Surface.of_size(1000)
+    before = timed(commands, surface, repeat)
+    with instrumented(Registry()) as registry:
+        enabled = timed(commands, surface, 1)
+        # Code outside of the block, as in another thread or task, runs the plain methods.
+        elsewhere = contextvars.Context().run(timed, commands, surface, repeat)
+    after = timed(commands, surface, repeat)
+    print(f'never enabled {before:>14,.0f} commands/s')
+    print(f'enabled       {enabled:>14,.0f} commands/s')
+    print(f'elsewhere     {elsewhere:>14,.0f} commands/s')
+    print(f'disabled      {after:>14,.0f} commands/s')
+    print(registry.dump(), end='')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,32 @@
+import random
+import time
+
+from mars_rover.application import MarsRoverApplication
+from mars_rover.domain import Surface
+from mars_rover.memo import MemoizingExecutor
+
+
+def main(route_length: int = 100_000, ending_length: int = 100, missions: int = 200) -> None:
+    generator = random.Random(2019)
+    surface = Surface.of_size(1_000_000)
+    route = ''.join(generator.choice('fblr') for _ in range(route_length))
+    command_logs = [
+        route + ''.join(generator.choice('fblr') for _ in range(ending_length))
+        for _ in range(missions)
+    ]
+    started = time.perf_counter()
+    for commands in command_logs:
+        app = MarsRoverApplication.landing_with('500000 500000 N', surface)
+        app.execute_all(commands)
+    plain = time.perf_counter() - started
+    executor = MemoizingExecutor(surface)
+    started = time.perf_counter()
+    for commands in command_logs:
+        executor.execute('500000 500000 N', commands)
+    memoized = time.perf_counter() - started
+    print(f'plain    {missions / plain:>12,.0f} missions/s')
+    print(f'memoized {missions / memoized:>12,.0f} missions/s ({executor.statistics()!r})')
+
+
+if __name__ == '__main__':
+    main()
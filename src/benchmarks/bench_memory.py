@@ -0,0 +1,48 @@
+import tracemalloc
+from typing import Callable
+from typing import List
+
+from mars_rover.domain import Coordinates
+from mars_rover.domain import Direction
+from mars_rover.domain import Position
+
+
+# The layouts Coordinates and Position had before they gained __slots__.
+class _DictCoordinates:
+
+    def __init__(self, horizontal: int, vertical: int) -> None:
+        self._horizontal = horizontal
+        self._vertical = vertical
+
+
+class _DictPosition:
+
+    def __init__(self, direction: Direction, coordinates: _DictCoordinates) -> None:
+        self._direction = direction
+        self._coordinates = coordinates
+
+
+def bytes_for(count: int, position_at: Callable[[int], object]) -> int:
+    tracemalloc.start()
+    try:
+        positions: List[object] = [position_at(index) for index in range(count)]
+        size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del positions
+    return size
+
+
+def main(count: int = 1_000_000) -> None:
+    north = Direction.north()
+    layouts = (
+        ('before', lambda index: _DictPosition(north, _DictCoordinates(index, index))),
+        ('after', lambda index: Position(north, Coordinates(index, index))),
+    )
+    for name, position_at in layouts:
+        size = bytes_for(count, position_at)
+        print(f'{name:<8} {size * 1_000_000 // count:>14,} bytes per 1M positions')
+
+
+if __name__ == '__main__':
+    main()
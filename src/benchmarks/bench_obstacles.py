@@ -0,0 +1,40 @@
+import os
+import random
+import tempfile
+import time
+
+from mars_rover.domain import Coordinates
+from mars_rover.domain import DenseObstacles
+from mars_rover.domain import Obstacles
+from mars_rover.domain import SparseObstacles
+
+
+def lookups_per_second(obstacles: Obstacles, side: int, lookups: int) -> float:
+    generator = random.Random(1)
+    points = [(generator.randrange(side), generator.randrange(side)) for _ in range(lookups)]
+    blocks = obstacles.blocks
+    started = time.perf_counter()
+    for horizontal, vertical in points:
+        blocks(horizontal, vertical)
+    return lookups / (time.perf_counter() - started)
+
+
+def main(side: int = 10_000, rocks: int = 1_000_000, lookups: int = 1_000_000) -> None:
+    generator = random.Random(0)
+    coordinates = [Coordinates(generator.randrange(side), generator.randrange(side)) for _ in range(rocks)]
+    sparse = SparseObstacles.at(coordinates)
+    dense = DenseObstacles.at(coordinates, side, side)
+    print(f'sparse {lookups_per_second(sparse, side, lookups):>14,.0f} lookups/s')
+    print(f'dense  {lookups_per_second(dense, side, lookups):>14,.0f} lookups/s')
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'rocks.bin')
+        dense.save(path)
+        started = time.perf_counter()
+        mapped = DenseObstacles.load(path)
+        print(f'mapped {side * side:,} cells in {(time.perf_counter() - started) * 1e3:.3f} ms')
+        print(f'mapped {lookups_per_second(mapped, side, lookups):>14,.0f} lookups/s')
+        del mapped
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,39 @@
+import gc
+import random
+import time
+from typing import Sequence
+
+from mars_rover.domain import Coordinates
+from mars_rover.domain import Direction
+from mars_rover.domain import Fleet
+from mars_rover.domain import Position
+from mars_rover.domain import Surface
+
+
+def landed_fleet(size: int, side: int, generator: random.Random) -> Fleet:
+    fleet = Fleet(Surface.of_size(side - 1))
+    for cell in generator.sample(range(side * side), size):
+        fleet.land(Position(Direction.for_code(generator.randrange(4)), Coordinates(cell % side, cell // side)))
+    return fleet
+
+
+def main(sizes: Sequence[int] = (10, 1_000, 100_000, 1_000_000), moves: int = 100_000) -> None:
+    generator = random.Random(0)
+    for size in sizes:
+        # Keep the density at one rover in four cells so that blocked moves are equally likely.
+        side = max(4, int((size * 4) ** 0.5))
+        fleet = landed_fleet(size, side, generator)
+        rovers = fleet.rovers()
+        movers = [rovers[index % size] for index in range(moves)]
+        # Like timeit, keep the collector from walking a million rovers in the middle of the measurement.
+        gc.disable()
+        started = time.perf_counter()
+        for rover in movers:
+            rover.move_forward()
+        elapsed = time.perf_counter() - started
+        gc.enable()
+        print(f'{size:>10,} rovers {elapsed / moves * 1e9:>10,.0f} ns/move')
+
+
+if __name__ == '__main__':
+    main()
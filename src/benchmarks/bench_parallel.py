@@ -0,0 +1,43 @@
+import os
+import random
+import tempfile
+import time
+from typing import Sequence
+
+from mars_rover.parallel import ParallelMissionRunner
+from mars_rover.streaming import MissionReader
+
+
+def write_missions(path: str, records: int, commands_per_record: int, seed: int = 0) -> None:
+    generator = random.Random(seed)
+    with open(path, 'w') as missions:
+        for _ in range(records):
+            missions.write(f'{generator.randint(0, 5)} {generator.randint(0, 5)} {generator.choice("NESW")}\n')
+            missions.write(''.join(generator.choice('fblr') for _ in range(commands_per_record)) + '\n')
+
+
+def main(
+        workers: Sequence[int] = (1, 2, 4, 8),
+        records: int = 4_000,
+        commands_per_record: int = 2_500,
+        records_per_shard: int = 100,
+) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'missions.txt')
+        write_missions(path, records, commands_per_record)
+        with open(path, 'rb') as missions:
+            started = time.perf_counter()
+            expected = list(MissionReader().reports_from(missions))
+            elapsed = time.perf_counter() - started
+        print(f'single process {records / elapsed:>12,.0f} rovers/s')
+        for count in workers:
+            started = time.perf_counter()
+            reports = list(ParallelMissionRunner(count, records_per_shard).reports_from(path))
+            elapsed = time.perf_counter() - started
+            assert reports == expected, f'{count} workers disagree with the single process'
+            print(f'{count:>2} workers     {records / elapsed:>12,.0f} rovers/s')
+    print(f'({os.cpu_count()} CPUs available)')
+
+
+if __name__ == '__main__':
+    main()
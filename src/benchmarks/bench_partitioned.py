@@ -0,0 +1,45 @@
+import os
+import time
+from typing import Sequence
+
+import numpy as np
+
+from mars_rover.domain import Surface
+from mars_rover.fleet import PartitionedFleet
+from mars_rover.fleet import ScheduledFleet
+
+
+def main(workers: Sequence[int] = (1, 2, 4, 8), rovers: int = 1_000_000, ticks: int = 10) -> None:
+    # Rovers on a quarter of the cells of a square surface, like the scheduler benchmark.
+    generator = np.random.RandomState(0)
+    side = int((rovers * 4) ** 0.5)
+    cells = generator.choice(side * side, rovers, replace=False)
+    landing = (cells % side, cells // side, generator.randint(0, 4, rovers), Surface.of_size(side - 1))
+    workload = [generator.choice(np.frombuffer(b'fblr', dtype=np.uint8), rovers) for _ in range(ticks)]
+
+    fleet = ScheduledFleet(*landing)
+    started = time.perf_counter()
+    for commands in workload:
+        fleet.tick(commands)
+    elapsed = time.perf_counter() - started
+    print(f'single process {elapsed / ticks * 1e3:>10.1f} ms/tick {rovers * ticks / elapsed:>14,.0f} commands/s')
+    expected = np.stack([fleet.horizontal(), fleet.vertical(), fleet.directions()], axis=1)
+
+    for count in workers:
+        with PartitionedFleet(*landing, workers=count) as partitioned:
+            started = time.perf_counter()
+            for commands in workload:
+                partitioned.tick(commands)
+            elapsed = time.perf_counter() - started
+            positions = partitioned.positions()
+        assert [
+            [position.coordinates().horizontal(), position.coordinates().vertical(), position.direction().code()]
+            for position in positions
+        ] == expected.tolist(), f'{count} workers disagree with the single process'
+        print(f'{count:>2} workers     {elapsed / ticks * 1e3:>10.1f} ms/tick'
+              f' {rovers * ticks / elapsed:>14,.0f} commands/s')
+    print(f'({os.cpu_count()} CPUs available)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+import random
+import time
+from typing import List
+
+from mars_rover.domain import Coordinates
+from mars_rover.domain import DenseObstacles
+from mars_rover.domain import Direction
+from mars_rover.domain import Planner
+from mars_rover.domain import Position
+from mars_rover.domain import Surface
+from mars_rover.domain import Unreachable
+
+
+def random_map(generator: random.Random, size: int) -> DenseObstacles:
+    # Every point is an obstacle with a probability of 1/8: the AND of three random bits.
+    length = (size * size + 7) // 8
+    bits = generator.getrandbits(length * 8) & generator.getrandbits(length * 8) & generator.getrandbits(length * 8)
+    return DenseObstacles(bytearray(bits.to_bytes(length, 'little')), size, size)
+
+
+def free_position(generator: random.Random, obstacles: DenseObstacles, size: int, near: Coordinates,
+                  reach: int) -> Position:
+    while True:
+        horizontal = min(max(near.horizontal() + generator.randint(-reach, reach), 0), size - 1)
+        vertical = min(max(near.vertical() + generator.randint(-reach, reach), 0), size - 1)
+        if not obstacles.blocks(horizontal, vertical):
+            return Position(Direction.for_symbol(generator.choice('NESW')), Coordinates(horizontal, vertical))
+
+
+def percentiles(latencies: List[float]) -> str:
+    latencies = sorted(latencies)
+    return ', '.join(
+        f'p{percentile} {latencies[min(len(latencies) * percentile // 100, len(latencies) - 1)] * 1e3:.1f} ms'
+        for percentile in (50, 90, 99)
+    )
+
+
+def main(size: int = 10_000, plans: int = 20) -> None:
+    generator = random.Random(21)
+    obstacles = random_map(generator, size)
+    planner = Planner(Surface.of_size(size - 1, size - 1, obstacles))
+    # Plans across the whole surface take up to minutes each, so fewer of them are made.
+    for reach, count in ((100, plans), (1_000, plans), (size, max(plans // 10, 1))):
+        latencies = []
+        commands = unreachable = 0
+        for _ in range(count):
+            start = free_position(generator, obstacles, size, Coordinates(size // 2, size // 2), size)
+            target = free_position(generator, obstacles, size, start.coordinates(), reach)
+            started = time.perf_counter()
+            try:
+                commands += len(planner.commands_between(start, target))
+            except Unreachable:
+                unreachable += 1
+            latencies.append(time.perf_counter() - started)
+        print(f'targets within {reach:>6} points: {percentiles(latencies)}'
+              f' ({commands / max(count - unreachable, 1):.0f} commands per plan, {unreachable} unreachable)')
+
+
+if __name__ == '__main__':
+    main()
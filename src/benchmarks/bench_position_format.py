@@ -0,0 +1,38 @@
+import random
+import time
+
+from mars_rover.application import PositionFormat
+
+
+def landing_lines(count: int, seed: int = 0) -> str:
+    generator = random.Random(seed)
+    return ''.join(
+        f'{generator.randrange(10 ** 6)} {generator.randrange(10 ** 6)} {generator.choice("NESW")}\n'
+        for _ in range(count)
+    )
+
+
+def main(count: int = 500_000) -> None:
+    position_format = PositionFormat()
+    text = landing_lines(count)
+    lines = text.splitlines()
+    started = time.perf_counter()
+    positions = [position_format.position_from(line) for line in lines]
+    print(f'position_from  {count / (time.perf_counter() - started):>14,.0f} positions/s')
+    started = time.perf_counter()
+    position_format.positions_from(text)
+    print(f'positions_from {count / (time.perf_counter() - started):>14,.0f} positions/s (text buffer)')
+    data = text.encode('ascii')
+    started = time.perf_counter()
+    position_format.positions_from(data)
+    print(f'positions_from {count / (time.perf_counter() - started):>14,.0f} positions/s (bytes buffer)')
+    started = time.perf_counter()
+    ''.join(position_format.output_from(position) + '\n' for position in positions).encode('ascii')
+    print(f'output_from    {count / (time.perf_counter() - started):>14,.0f} positions/s')
+    started = time.perf_counter()
+    position_format.write_outputs(positions, bytearray())
+    print(f'write_outputs  {count / (time.perf_counter() - started):>14,.0f} positions/s')
+
+
+if __name__ == '__main__':
+    main()
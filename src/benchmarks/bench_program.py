@@ -0,0 +1,30 @@
+import time
+
+from mars_rover.domain import Coordinates
+from mars_rover.domain import Direction
+from mars_rover.domain import Position
+from mars_rover.domain import Program
+from mars_rover.domain import Rover
+
+
+def main(script_length: int = 10_000, landings: int = 1_000) -> None:
+    commands = ('ffrrff' * script_length)[:script_length]
+    positions = [
+        Position(Direction.for_code(index % 4), Coordinates(index % 6, index // 6 % 6))
+        for index in range(landings)
+    ]
+    started = time.perf_counter()
+    for position in positions:
+        Rover(position).execute_all(commands)
+    stepped = time.perf_counter() - started
+    started = time.perf_counter()
+    program = Program.compiled_from(commands)
+    for position in positions:
+        Rover(position).run(program)
+    compiled = time.perf_counter() - started
+    print(f'step by step {landings / stepped:>14,.0f} runs/s')
+    print(f'compiled     {landings / compiled:>14,.0f} runs/s (including compilation)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+import asyncio
+import collections
+import time
+from typing import Deque
+from typing import List
+
+from mars_rover.domain import Surface
+from mars_rover.server import RoverServer
+
+
+async def drive(port: int, rover: int, requests: int, window: int, latencies: List[float]) -> None:
+    # Keeps up to `window` requests in flight and times each one until its reply arrives.
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    sent: Deque[float] = collections.deque()
+    writer.write(b'land rover-%d 500 500 N\n' % rover)
+    sent.append(time.perf_counter())
+    for index in range(requests):
+        if len(sent) == window:
+            await reader.readline()
+            latencies.append(time.perf_counter() - sent.popleft())
+        writer.write(b'exec rover-%d ffrffrfflbbl\n' % rover if index % 10 else b'position rover-%d\n' % rover)
+        sent.append(time.perf_counter())
+    while sent:
+        await reader.readline()
+        latencies.append(time.perf_counter() - sent.popleft())
+    writer.write_eof()
+    await reader.read()
+    writer.close()
+
+
+async def run(clients: int, requests: int, window: int) -> None:
+    listening = await RoverServer(Surface.of_size(1000)).listen()
+    port = listening.sockets[0].getsockname()[1]
+    latencies: List[float] = []
+    async with listening:
+        started = time.perf_counter()
+        await asyncio.gather(*(drive(port, rover, requests, window, latencies) for rover in range(clients)))
+        elapsed = time.perf_counter() - started
+    latencies.sort()
+    percentiles = ', '.join(
+        f'p{percentile} {latencies[len(latencies) * percentile // 100] * 1e3:.2f} ms' for percentile in (50, 90, 99)
+    )
+    print(f'{clients} clients, {window:>4} in flight {len(latencies) / elapsed:>10,.0f} requests/s ({percentiles})')
+
+
+def main(clients: int = 8, requests: int = 10_000) -> None:
+    for window in (1, 16, 256):
+        asyncio.run(run(clients, requests, window))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+import multiprocessing
+import pickle
+import time
+from multiprocessing.connection import Connection
+from multiprocessing.synchronize import Event
+
+import numpy as np
+
+from mars_rover.domain import Surface
+from mars_rover.fleet import VectorizedFleet
+from mars_rover.fleet.shared import SharedFleetState
+
+
+def publish(rovers: int, connection: Connection, stop: Event) -> None:
+    # Moves a fleet and publishes it until told to stop.
+    generator = np.random.RandomState(0)
+    state = SharedFleetState.create(rovers)
+    side = int(rovers ** 0.5) + 1
+    fleet = VectorizedFleet(
+        generator.randint(0, side, rovers), generator.randint(0, side, rovers), generator.randint(0, 4, rovers),
+        Surface.of_size(side - 1),
+    )
+    workload = [generator.choice(np.frombuffer(b'fblr', dtype=np.uint8), rovers) for _ in range(10)]
+    ticks = 0
+    state.publish_fleet(fleet)
+    connection.send(state.name())
+    while not stop.is_set():
+        fleet.tick(workload[ticks % len(workload)])
+        state.publish_fleet(fleet)
+        ticks += 1
+    state.close()
+
+
+def main(rovers: int = 100_000, reads: int = 200) -> None:
+    receiving, sending = multiprocessing.Pipe(duplex=False)
+    stop = multiprocessing.Event()
+    writer = multiprocessing.Process(target=publish, args=(rovers, sending, stop))
+    writer.start()
+    state = SharedFleetState.attach(receiving.recv())
+
+    started = time.perf_counter()
+    generation = state.generation()
+    for _ in range(reads):
+        state.snapshot()
+    elapsed = time.perf_counter() - started
+    published = (state.generation() - generation) // 2
+    print(f'snapshot          {elapsed / reads * 1e3:>8.3f} ms/read ({published} publishes meanwhile)')
+
+    # Positions as readers use them, against sending them to each reader pickled, as a pipe
+    # or a queue would; both end with a list of Position objects.
+    read = max(reads // 20, 1)
+    started = time.perf_counter()
+    for _ in range(read):
+        positions = state.positions()
+    elapsed = time.perf_counter() - started
+    print(f'snapshot positions{elapsed / read * 1e3:>8.3f} ms/read')
+
+    started = time.perf_counter()
+    for _ in range(read):
+        pickle.loads(pickle.dumps(positions))
+    elapsed = time.perf_counter() - started
+    print(f'pickled positions {elapsed / read * 1e3:>8.3f} ms/read')
+
+    state.close()
+    stop.set()
+    writer.join()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+import os
+import random
+import tempfile
+import time
+from typing import Callable
+from typing import Sequence
+
+from mars_rover.domain import Coordinates
+from mars_rover.domain import Direction
+from mars_rover.domain import Fleet
+from mars_rover.domain import Position
+from mars_rover.domain import Rover
+from mars_rover.domain import Surface
+from mars_rover.snapshot import CheckpointedFleet
+from mars_rover.snapshot import CheckpointedMission
+from mars_rover.snapshot import RoverSnapshot
+
+
+def landed() -> Rover:
+    return Rover(Position(Direction.north(), Coordinates(2, 2)))
+
+
+def best_of(repeats: int, run: Callable[[], None]) -> float:
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def landed_fleet(rovers: int) -> Fleet:
+    fleet = Fleet(Surface.of_size(10 ** 6))
+    for index in range(rovers):
+        fleet.land(Position(Direction.north(), Coordinates(index * 1000, index * 1000)))
+    return fleet
+
+
+def until_blocked(fleet: Fleet, commands: Sequence[str]) -> None:
+    for rover, rover_commands in zip(fleet.rovers(), commands):
+        rover.execute_until_blocked(rover_commands)
+
+
+def unsynced_save(path: str, data: bytes) -> None:
+    # What saving a snapshot took before it waited for the disk.
+    with open(f'{path}.tmp', 'wb') as snapshot:
+        snapshot.write(data)
+    os.replace(f'{path}.tmp', path)
+
+
+def main(length: int = 10_000_000, intervals: Sequence[int] = (10_000, 100_000, 1_000_000)) -> None:
+    generator = random.Random(0)
+    commands = ''.join(generator.choice('fblr') for _ in range(length))
+    baseline = best_of(3, lambda: landed().execute_until_blocked(commands))
+    print(f'no snapshots          {length / baseline:>14,.0f} commands/s')
+    with tempfile.TemporaryDirectory() as directory:
+        for every in intervals:
+            mission = CheckpointedMission(os.path.join(directory, 'rover.snapshot'), every_commands=every)
+            elapsed = best_of(3, lambda: mission.run(landed(), commands))
+            print(
+                f'every {every:>9,} commands {length / elapsed:>10,.0f} commands/s '
+                f'({(elapsed / baseline - 1) * 100:+.1f}% time)'
+            )
+
+        rovers = 100
+        fleet_commands = [commands[index::rovers] for index in range(rovers)]
+        fleet_baseline = best_of(3, lambda: until_blocked(landed_fleet(rovers), fleet_commands))
+        for every in intervals:
+            fleet_mission = CheckpointedFleet(os.path.join(directory, 'fleet.snapshot'), every_commands=every)
+            elapsed = best_of(3, lambda: fleet_mission.run(landed_fleet(rovers), fleet_commands))
+            print(
+                f'fleet every {every:>9,} {length / elapsed:>10,.0f} commands/s '
+                f'({(elapsed / fleet_baseline - 1) * 100:+.1f}% time)'
+            )
+
+        path = os.path.join(directory, 'rover.snapshot')
+        snapshot = RoverSnapshot.of(landed(), 0)
+        saves = 100
+
+        def synced_saves() -> None:
+            for _ in range(saves):
+                snapshot.save(path)
+
+        def unsynced_saves() -> None:
+            for _ in range(saves):
+                unsynced_save(path, snapshot.to_bytes())
+
+        synced = best_of(3, synced_saves) / saves
+        unsynced = best_of(3, unsynced_saves) / saves
+        print(f'save                  {synced * 1e6:>10,.0f} us ({unsynced * 1e6:,.0f} us without fsync)')
+
+
+if __name__ == '__main__':
+    main()
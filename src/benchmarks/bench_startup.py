@@ -0,0 +1,64 @@
+import argparse
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+# Microseconds `import mars_rover.__main__` may take in a fresh interpreter.
+DEFAULT_BUDGET = 60_000
+
+
+def import_times(module: str) -> Dict[str, Tuple[int, int]]:
+    # Self and cumulative microseconds of every module imported along with the given one.
+    stderr = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        stderr=subprocess.PIPE, check=True, universal_newlines=True,
+    ).stderr
+    times = {}
+    for line in stderr.splitlines()[1:]:
+        own, cumulative, name = line.split(':', 1)[1].split('|')
+        times[name.strip()] = (int(own), int(cumulative))
+    return times
+
+
+def best_run(command: List[str], repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        subprocess.run(command, stdout=subprocess.DEVNULL, check=True)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.bench_startup')
+    parser.add_argument('--repeat', type=int, default=10, help='interpreters started, the fastest one counts')
+    parser.add_argument('--budget', type=int, default=DEFAULT_BUDGET, help='microseconds the import may take')
+    parser.add_argument('--top', type=int, default=10, help='slowest modules to list')
+    arguments = parser.parse_args(argv)
+    fastest = min((import_times('mars_rover.__main__') for _ in range(arguments.repeat)),
+                  key=lambda times: times['mars_rover.__main__'][1])
+    print(f'{"module":<40} {"self":>8} {"cumulative":>11}')
+    for name, (own, cumulative) in sorted(fastest.items(), key=lambda item: -item[1][0])[:arguments.top]:
+        print(f'{name:<40} {own:>6}us {cumulative:>9}us')
+    with tempfile.NamedTemporaryFile(suffix='.txt') as missions:
+        missions.write(b'1 2 N\nlflflflff\n3 3 E\nffrffrfrrf\n')
+        missions.flush()
+        mission = best_run([sys.executable, '-m', 'mars_rover', missions.name], arguments.repeat)
+    interpreter = best_run([sys.executable, '-c', 'pass'], arguments.repeat)
+    total = fastest['mars_rover.__main__'][1]
+    print(f'import of mars_rover.__main__ {total:>8}us (budget {arguments.budget}us)')
+    overhead = (mission - interpreter) * 1e6
+    print(f'mission file run              {mission * 1e6:>8.0f}us ({overhead:.0f}us over a bare interpreter)')
+    if total > arguments.budget:
+        print(f'Startup over budget by {total - arguments.budget}us', file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
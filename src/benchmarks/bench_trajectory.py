@@ -0,0 +1,52 @@
+import random
+import time
+import tracemalloc
+from typing import List
+
+from mars_rover.domain import Coordinates
+from mars_rover.domain import Direction
+from mars_rover.domain import Position
+from mars_rover.domain import Rover
+from mars_rover.domain import Surface
+
+
+def patrol(length: int, seed: int = 0) -> str:
+    # Long straight legs with the odd turn, as in a survey pattern.
+    generator = random.Random(seed)
+    legs: List[str] = []
+    planned = 0
+    while planned < length:
+        legs.append('f' * generator.randint(50, 500) + generator.choice('rl'))
+        planned += len(legs[-1])
+    return ''.join(legs)[:length]
+
+
+def naive_bytes_per_step(steps: int = 100_000) -> float:
+    tracemalloc.start()
+    path = [Position(Direction.north(), Coordinates(step, step)) for step in range(steps)]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del path
+    return size / steps
+
+
+def main(steps: int = 2_000_000, queries: int = 100_000) -> None:
+    side = 10 ** 6
+    rover = Rover(Position(Direction.north(), Coordinates(side // 2, side // 2)), Surface.of_size(side))
+    trajectory = rover.record_trajectory()
+    started = time.perf_counter()
+    rover.execute_all(patrol(steps))
+    print(f'recorded {steps:,} steps at {steps / (time.perf_counter() - started):,.0f} steps/s')
+    generator = random.Random(1)
+    started = time.perf_counter()
+    for _ in range(queries):
+        trajectory.position_at(generator.randrange(steps))
+    print(f'position_at {queries / (time.perf_counter() - started):>12,.0f} queries/s')
+    compact = trajectory.memory_size() / steps
+    naive = naive_bytes_per_step()
+    print(f'run-length  {compact:>10.3f} bytes/step ({compact * 100e6 / 2 ** 20:,.1f} MiB per 100M steps)')
+    print(f'naive       {naive:>10.3f} bytes/step ({naive * 100e6 / 2 ** 20:,.1f} MiB per 100M steps)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,32 @@
+import time
+
+from mars_rover.domain import Coordinates
+from mars_rover.domain import Direction
+from mars_rover.domain import Position
+from mars_rover.domain import Program
+from mars_rover.domain import Rover
+from mars_rover.domain import Surface
+
+
+def main(script_length: int = 100_000, landings: int = 1_000) -> None:
+    commands = ('fffrfffl' * script_length)[:script_length]
+    surface = Surface.of_size(99, 49)
+    positions = [
+        Position(Direction.for_code(index % 4), Coordinates(index % 100, index // 100 % 50))
+        for index in range(landings)
+    ]
+    started = time.perf_counter()
+    for position in positions[:landings // 100]:
+        Rover(position, surface, wrapping=True).execute_all(commands)
+    stepped = landings // 100 / (time.perf_counter() - started)
+    started = time.perf_counter()
+    program = Program.compiled_from(commands)
+    for position in positions:
+        Rover(position, surface, wrapping=True).run(program)
+    compiled = landings / (time.perf_counter() - started)
+    print(f'command string {stepped:>14,.0f} runs/s')
+    print(f'compiled       {compiled:>14,.0f} runs/s (including compilation)')
+
+
+if __name__ == '__main__':
+    main()
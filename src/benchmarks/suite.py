@@ -0,0 +1,155 @@
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from mars_rover.application import MarsRoverApplication
+from mars_rover.application import PositionFormat
+from mars_rover.domain import Surface
+
+Workload = Callable[[], None]
+
+# Every case builds its workload of `size` operations from a fixed seed, so
+# that results of different runs and machines measure the same work.
+SEED = 2019
+
+
+def random_commands(generator: random.Random, alphabet: str, size: int) -> str:
+    return ''.join(generator.choice(alphabet) for _ in range(size))
+
+
+def landing_lines(size: int) -> List[str]:
+    generator = random.Random(SEED)
+    return [
+        f'{generator.randrange(10 ** 6)} {generator.randrange(10 ** 6)} {generator.choice("NESW")}'
+        for _ in range(size)
+    ]
+
+
+def position_from(size: int) -> Workload:
+    lines = landing_lines(size)
+    position_format = PositionFormat()
+
+    def workload() -> None:
+        for line in lines:
+            position_format.position_from(line)
+    return workload
+
+
+def output_from(size: int) -> Workload:
+    position_format = PositionFormat()
+    positions = position_format.positions_from(landing_lines(size))
+
+    def workload() -> None:
+        for position in positions:
+            position_format.output_from(position)
+    return workload
+
+
+def execute(size: int) -> Workload:
+    commands = random_commands(random.Random(SEED), 'fblr', size)
+
+    def workload() -> None:
+        app = MarsRoverApplication.landing_with('500000 500000 N', Surface.of_size(10 ** 6))
+        for command in commands:
+            app.execute(command)
+    return workload
+
+
+def execute_all(size: int) -> Workload:
+    commands = random_commands(random.Random(SEED), 'fblr', size)
+    return lambda: MarsRoverApplication.landing_with('500000 500000 N', Surface.of_size(10 ** 6)).execute_all(commands)
+
+
+def edge_heavy(size: int) -> Workload:
+    # On a 2x2 surface most of these moves are rejected at its edge.
+    commands = random_commands(random.Random(SEED), 'ffffbbr', size)
+    return lambda: MarsRoverApplication.landing_with('1 1 N', Surface.of_size(1)).execute_all(commands)
+
+
+def turns_only(size: int) -> Workload:
+    commands = random_commands(random.Random(SEED), 'rl', size)
+    return lambda: MarsRoverApplication.landing_with('2 2 N').execute_all(commands)
+
+
+CASES: Dict[str, Callable[[int], Workload]] = {
+    'position_from': position_from,
+    'output_from': output_from,
+    'execute': execute,
+    'execute_all': execute_all,
+    'edge_heavy': edge_heavy,
+    'turns_only': turns_only,
+}
+
+
+def measured(size: int, repeat: int) -> Dict[str, float]:
+    # Operations per second of the fastest of `repeat` runs of each case.
+    results = {}
+    for name, case in CASES.items():
+        workload = case(size)
+        best = float('inf')
+        for _ in range(repeat):
+            started = time.perf_counter()
+            workload()
+            best = min(best, time.perf_counter() - started)
+        results[name] = size / best
+    return results
+
+
+def regressions(results: Dict[str, float], baseline: Dict[str, float], threshold: float) -> List[Tuple[str, float]]:
+    # Cases slower than the baseline by more than the threshold, with their relative change.
+    return [
+        (name, results[name] / baseline[name] - 1)
+        for name in sorted(results)
+        if name in baseline and results[name] < baseline[name] * (1 - threshold)
+    ]
+
+
+def read_baseline(path: Optional[str], size: int) -> Dict[str, float]:
+    if path is None:
+        return {}
+    with open(path) as baseline_file:
+        baseline = json.load(baseline_file)
+    if baseline['size'] != size:
+        print(f'Baseline of {baseline["size"]} operations ignored for workloads of {size}', file=sys.stderr)
+        return {}
+    results: Dict[str, float] = baseline['results']
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.suite', description='Benchmark the mission pipeline.')
+    parser.add_argument('--size', type=int, default=200_000, help='operations in every workload')
+    parser.add_argument('--repeat', type=int, default=5, help='runs of every workload, the fastest one counts')
+    parser.add_argument('--output', help='JSON file to record the results to')
+    parser.add_argument('--baseline', help='JSON file of earlier results to compare against')
+    parser.add_argument('--threshold', type=float, default=0.2, help='slowdown reported as a regression')
+    arguments = parser.parse_args(argv)
+    if arguments.baseline is not None and not os.path.exists(arguments.baseline):
+        # Without a baseline no regression could ever be found, so that's an error rather than a pass.
+        print(f'No baseline at {arguments.baseline}, record one first with make bench-baseline', file=sys.stderr)
+        return 2
+    results = measured(arguments.size, arguments.repeat)
+    baseline = read_baseline(arguments.baseline, arguments.size)
+    for name, operations_per_second in results.items():
+        relative = f' ({operations_per_second / baseline[name] - 1:+.1%})' if name in baseline else ''
+        print(f'{name:<14} {operations_per_second:>14,.0f} operations/s{relative}')
+    if arguments.output is not None:
+        os.makedirs(os.path.dirname(os.path.abspath(arguments.output)), exist_ok=True)
+        with open(arguments.output, 'w') as output:
+            json.dump({'size': arguments.size, 'results': results}, output, indent=2, sort_keys=True)
+    slower = regressions(results, baseline, arguments.threshold)
+    for name, slowdown in slower:
+        print(f'Regression: {name} {slowdown:+.1%}', file=sys.stderr)
+    return 1 if slower else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
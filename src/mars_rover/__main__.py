@@ -0,0 +1,75 @@
+import argparse
+import sys
+from typing import TYPE_CHECKING
+from typing import BinaryIO
+from typing import Iterable
+from typing import List
+from typing import Optional
+
+from mars_rover.domain import Surface
+from mars_rover.parallel import DEFAULT_RECORDS_PER_SHARD
+from mars_rover.parallel import ParallelMissionRunner
+from mars_rover.streaming import DEFAULT_CHUNK_SIZE
+from mars_rover.streaming import MissionReader
+from mars_rover.streaming import MissionReport
+
+if TYPE_CHECKING:
+    from mars_rover.server import RoverServer  # noqa: F401
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog='python -m mars_rover',
+        description='Land rovers and execute their commands, one landing line and one command line per rover.',
+    )
+    parser.add_argument('missions', nargs='?', help='mission file to read instead of the standard input')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help='bytes read at a time')
+    parser.add_argument('--workers', type=int, help='run the missions of a file in this many processes')
+    parser.add_argument(
+        '--records-per-shard', type=int, default=DEFAULT_RECORDS_PER_SHARD, help='rovers handed to a process at a time',
+    )
+    parser.add_argument('--width', type=int, default=5, help='easternmost coordinate of the surface')
+    parser.add_argument('--height', type=int, default=5, help='northernmost coordinate of the surface')
+    parser.add_argument('--port', type=int, help='serve rovers over TCP on this port instead of running missions')
+    parser.add_argument('--host', default='127.0.0.1', help='address to serve rovers on')
+    arguments = parser.parse_args(argv)
+    surface = Surface.of_size(arguments.width, arguments.height)
+    if arguments.port is not None:
+        # asyncio alone takes longer to import than a short mission file takes to run.
+        import asyncio
+
+        from mars_rover.server import RoverServer
+        asyncio.run(_serve(RoverServer(surface), arguments.host, arguments.port))
+        return 0
+    if arguments.missions is None:
+        return _run(sys.stdin.buffer, arguments.chunk_size, surface)
+    if arguments.workers is not None:
+        runner = ParallelMissionRunner(arguments.workers, arguments.records_per_shard, arguments.chunk_size, surface)
+        return _print(runner.reports_from(arguments.missions))
+    with open(arguments.missions, 'rb') as missions:
+        return _run(missions, arguments.chunk_size, surface)
+
+
+def _run(missions: BinaryIO, chunk_size: int, surface: Surface) -> int:
+    return _print(MissionReader(chunk_size, surface).reports_from(missions))
+
+
+async def _serve(server: 'RoverServer', host: str, port: int) -> None:
+    listening = await server.listen(host, port)
+    async with listening:
+        await listening.serve_forever()
+
+
+def _print(reports: Iterable[MissionReport]) -> int:
+    status = 0
+    for report in reports:
+        if report.error() is None:
+            print(report.output())
+        else:
+            print(f'line {report.line()}, byte {report.offset()}: {report.error()}', file=sys.stderr)
+            status = 1
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
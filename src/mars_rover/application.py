@@ -1,12 +1,20 @@
-import re
+from typing import Iterable
+from typing import List
 from typing import Match
+from typing import Optional
 from typing import Pattern
+from typing import Union
 
 from mars_rover.domain import Coordinates
 from mars_rover.domain import Direction
 from mars_rover.domain import Position
+from mars_rover.domain import Program
 from mars_rover.domain import Rover
+from mars_rover.domain import RoverOnObstacle
 from mars_rover.domain import RoverOutsideSurface
+from mars_rover.domain import Surface
+from mars_rover.domain import Trajectory
+from mars_rover.domain import UnknownCommand
 
 
 class UserInputError(Exception):
@@ -20,28 +28,76 @@ class UserInputError(Exception):
         return cls(f'Invalid direction: {direction}')
 
     @classmethod
-    def unknown_command(cls, command: str) -> 'UserInputError':
-        return cls(f'Unknown command: {command!r}')
+    def unknown_command(cls, command: str, index: Optional[int] = None) -> 'UserInputError':
+        if index is None:
+            return cls(f'Unknown command: {command!r}')
+        return cls(f'Unknown command: {command!r} at index {index}')
 
     @classmethod
     def rover_outside_surface(cls) -> 'UserInputError':
         return cls(f'Rover outside the surface')
 
+    @classmethod
+    def rover_on_obstacle(cls) -> 'UserInputError':
+        return cls('Rover on an obstacle')
+
+    @classmethod
+    def on_line(cls, line: int, error: 'UserInputError') -> 'UserInputError':
+        return cls(f'Line {line}: {error}')
+
+
+_POSITION_PATTERN: Optional[Pattern] = None
+
+_DIRECTIONS = {symbol: Direction.for_symbol(symbol) for symbol in 'NESW'}
+
+_OUTPUT_SYMBOLS = {Direction.for_symbol(symbol).code(): symbol.encode('ascii') for symbol in 'NESW'}
+
+Lines = Union[str, bytes, Iterable[str], Iterable[bytes]]
+
+
+def _position_pattern() -> Pattern:
+    # Well-formed positions never get to the regular expression, so it's only
+    # compiled, and re imported, once a position needs a closer look.
+    global _POSITION_PATTERN
+    if _POSITION_PATTERN is None:
+        import re
+        _POSITION_PATTERN = re.compile(
+            r'^(?P<horizontal>\d+) '
+            r'(?P<vertical>\d+) '
+            r'(?P<direction>.*)'
+        )
+    return _POSITION_PATTERN
+
 
 class PositionFormat:
 
     def position_from(self, user_input: str) -> Position:
-        match = self._pattern().match(user_input)
+        parts = user_input.split(' ', 2)
+        if len(parts) == 3 and parts[2] in _DIRECTIONS and parts[0].isdecimal() and parts[1].isdecimal():
+            return Position(_DIRECTIONS[parts[2]], Coordinates(int(parts[0]), int(parts[1])))
+        match = _position_pattern().match(user_input)
         if not match:
             raise UserInputError.invalid_position(user_input)
         return Position(self._direction_from(match), self._coordinates_from(match))
 
-    def _pattern(self) -> Pattern:
-        return re.compile(
-            r'^(?P<horizontal>\d+) '
-            r'(?P<vertical>\d+) '
-            r'(?P<direction>.*)'
-        )
+    def positions_from(self, lines: Lines) -> List[Position]:
+        # Takes either a whole buffer of newline separated positions or an iterable of single lines.
+        # Bytes are read as Latin-1, in which the only characters \d matches are the ASCII digits.
+        # Line endings, Windows ones too, are dropped and empty lines skipped.
+        # Most of the time goes to making the positions, so lines are parsed one at a time, with
+        # the same quick split position_from starts with.
+        if isinstance(lines, (bytes, bytearray, memoryview)):
+            lines = str(lines, 'latin-1')
+        if isinstance(lines, str):
+            lines = lines.split('\n')
+        positions = []
+        for line in lines:
+            if not isinstance(line, str):
+                line = str(line, 'latin-1')
+            line = line.rstrip('\r\n')
+            if line:
+                positions.append(self.position_from(line))
+        return positions
 
     def _direction_from(self, match: Match) -> Direction:
         try:
@@ -56,27 +112,51 @@ class PositionFormat:
         )
 
     def output_from(self, position: Position) -> str:
-        return (
-            f'{position.coordinates().horizontal()} '
-            f'{position.coordinates().vertical()} '
-            f'{position.direction().symbol()}'
-        )
+        coordinates = position.coordinates()
+        return f'{coordinates.horizontal()} {coordinates.vertical()} {position.direction().symbol()}'
+
+    def write_outputs(self, positions: Iterable[Position], buffer: bytearray) -> None:
+        # All of the lines are formatted at once, out of a flat list of the values on them.
+        symbols = _OUTPUT_SYMBOLS
+        values: List[Union[int, bytes]] = []
+        for position in positions:
+            coordinates = position.coordinates()
+            values += (coordinates.horizontal(), coordinates.vertical(), symbols[position.direction().code()])
+        buffer += b'%d %d %s\n' * (len(values) // 3) % tuple(values)
 
 
 class MarsRoverApplication:
 
+    _position_format = PositionFormat()
+
     @classmethod
-    def landing_with(cls, rover_position: str) -> 'MarsRoverApplication':
+    def landing_with(
+            cls,
+            rover_position: str,
+            surface: Optional[Surface] = None,
+            wrapping: bool = False,
+    ) -> 'MarsRoverApplication':
         try:
-            return cls(PositionFormat().position_from(rover_position))
+            return cls(cls._position_format.position_from(rover_position), surface, wrapping)
         except RoverOutsideSurface:
             raise UserInputError.rover_outside_surface()
+        except RoverOnObstacle:
+            raise UserInputError.rover_on_obstacle()
 
-    def __init__(self, position: Position) -> None:
-        self._rover = Rover(position)
+    def __init__(self, position: Position, surface: Optional[Surface] = None, wrapping: bool = False) -> None:
+        self._rover = Rover(position, surface, wrapping=wrapping)
 
     def rover_position(self) -> str:
-        return PositionFormat().output_from(self._rover.position())
+        return self._position_format.output_from(self._rover.position())
+
+    def record_trajectory(self, checkpoint_every: int = 64) -> Trajectory:
+        return self._rover.record_trajectory(checkpoint_every)
+
+    def obstacle_position(self) -> Optional[str]:
+        obstacle = self._rover.obstacle()
+        if obstacle is None:
+            return None
+        return f'{obstacle.horizontal()} {obstacle.vertical()}'
 
     def execute(self, command: str) -> None:
         if command == 'f':
@@ -89,3 +169,21 @@ class MarsRoverApplication:
             self._rover.turn_left()
         else:
             raise UserInputError.unknown_command(command)
+
+    def execute_all(self, commands: str) -> None:
+        # Ends where executing the commands one at a time would.
+        try:
+            self._rover.execute_all(commands)
+        except UnknownCommand as error:
+            raise UserInputError.unknown_command(error.command(), error.index())
+
+    def execute_until_blocked(self, commands: str) -> None:
+        # Like a single command, a blocked move leaves the rover in place, but it also aborts
+        # the rest of the string.
+        try:
+            self._rover.execute_until_blocked(commands)
+        except UnknownCommand as error:
+            raise UserInputError.unknown_command(error.command(), error.index())
+
+    def run(self, program: Program) -> None:
+        self._rover.run(program)
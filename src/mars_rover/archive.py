@@ -0,0 +1,266 @@
+import itertools
+import mmap
+import struct
+from typing import BinaryIO
+from typing import Dict
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import TextIO
+from typing import Tuple
+from typing import Union
+
+from mars_rover.application import PositionFormat
+from mars_rover.application import UserInputError
+from mars_rover.domain import Coordinates
+from mars_rover.domain import Direction
+from mars_rover.domain import Position
+from mars_rover.domain import Surface
+from mars_rover.streaming import DEFAULT_CHUNK_SIZE
+from mars_rover.streaming import MAX_LANDING_LINE
+
+# A header with the edges of the surface and the number of missions, then for every
+# mission its packed landing coordinates, its command count shifted left by two over
+# the code of its landing direction, and its commands, four to a byte.
+_HEADER = struct.Struct('<4sQQQ')
+_MAGIC = b'MRM1'
+_RECORD = struct.Struct('<QQ')
+
+# Two bits per command, the first command of a byte in its least significant bits.
+_COMMANDS = 'fbrl'
+_QUADS = [''.join(_COMMANDS[byte >> shift & 3] for shift in (0, 2, 4, 6)) for byte in range(256)]
+_PACKED_QUADS: Dict[str, int] = {quad: byte for byte, quad in enumerate(_QUADS)}
+# The letter of the command in each of the four places of a byte, for bytes.translate.
+_LETTERS = [bytes(ord(_COMMANDS[byte >> shift & 3]) for byte in range(256)) for shift in (0, 2, 4, 6)]
+
+# Commands decoded at a time when they're read in pieces.
+DEFAULT_PIECE_SIZE = 256 * 1024
+
+_position_format = PositionFormat()
+
+Packed = Union[bytes, memoryview]
+
+
+class Mission:
+
+    def __init__(self, position: Position, packed_commands: Packed, length: int) -> None:
+        self._position = position
+        self._packed_commands = packed_commands
+        self._length = length
+
+    def position(self) -> Position:
+        return self._position
+
+    def commands(self) -> str:
+        return _decoded(self._packed_commands, self._length)
+
+    def pieces(self, size: int = DEFAULT_PIECE_SIZE) -> Iterator[str]:
+        # The commands, up to size of them at a time, rounded up to whole bytes of them.
+        step = -(-size // 4) * 4
+        packed = self._packed_commands
+        for start in range(0, self._length, step):
+            length = min(step, self._length - start)
+            yield _decoded(packed[start // 4:(start + length + 3) // 4], length)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __repr__(self) -> str:  # pragma: nocover
+        return f'{self.__class__.__name__}({self._position!r}, {self.commands()!r})'
+
+
+def _decoded(packed: Packed, length: int) -> str:
+    # Every place in the whole bytes is translated at once, and only a last byte holding fewer
+    # than four commands is decoded on its own.
+    whole = length // 4
+    letters = bytearray(length)
+    packed_bytes = bytes(packed[:whole])
+    for place, table in enumerate(_LETTERS):
+        letters[place:whole * 4:4] = packed_bytes.translate(table)
+    if length > whole * 4:
+        letters[whole * 4:] = _QUADS[packed[whole]][:length - whole * 4].encode()
+    return letters.decode('ascii')
+
+
+class MissionArchive:
+
+    @classmethod
+    def load(cls, path: str) -> 'MissionArchive':
+        with open(path, 'rb') as archive:
+            try:
+                mapped = mmap.mmap(archive.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                raise ValueError(f'Invalid mission archive: {path}')
+        if len(mapped) < _HEADER.size or mapped[:len(_MAGIC)] != _MAGIC:
+            mapped.close()
+            raise ValueError(f'Invalid mission archive: {path}')
+        _, east_edge, north_edge, count = _HEADER.unpack_from(mapped)
+        return cls(memoryview(mapped)[_HEADER.size:], Surface.of_size(east_edge, north_edge), count, path)
+
+    def __init__(self, records: memoryview, surface: Surface, count: int, path: str) -> None:
+        self._records = records
+        self._surface = surface
+        self._count = count
+        self._path = path
+
+    def surface(self) -> Surface:
+        return self._surface
+
+    def __len__(self) -> int:
+        return self._count
+
+    def missions(self) -> Iterator[Mission]:
+        # Commands stay in the mapped file until a mission's commands are asked for.
+        records = self._records
+        directions = [Direction.for_code(code) for code in range(4)]
+        offset = 0
+        for _ in range(self._count):
+            if offset + _RECORD.size > len(records):
+                raise ValueError(f'Invalid mission archive: {self._path}')
+            coordinates, length_and_direction = _RECORD.unpack_from(records, offset)
+            length = length_and_direction >> 2
+            start = offset + _RECORD.size
+            offset = start + (length + 3) // 4
+            if offset > len(records):
+                raise ValueError(f'Invalid mission archive: {self._path}')
+            position = Position(
+                directions[length_and_direction & 3],
+                Coordinates(coordinates >> 32, coordinates & 0xffffffff),
+            )
+            yield Mission(position, records[start:offset], length)
+
+
+def write_archive(path: str, surface: Surface, missions: Iterable[Tuple[Position, str]]) -> int:
+    return _written(path, surface, ((position, (commands,)) for position, commands in missions))
+
+
+def _written(path: str, surface: Surface, missions: Iterable[Tuple[Position, Iterable[str]]]) -> int:
+    # Commands may come in pieces, packed as they come; the length in the record of a mission
+    # whose commands took more than one piece is filled in once they're all written.
+    north_east = surface.north_east()
+    count = 0
+    with open(path, 'wb') as archive:
+        archive.write(_HEADER.pack(_MAGIC, north_east.horizontal(), north_east.vertical(), 0))
+        for position, commands in missions:
+            pieces = iter(commands)
+            first = next(pieces, '')
+            second = next(pieces, None)
+            if second is None:
+                archive.write(_record(position, len(first)))
+                archive.write(_packed(first))
+            else:
+                record_offset = archive.tell()
+                archive.write(_record(position, 0))
+                length = _write_packed(archive, itertools.chain((first, second), pieces))
+                end = archive.tell()
+                archive.seek(record_offset)
+                archive.write(_record(position, length))
+                archive.seek(end)
+            count += 1
+        archive.seek(0)
+        archive.write(_HEADER.pack(_MAGIC, north_east.horizontal(), north_east.vertical(), count))
+    return count
+
+
+def _record(position: Position, length: int) -> bytes:
+    return _RECORD.pack(position.coordinates().packed(), length << 2 | position.direction().code())
+
+
+def _write_packed(archive: BinaryIO, pieces: Iterable[str]) -> int:
+    # Packs whole bytes of commands as pieces come, carrying the rest over to the next piece.
+    length = 0
+    pending = ''
+    for piece in pieces:
+        pending += piece
+        whole = len(pending) - len(pending) % 4
+        archive.write(_packed(pending[:whole], length))
+        length += whole
+        pending = pending[whole:]
+    archive.write(_packed(pending, length))
+    return length + len(pending)
+
+
+def _packed(commands: str, offset: int = 0) -> bytes:
+    # offset is the index of the first of the commands in the whole command line.
+    padded = commands + 'f' * (-len(commands) % 4)
+    try:
+        return bytes([_PACKED_QUADS[padded[index:index + 4]] for index in range(0, len(padded), 4)])
+    except KeyError:
+        index = next(index for index, command in enumerate(commands) if command not in _COMMANDS)
+        raise UserInputError.unknown_command(commands[index], offset + index)
+
+
+def archive_from_text(text: TextIO, path: str, surface: Surface, chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+    missions = _TextMissions(text, chunk_size)
+    try:
+        return _written(path, surface, missions)
+    except UserInputError as error:
+        raise UserInputError.on_line(missions.line(), error)
+
+
+class _TextMissions:
+    # Missions read like mission files by the command line: blank lines may separate them,
+    # and the line after a landing holds its commands, even if it's empty or missing.
+    # Command lines are read a piece at a time, so they may be of any length.
+
+    def __init__(self, text: TextIO, chunk_size: int) -> None:
+        self._text = text
+        self._chunk_size = chunk_size
+        self._line = 0
+
+    def line(self) -> int:
+        return self._line
+
+    def __iter__(self) -> Iterator[Tuple[Position, Iterator[str]]]:
+        while True:
+            self._line += 1
+            landing = self._text.readline(MAX_LANDING_LINE + 2)
+            if not landing:
+                return
+            if not landing.endswith('\n'):
+                # Too long to be a position, or the last line; the rest of it is skipped.
+                for _ in self._pieces():
+                    pass
+            landing = landing.rstrip('\r\n')
+            if not landing.strip():
+                continue
+            if len(landing) > MAX_LANDING_LINE:
+                raise UserInputError.invalid_position(landing)
+            position = _position_format.position_from(landing)
+            self._line += 1
+            yield position, self._pieces()
+
+    def _pieces(self) -> Iterator[str]:
+        # The rest of the current line, without its line ending. A carriage return at the end
+        # of a piece waits for the next one, as it may be the start of a Windows line ending.
+        carried = ''
+        while True:
+            read = self._text.readline(self._chunk_size)
+            piece = carried + read
+            # Lines only come in shorter than asked for when the text ends.
+            if piece.endswith('\n') or len(read) < self._chunk_size:
+                yield piece.rstrip('\r\n')
+                return
+            carried = '\r' if piece.endswith('\r') else ''
+            yield piece[:len(piece) - len(carried)]
+
+
+def text_from_archive(archive: MissionArchive, text: TextIO) -> None:
+    # Short missions are written many at once, long ones a piece of commands at a time.
+    lines: List[str] = []
+    buffered = 0
+    for mission in archive.missions():
+        lines += [_position_format.output_from(mission.position()), '\n']
+        for piece in mission.pieces():
+            lines.append(piece)
+            buffered += len(piece)
+            if buffered >= DEFAULT_PIECE_SIZE:
+                text.write(''.join(lines))
+                lines.clear()
+                buffered = 0
+        lines.append('\n')
+        if len(lines) > 4096:
+            text.write(''.join(lines))
+            lines.clear()
+            buffered = 0
+    text.write(''.join(lines))
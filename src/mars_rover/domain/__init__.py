@@ -1,5 +1,64 @@
-from .coordinates import Coordinates  # noqa: F401
-from .direction import Direction  # noqa: F401
-from .position import Position  # noqa: F401
-from .rover import Rover  # noqa: F401
-from .rover import RoverOutsideSurface  # noqa: F401
+import importlib
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import List
+
+if TYPE_CHECKING:
+    from .coordinates import Coordinates  # noqa: F401
+    from .direction import Direction  # noqa: F401
+    from .distances import CommandDistances  # noqa: F401
+    from .fleet import Fleet  # noqa: F401
+    from .obstacles import DenseObstacles  # noqa: F401
+    from .obstacles import Obstacles  # noqa: F401
+    from .obstacles import SparseObstacles  # noqa: F401
+    from .occupancy import CellOccupied  # noqa: F401
+    from .occupancy import Occupancy  # noqa: F401
+    from .planner import Planner  # noqa: F401
+    from .planner import Unreachable  # noqa: F401
+    from .position import Position  # noqa: F401
+    from .program import Program  # noqa: F401
+    from .program import UnknownCommand  # noqa: F401
+    from .rover import Rover  # noqa: F401
+    from .rover import RoverOnObstacle  # noqa: F401
+    from .rover import RoverOutsideSurface  # noqa: F401
+    from .surface import Surface  # noqa: F401
+    from .trajectory import Trajectory  # noqa: F401
+
+# Names are imported from their modules on first use, so that short-lived
+# processes only load the part of the domain they need.
+_MODULES = {
+    'Coordinates': 'coordinates',
+    'Direction': 'direction',
+    'CommandDistances': 'distances',
+    'Fleet': 'fleet',
+    'DenseObstacles': 'obstacles',
+    'Obstacles': 'obstacles',
+    'SparseObstacles': 'obstacles',
+    'CellOccupied': 'occupancy',
+    'Occupancy': 'occupancy',
+    'Planner': 'planner',
+    'Unreachable': 'planner',
+    'Position': 'position',
+    'Program': 'program',
+    'UnknownCommand': 'program',
+    'Rover': 'rover',
+    'RoverOnObstacle': 'rover',
+    'RoverOutsideSurface': 'rover',
+    'Surface': 'surface',
+    'Trajectory': 'trajectory',
+}
+
+__all__ = sorted(_MODULES)
+
+
+def __getattr__(name: str) -> Any:
+    module = _MODULES.get(name)
+    if module is None:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    value = getattr(importlib.import_module(f'.{module}', __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_MODULES))
@@ -1,20 +1,26 @@
 from .direction import Direction
-from .step import Step
+from .transitions import POINTS_EAST
+from .transitions import POINTS_NORTH
+
+
+def packed(horizontal: int, vertical: int) -> int:
+    # A single int key for coordinates on a surface, which are non-negative and below 2 ** 32.
+    return horizontal << 32 | vertical
 
 
 class Coordinates:
 
+    __slots__ = ('_horizontal', '_vertical')
+
     def __init__(self, horizontal: int, vertical: int) -> None:
         self._horizontal = horizontal
         self._vertical = vertical
 
     def moved_in(self, direction: Direction) -> 'Coordinates':
-        return self._moved_by(direction.step())
-
-    def _moved_by(self, step: Step) -> 'Coordinates':
+        code = direction.code()
         return Coordinates(
-            self._horizontal + step.points_east(),
-            self._vertical + step.points_north(),
+            self._horizontal + POINTS_EAST[code],
+            self._vertical + POINTS_NORTH[code],
         )
 
     def horizontal(self) -> int:
@@ -23,6 +29,9 @@ class Coordinates:
     def vertical(self) -> int:
         return self._vertical
 
+    def packed(self) -> int:
+        return packed(self._horizontal, self._vertical)
+
     def __repr__(self) -> str:  # pragma: nocover
         return f'{self.__class__.__name__}({self._horizontal!r}, {self._vertical!r})'
 
@@ -31,6 +40,9 @@ class Coordinates:
             return NotImplemented
         return self._horizontal == other._horizontal and self._vertical == other._vertical
 
+    def __hash__(self) -> int:
+        return hash((self._horizontal, self._vertical))
+
     def __lt__(self, other: 'Coordinates') -> bool:
         return self._horizontal < other._horizontal or self._vertical < other._vertical
 
@@ -1,58 +1,60 @@
 import abc
+from typing import Dict
+from typing import Tuple
 
+from . import transitions
 from .step import Step
 
 
 class Direction(abc.ABC):
 
+    __slots__ = ()
+
     @classmethod
     def for_symbol(cls, symbol: str) -> 'Direction':
-        if symbol == 'N':
-            return cls.north()
-        elif symbol == 'S':
-            return cls.south()
-        elif symbol == 'E':
-            return cls.east()
-        elif symbol == 'W':
-            return cls.west()
-        else:
+        try:
+            return _BY_SYMBOL[symbol]
+        except KeyError:
             raise ValueError(f'Unknown direction: {symbol}')
 
+    @classmethod
+    def for_code(cls, code: int) -> 'Direction':
+        return _BY_CODE[code]
+
     @classmethod
     def north(cls) -> 'Direction':
-        return North()
+        return _BY_CODE[transitions.NORTH]
 
     @classmethod
     def south(cls) -> 'Direction':
-        return South()
+        return _BY_CODE[transitions.SOUTH]
 
     @classmethod
     def east(cls) -> 'Direction':
-        return East()
+        return _BY_CODE[transitions.EAST]
 
     @classmethod
     def west(cls) -> 'Direction':
-        return West()
+        return _BY_CODE[transitions.WEST]
 
     @abc.abstractmethod
-    def opposite(self) -> 'Direction':
+    def code(self) -> int:
         ...
 
-    @abc.abstractmethod
+    def opposite(self) -> 'Direction':
+        return _BY_CODE[transitions.OPPOSITE[self.code()]]
+
     def next_to_the_right(self) -> 'Direction':
-        ...
+        return _BY_CODE[transitions.TURNED_RIGHT[self.code()]]
 
-    @abc.abstractmethod
     def next_to_the_left(self) -> 'Direction':
-        ...
+        return _BY_CODE[transitions.TURNED_LEFT[self.code()]]
 
-    @abc.abstractmethod
     def symbol(self) -> str:
-        ...
+        return transitions.SYMBOLS[self.code()]
 
-    @abc.abstractmethod
     def step(self) -> Step:
-        ...
+        return _STEPS[self.code()]
 
     def __repr__(self) -> str:  # pragma: nocover
         return f'{self.__class__.__name__}()'
@@ -60,76 +62,46 @@ class Direction(abc.ABC):
     def __eq__(self, other: object) -> bool:
         if not isinstance(other, Direction):  # pragma: nocover
             return NotImplemented
-        return type(self) == type(other)
-
+        return self.code() == other.code()
 
-class North(Direction):
+    def __hash__(self) -> int:
+        return self.code()
 
-    def opposite(self) -> 'Direction':
-        return Direction.south()
 
-    def next_to_the_right(self) -> 'Direction':
-        return Direction.east()
+class North(Direction):
 
-    def next_to_the_left(self) -> 'Direction':
-        return Direction.west()
+    __slots__ = ()
 
-    def symbol(self) -> str:
-        return 'N'
-
-    def step(self) -> Step:
-        return Step(0, 1)
+    def code(self) -> int:
+        return transitions.NORTH
 
 
 class South(Direction):
 
-    def opposite(self) -> 'Direction':
-        return Direction.north()
-
-    def next_to_the_right(self) -> 'Direction':
-        return Direction.west()
+    __slots__ = ()
 
-    def next_to_the_left(self) -> 'Direction':
-        return Direction.east()
-
-    def symbol(self) -> str:
-        return 'S'
-
-    def step(self) -> Step:
-        return Step(0, -1)
+    def code(self) -> int:
+        return transitions.SOUTH
 
 
 class East(Direction):
 
-    def opposite(self) -> 'Direction':
-        return Direction.west()
-
-    def next_to_the_right(self) -> 'Direction':
-        return Direction.south()
-
-    def next_to_the_left(self) -> 'Direction':
-        return Direction.north()
-
-    def symbol(self) -> str:
-        return 'E'
+    __slots__ = ()
 
-    def step(self) -> Step:
-        return Step(1, 0)
+    def code(self) -> int:
+        return transitions.EAST
 
 
 class West(Direction):
 
-    def opposite(self) -> 'Direction':
-        return Direction.east()
+    __slots__ = ()
 
-    def next_to_the_right(self) -> 'Direction':
-        return Direction.north()
+    def code(self) -> int:
+        return transitions.WEST
 
-    def next_to_the_left(self) -> 'Direction':
-        return Direction.south()
 
-    def symbol(self) -> str:
-        return 'W'
-
-    def step(self) -> Step:
-        return Step(-1, 0)
+_BY_CODE: Tuple[Direction, ...] = (North(), East(), South(), West())
+_BY_SYMBOL: Dict[str, Direction] = {direction.symbol(): direction for direction in _BY_CODE}
+_STEPS: Tuple[Step, ...] = tuple(
+    Step(transitions.POINTS_EAST[code], transitions.POINTS_NORTH[code]) for code in range(len(_BY_CODE))
+)
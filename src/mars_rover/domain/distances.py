@@ -0,0 +1,198 @@
+from array import array
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Sequence
+
+from .coordinates import Coordinates
+from .planner import Unreachable
+from .position import Position
+from .surface import Surface
+from .transitions import TURNED_LEFT
+from .transitions import TURNED_RIGHT
+
+# Tables start out with two bytes per state and widen to four once a distance doesn't fit.
+_NARROW = 'H'
+_WIDE = 'I'
+_FARTHEST = {_NARROW: 0xffff, _WIDE: 0xffffffff}
+
+
+class CommandDistances:
+    # The fewest commands a rover needs to get from any position on a surface to each of
+    # a few sites. Commands undo each other, 'f' and 'b', 'r' and 'l', so it takes as many
+    # commands to get from the site to the position, and a breadth-first search from every
+    # site fills its table. States are numbered like the cells of the surface with a border
+    # of obstacles around it, shifted left by two over the direction code. States that can't
+    # get to a site have the largest distance the table holds.
+
+    @classmethod
+    def to_sites(cls, surface: Surface, sites: Sequence[Position]) -> 'CommandDistances':
+        distances = cls(surface, sites)
+        distances._tables = [distances._table_to(site) for site in distances._site_states]
+        return distances
+
+    def __init__(self, surface: Surface, sites: Sequence[Position]) -> None:
+        north_east = surface.north_east()
+        self._surface = surface
+        self._sites = list(sites)
+        self._columns = columns = north_east.horizontal() + 3
+        rows = north_east.vertical() + 3
+        self._blocked = blocked = bytearray(columns * rows)
+        for horizontal in range(columns):
+            blocked[horizontal] = blocked[(rows - 1) * columns + horizontal] = 1
+        for vertical in range(rows):
+            blocked[vertical * columns] = blocked[vertical * columns + columns - 1] = 1
+        obstacles = surface.obstacles()
+        if obstacles is not None:
+            for vertical in range(rows - 2):
+                for horizontal in range(columns - 2):
+                    if obstacles.blocks(horizontal, vertical):
+                        blocked[(vertical + 1) * columns + horizontal + 1] = 1
+        # Steps to the cell a rover facing each direction gets to going forward.
+        self._forward = (columns, 1, -columns, -1)
+        self._site_states = [self._state(site) for site in self._sites]
+        self._tables: List[array] = []
+
+    def sites(self) -> List[Position]:
+        return list(self._sites)
+
+    def commands_to(self, position: Position, site: int) -> int:
+        table = self._tables[site]
+        state = self._state(position)
+        if state is None or table[state] == _FARTHEST[table.typecode]:
+            raise Unreachable()
+        distance: int = table[state]
+        return distance
+
+    def add_obstacle(self, coordinates: Coordinates) -> None:
+        cell = self._cell(coordinates)
+        if cell is None or self._blocked[cell]:
+            return
+        self._blocked[cell] = 1
+        for index, site in enumerate(self._site_states):
+            if site is None or site >> 2 == cell:
+                self._tables[index] = self._table_to(None)
+            else:
+                self._tables[index] = self._rerouted(self._tables[index], cell)
+
+    def remove_obstacle(self, coordinates: Coordinates) -> None:
+        cell = self._cell(coordinates)
+        if cell is None or not self._blocked[cell]:
+            return
+        self._blocked[cell] = 0
+        for index, site in enumerate(self._site_states):
+            if site is not None and site >> 2 == cell:
+                self._tables[index] = self._table_to(site)
+            else:
+                self._tables[index] = self._spread(self._tables[index], self._seeds(self._tables[index], [
+                    cell << 2 | code for code in range(4)
+                ]))
+
+    def _table_to(self, site: Optional[int]) -> array:
+        table = array(_NARROW, [_FARTHEST[_NARROW]]) * (len(self._blocked) << 2)
+        if site is None or self._blocked[site >> 2]:
+            return table
+        return self._spread(table, {site: 0})
+
+    def _rerouted(self, table: array, cell: int) -> array:
+        # Only states whose every shortest way to the site went through the new obstacle get
+        # further away. Going by distance, a state has lost its way once no state next to it
+        # one step closer to the site has its way left; those states look for a new one.
+        farthest = _FARTHEST[table.typecode]
+        lost = {cell << 2 | code for code in range(4)}
+        candidates: Dict[int, List[int]] = {}
+        for state in lost:
+            if table[state] != farthest:
+                for neighbour in self._neighbours(state):
+                    if table[neighbour] == table[state] + 1:
+                        candidates.setdefault(table[neighbour], []).append(neighbour)
+        while candidates:
+            distance = min(candidates)
+            for state in candidates.pop(distance):
+                if state in lost or any(
+                        table[neighbour] == distance - 1 and neighbour not in lost
+                        for neighbour in self._neighbours(state)
+                ):
+                    continue
+                lost.add(state)
+                for neighbour in self._neighbours(state):
+                    if table[neighbour] == distance + 1:
+                        candidates.setdefault(distance + 1, []).append(neighbour)
+        for state in lost:
+            table[state] = farthest
+        return self._spread(table, self._seeds(table, [state for state in lost if state >> 2 != cell]))
+
+    def _seeds(self, table: array, states: List[int]) -> Dict[int, int]:
+        # Distances the states get from the states next to them.
+        farthest = _FARTHEST[table.typecode]
+        seeds = {}
+        for state in states:
+            nearest = min((table[neighbour] for neighbour in self._neighbours(state)), default=farthest)
+            if nearest < farthest:
+                seeds[state] = nearest + 1
+        return seeds
+
+    def _spread(self, table: array, seeds: Dict[int, int]) -> array:
+        # Breadth-first search, a level at a time, from states given their distances, lowering
+        # the distances of states further away.
+        levels: Dict[int, List[int]] = {}
+        for state, distance in seeds.items():
+            levels.setdefault(distance, []).append(state)
+        blocked = self._blocked
+        forward = self._forward
+        level: List[int] = []
+        distance = min(levels, default=0)
+        while level or levels:
+            farther = distance + 1
+            if farther >= _FARTHEST[table.typecode]:
+                table = self._widened(table)
+            for state in levels.pop(distance, []):
+                if distance < table[state]:
+                    table[state] = distance
+                    level.append(state)
+            next_level = []
+            for state in level:
+                if table[state] != distance:
+                    continue
+                code = state & 3
+                cell = state >> 2
+                step = forward[code]
+                for neighbour in (
+                        cell << 2 | TURNED_RIGHT[code],
+                        cell << 2 | TURNED_LEFT[code],
+                        state if blocked[cell + step] else state + (step << 2),
+                        state if blocked[cell - step] else state - (step << 2),
+                ):
+                    if table[neighbour] > farther:
+                        table[neighbour] = farther
+                        next_level.append(neighbour)
+            level = next_level
+            distance = farther
+        return table
+
+    @staticmethod
+    def _widened(table: array) -> array:
+        if table.typecode == _WIDE:
+            return table
+        farthest = _FARTHEST[_NARROW]
+        return array(_WIDE, (_FARTHEST[_WIDE] if entry == farthest else entry for entry in table))
+
+    def _neighbours(self, state: int) -> Iterator[int]:
+        code = state & 3
+        cell = state >> 2
+        yield cell << 2 | TURNED_RIGHT[code]
+        yield cell << 2 | TURNED_LEFT[code]
+        step = self._forward[code]
+        for moved in (cell + step, cell - step):
+            if not self._blocked[moved]:
+                yield moved << 2 | code
+
+    def _state(self, position: Position) -> Optional[int]:
+        cell = self._cell(position.coordinates())
+        return None if cell is None else cell << 2 | position.direction().code()
+
+    def _cell(self, coordinates: Coordinates) -> Optional[int]:
+        if not self._surface.includes(coordinates.horizontal(), coordinates.vertical()):
+            return None
+        return (coordinates.vertical() + 1) * self._columns + coordinates.horizontal() + 1
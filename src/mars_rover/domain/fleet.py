@@ -0,0 +1,35 @@
+from typing import List
+from typing import Optional
+from typing import Sequence
+
+from .occupancy import Occupancy
+from .position import Position
+from .rover import Rover
+from .surface import Surface
+
+
+class Fleet:
+
+    def __init__(self, surface: Optional[Surface] = None) -> None:
+        self._surface = surface or Surface.of_size(5)
+        self._occupancy = Occupancy()
+        self._rovers: List[Rover] = []
+
+    def land(self, position: Position) -> Rover:
+        rover = Rover(position, self._surface, self._occupancy)
+        self._rovers.append(rover)
+        return rover
+
+    def execute_all(self, commands: Sequence[str]) -> None:
+        # Rovers move in landing order, each one finishing its commands before the next one starts.
+        for rover, rover_commands in zip(self._rovers, commands):
+            rover.execute_all(rover_commands)
+
+    def surface(self) -> Surface:
+        return self._surface
+
+    def rovers(self) -> List[Rover]:
+        return list(self._rovers)
+
+    def positions(self) -> List[Position]:
+        return [rover.position() for rover in self._rovers]
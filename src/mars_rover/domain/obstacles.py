@@ -0,0 +1,84 @@
+import abc
+import mmap
+import struct
+from typing import Iterable
+from typing import Set
+from typing import Union
+
+from .coordinates import Coordinates
+from .coordinates import packed
+
+_HEADER = struct.Struct('<4sII')
+_MAGIC = b'MRO1'
+
+
+class Obstacles(abc.ABC):
+
+    @abc.abstractmethod
+    def blocks(self, horizontal: int, vertical: int) -> bool:
+        ...
+
+    def __contains__(self, coordinates: object) -> bool:
+        if not isinstance(coordinates, Coordinates):  # pragma: nocover
+            raise TypeError(coordinates)
+        return self.blocks(coordinates.horizontal(), coordinates.vertical())
+
+
+class SparseObstacles(Obstacles):
+
+    @classmethod
+    def at(cls, coordinates: Iterable[Coordinates]) -> 'SparseObstacles':
+        return cls({packed(point.horizontal(), point.vertical()) for point in coordinates})
+
+    def __init__(self, packed_coordinates: Set[int]) -> None:
+        self._packed = packed_coordinates
+
+    def blocks(self, horizontal: int, vertical: int) -> bool:
+        return packed(horizontal, vertical) in self._packed
+
+    def __len__(self) -> int:
+        return len(self._packed)
+
+
+class DenseObstacles(Obstacles):
+
+    @classmethod
+    def at(cls, coordinates: Iterable[Coordinates], columns: int, rows: int) -> 'DenseObstacles':
+        bits = bytearray((columns * rows + 7) // 8)
+        for point in coordinates:
+            index = point.vertical() * columns + point.horizontal()
+            bits[index >> 3] |= 1 << (index & 7)
+        return cls(bits, columns, rows)
+
+    @classmethod
+    def load(cls, path: str) -> 'DenseObstacles':
+        with open(path, 'rb') as obstacle_map:
+            try:
+                mapped = mmap.mmap(obstacle_map.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                raise ValueError(f'Invalid obstacle bitmap: {path}')
+        if len(mapped) < _HEADER.size or mapped[:len(_MAGIC)] != _MAGIC:
+            mapped.close()
+            raise ValueError(f'Invalid obstacle bitmap: {path}')
+        _, columns, rows = _HEADER.unpack_from(mapped)
+        if len(mapped) != _HEADER.size + (columns * rows + 7) // 8:
+            mapped.close()
+            raise ValueError(f'Invalid obstacle bitmap: {path}')
+        return cls(memoryview(mapped)[_HEADER.size:], columns, rows)
+
+    def __init__(self, bits: Union[bytearray, memoryview], columns: int, rows: int) -> None:
+        # Bit (vertical * columns + horizontal) is set for every obstacle, least significant bit first.
+        self._bits = bits
+        self._columns = columns
+        self._rows = rows
+
+    def save(self, path: str) -> None:
+        with open(path, 'wb') as obstacle_map:
+            obstacle_map.write(_HEADER.pack(_MAGIC, self._columns, self._rows))
+            obstacle_map.write(self._bits)
+
+    def blocks(self, horizontal: int, vertical: int) -> bool:
+        if not (0 <= horizontal < self._columns and 0 <= vertical < self._rows):
+            return False
+        index = vertical * self._columns + horizontal
+        return bool(self._bits[index >> 3] >> (index & 7) & 1)
@@ -0,0 +1,28 @@
+from typing import Set
+
+from .coordinates import packed
+
+
+class CellOccupied(Exception):
+    pass
+
+
+class Occupancy:
+
+    def __init__(self) -> None:
+        self._packed: Set[int] = set()
+
+    def occupies(self, horizontal: int, vertical: int) -> bool:
+        return packed(horizontal, vertical) in self._packed
+
+    def enter(self, horizontal: int, vertical: int) -> None:
+        cell = packed(horizontal, vertical)
+        if cell in self._packed:
+            raise CellOccupied()
+        self._packed.add(cell)
+
+    def leave(self, horizontal: int, vertical: int) -> None:
+        self._packed.discard(packed(horizontal, vertical))
+
+    def __len__(self) -> int:
+        return len(self._packed)
@@ -0,0 +1,265 @@
+import heapq
+from array import array
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from .position import Position
+from .surface import Surface
+from .transitions import POINTS_EAST
+from .transitions import POINTS_NORTH
+from .transitions import TURNED_LEFT
+from .transitions import TURNED_RIGHT
+
+# Moving backwards, a rover facing either way along an axis makes the same moves, and turning
+# from one axis to the other it picks either way along the new one. So the search only tells
+# the axes apart, and which way the rover faces is settled once the path is known: on the
+# last turn it faces the way it has to end up. A path without turns leaves the rover facing
+# the way it landed, and it turns around at the end if it has to; no path with turns is
+# shorter then, as it takes two of them to get back to the axis.
+_NORTH_SOUTH = 0
+_EAST_WEST = 1
+
+# Steps to states are kept one up, so that zero stands for states not got to, in tables with
+# two bytes per state that widen to four once the steps don't fit.
+_NARROW = 'H'
+_WIDE = 'I'
+_FARTHEST = {_NARROW: 0xffff, _WIDE: 0xffffffff}
+
+
+class Unreachable(Exception):
+    pass
+
+
+def _axis(code: int) -> int:
+    return _EAST_WEST if POINTS_EAST[code] else _NORTH_SOUTH
+
+
+def _final_turns(code: int, target_code: int) -> str:
+    return ('', 'r', 'rr', 'l')[(target_code - code) % 4]
+
+
+class _Search:
+    # A* from one end of a plan towards the other, with commands costing one step each.
+    # States are numbered like the cells of the surface, shifted left by one over the axis.
+    # Keys are twice the steps to a state, plus the estimate of the steps from it to the far
+    # end, less the estimate of the steps back to this end. Both estimates never overestimate
+    # and change by at most one per command, so the keys of this search and of the one from
+    # the far end, keyed the same way, never go down along a path: the two can stop once their
+    # smallest keys add up to twice the shortest path through a state both got to.
+
+    def __init__(self, table: array, origin: Position, goal: Position, surface: Surface) -> None:
+        north_east = surface.north_east()
+        obstacles = surface.obstacles()
+        self._table = table
+        self._east_edge = north_east.horizontal()
+        self._north_edge = north_east.vertical()
+        self._width = self._east_edge + 1
+        self._blocks = obstacles.blocks if obstacles is not None else None
+        self._origin = self._end(origin)
+        self._goal = self._end(goal)
+        # Heap entries pack the key, the steps not taken and the state into a single int, so
+        # that among states as promising the ones furthest along go first; that keeps searches
+        # through open ground close to a single shortest path.
+        self._bits = (self._width * (self._north_edge + 1) << 3).bit_length()
+        self._frontier: List[int] = []
+        # States labelled with their steps, to be cleared once the plan is done.
+        self._labelled = array('q', [self.origin()])
+        horizontal, vertical, axis, _ = self._origin
+        key = self._estimate(horizontal, vertical, axis, self._goal)
+        self._table[self.origin()] = 1
+        self._frontier.append((key << self._bits | (1 << self._bits) - 1) << self._bits | self.origin())
+
+    @staticmethod
+    def _end(position: Position) -> Tuple[int, int, int, Tuple[int, ...]]:
+        # The point and axis of an end, and the fewest turns to end up there from either axis,
+        # by whether the rover still has to move along the other one.
+        coordinates = position.coordinates()
+        axis = _axis(position.direction().code())
+        turns = tuple(
+            1 + (state_axis == axis) if across else int(state_axis != axis)
+            for state_axis in (_NORTH_SOUTH, _EAST_WEST) for across in (False, True)
+        )
+        return coordinates.horizontal(), coordinates.vertical(), axis, turns
+
+    @staticmethod
+    def _estimate(horizontal: int, vertical: int, axis: int, end: Tuple[int, int, int, Tuple[int, ...]]) -> int:
+        end_horizontal, end_vertical, _, turns = end
+        across = vertical != end_vertical if axis == _EAST_WEST else horizontal != end_horizontal
+        return abs(horizontal - end_horizontal) + abs(vertical - end_vertical) + turns[axis << 1 | across]
+
+    def origin(self) -> int:
+        horizontal, vertical, axis, _ = self._origin
+        return (vertical * self._width + horizontal) << 1 | axis
+
+    def table(self) -> array:
+        return self._table
+
+    def meet(self, other: '_Search') -> Tuple[Optional[int], int]:
+        # The length of the shortest path between the ends of the two searches, if there's any,
+        # and the state where the two met on it. The search with fewer states left to look at
+        # goes next, so if either end is walled off, they give up after about as many states
+        # as that end can get to.
+        shortest = 0 if self.origin() == other.origin() else None
+        meeting = self.origin()
+        double_bits = self._bits << 1
+        while self._frontier and other._frontier:
+            if shortest is not None and (
+                    (self._frontier[0] >> double_bits) + (other._frontier[0] >> double_bits) >= 2 * shortest
+            ):
+                break
+            if len(self._frontier) <= len(other._frontier):
+                met = self._expand(other)
+            else:
+                met = other._expand(self)
+            if met is not None and (shortest is None or met[0] < shortest):
+                shortest, meeting = met
+        return shortest, meeting
+
+    def _expand(self, other: '_Search') -> Optional[Tuple[int, int]]:
+        # Labels the states next to the one with the smallest key, and gives the shortest path
+        # between both ends through one of them that the other search got to, with the state.
+        bits = self._bits
+        mask = (1 << bits) - 1
+        entry = heapq.heappop(self._frontier)
+        state = entry & mask
+        steps = mask - (entry >> bits & mask)
+        table = self._table
+        if table[state] != steps + 1:
+            return None
+        next_steps = steps + 1
+        if next_steps + 1 >= _FARTHEST[table.typecode]:
+            self._table = table = array(_WIDE, table)
+        axis = state & _EAST_WEST
+        vertical, horizontal = divmod(state >> 1, self._width)
+        if axis == _EAST_WEST:
+            moves = ((state + 2, horizontal + 1, vertical), (state - 2, horizontal - 1, vertical))
+        else:
+            step = self._width << 1
+            moves = ((state + step, horizontal, vertical + 1), (state - step, horizontal, vertical - 1))
+        turned = state ^ _EAST_WEST
+        goal_horizontal, goal_vertical, _, goal_turns = self._goal
+        origin_horizontal, origin_vertical, _, origin_turns = self._origin
+        other_table = other._table
+        met = None
+        for successor, next_horizontal, next_vertical in ((turned, horizontal, vertical),) + moves:
+            moved = successor != turned
+            if moved and not (0 <= next_horizontal <= self._east_edge and 0 <= next_vertical <= self._north_edge):
+                continue
+            # Looking up the steps first spares looking up obstacles of states got to already.
+            labelled = table[successor]
+            if labelled and labelled <= next_steps + 1:
+                continue
+            if moved and self._blocks is not None and self._blocks(next_horizontal, next_vertical):
+                continue
+            if not labelled:
+                self._labelled.append(successor)
+            table[successor] = next_steps + 1
+            # Both estimates, as _estimate works them out.
+            if successor & _EAST_WEST:
+                to_goal = goal_turns[2 | (next_vertical != goal_vertical)]
+                to_origin = origin_turns[2 | (next_vertical != origin_vertical)]
+            else:
+                to_goal = goal_turns[next_horizontal != goal_horizontal]
+                to_origin = origin_turns[next_horizontal != origin_horizontal]
+            key = (
+                2 * next_steps + to_goal - to_origin +
+                abs(next_horizontal - goal_horizontal) + abs(next_vertical - goal_vertical) -
+                abs(next_horizontal - origin_horizontal) - abs(next_vertical - origin_vertical)
+            )
+            heapq.heappush(self._frontier, (key << bits | mask - next_steps) << bits | successor)
+            other_labelled = other_table[successor]
+            if other_labelled and (met is None or next_steps + other_labelled - 1 < met[0]):
+                met = (next_steps + other_labelled - 1, successor)
+        return met
+
+    def path_to(self, state: int) -> List[int]:
+        # States from this end to a state it got to. Each is a step further than the state next
+        # to it it was labelled from, which kept its steps, so some such state is always found.
+        table = self._table
+        states = [state]
+        while table[state] > 1:
+            state = next(neighbour for neighbour in self._neighbours(state) if table[neighbour] == table[state] - 1)
+            states.append(state)
+        states.reverse()
+        return states
+
+    def _neighbours(self, state: int) -> Iterator[int]:
+        yield state ^ _EAST_WEST
+        axis = state & _EAST_WEST
+        vertical, horizontal = divmod(state >> 1, self._width)
+        for sign in (1, -1):
+            next_horizontal = horizontal + sign if axis == _EAST_WEST else horizontal
+            next_vertical = vertical if axis == _EAST_WEST else vertical + sign
+            if (
+                    0 <= next_horizontal <= self._east_edge and 0 <= next_vertical <= self._north_edge and
+                    (self._blocks is None or not self._blocks(next_horizontal, next_vertical))
+            ):
+                yield (next_vertical * self._width + next_horizontal) << 1 | axis
+
+    def clear(self) -> None:
+        table = self._table
+        for state in self._labelled:
+            table[state] = 0
+
+
+class Planner:
+    # Plans one path at a time: the tables of steps to every state are kept between plans,
+    # and only the states a plan got to are cleared after it.
+
+    def __init__(self, surface: Surface) -> None:
+        self._surface = surface
+        self._tables: List[array] = []
+
+    def commands_between(self, start: Position, target: Position) -> str:
+        # Bidirectional A*, searching from the start and from the target at once; commands undo
+        # each other, so from the target the search takes the same ways back.
+        surface = self._surface
+        for position in (start, target):
+            coordinates = position.coordinates()
+            if not surface.includes(coordinates.horizontal(), coordinates.vertical()) or surface.blocks(
+                    coordinates.horizontal(), coordinates.vertical()):
+                raise Unreachable()
+        if not self._tables:
+            north_east = surface.north_east()
+            size = (north_east.horizontal() + 1) * (north_east.vertical() + 1) << 1
+            self._tables = [array(_NARROW, [0]) * size, array(_NARROW, [0]) * size]
+        forward = _Search(self._tables[0], start, target, surface)
+        backward = _Search(self._tables[1], target, start, surface)
+        try:
+            shortest, meeting = forward.meet(backward)
+            if shortest is None:
+                raise Unreachable()
+            states = forward.path_to(meeting) + backward.path_to(meeting)[-2::-1]
+        finally:
+            forward.clear()
+            backward.clear()
+            self._tables = [forward.table(), backward.table()]
+        width = surface.north_east().horizontal() + 1
+        return self._commands_along(states, width, start.direction().code(), target.direction().code())
+
+    @staticmethod
+    def _commands_along(states: List[int], width: int, start_code: int, target_code: int) -> str:
+        axes = [state & _EAST_WEST for state in states]
+        turns = [index for index in range(1, len(axes)) if axes[index] != axes[index - 1]]
+        last_turn = turns[-1] if turns else 0
+        commands = []
+        code = start_code
+        for index in range(1, len(states)):
+            previous, current = states[index - 1], states[index]
+            if axes[index] != axes[index - 1]:
+                if index == last_turn and TURNED_LEFT[code] == target_code:
+                    commands.append('l')
+                    code = TURNED_LEFT[code]
+                else:
+                    commands.append('r')
+                    code = TURNED_RIGHT[code]
+                continue
+            previous_vertical, previous_horizontal = divmod(previous >> 1, width)
+            current_vertical, current_horizontal = divmod(current >> 1, width)
+            forward = (current_horizontal - previous_horizontal, current_vertical - previous_vertical) == (
+                POINTS_EAST[code], POINTS_NORTH[code],
+            )
+            commands.append('f' if forward else 'b')
+        return ''.join(commands) + _final_turns(code, target_code)
@@ -4,6 +4,8 @@ from .direction import Direction
 
 class Position:
 
+    __slots__ = ('_direction', '_coordinates')
+
     def __init__(self, direction: Direction, coordinates: Coordinates) -> None:
         self._direction = direction
         self._coordinates = coordinates
@@ -33,3 +35,6 @@ class Position:
         if not isinstance(other, Position):  # pragma: nocover
             return NotImplemented
         return self._direction == other._direction and self._coordinates == other._coordinates
+
+    def __hash__(self) -> int:
+        return hash((self._direction, self._coordinates))
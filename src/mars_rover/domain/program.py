@@ -0,0 +1,89 @@
+from typing import Tuple
+
+from .coordinates import Coordinates
+from .direction import Direction
+from .position import Position
+from .surface import Surface
+from .transitions import NORTH
+from .transitions import TRANSITIONS
+
+# (final direction code, points east, points north, westmost, eastmost, southmost, northmost),
+# all relative to the starting coordinates.
+Outcome = Tuple[int, int, int, int, int, int, int]
+
+
+class UnknownCommand(Exception):
+
+    def __init__(self, command: str, index: int) -> None:
+        super().__init__(command, index)
+        self._command = command
+        self._index = index
+
+    def command(self) -> str:
+        return self._command
+
+    def index(self) -> int:
+        return self._index
+
+
+class Program:
+
+    @classmethod
+    def compiled_from(cls, commands: str) -> 'Program':
+        code = NORTH
+        horizontal = vertical = 0
+        west = east = south = north = 0
+        for index, command in enumerate(commands):
+            try:
+                code, points_east, points_north = TRANSITIONS[code][command]
+            except KeyError:
+                raise UnknownCommand(command, index)
+            if points_east or points_north:
+                horizontal += points_east
+                vertical += points_north
+                west = min(west, horizontal)
+                east = max(east, horizontal)
+                south = min(south, vertical)
+                north = max(north, vertical)
+        return cls(commands, (code, horizontal, vertical, west, east, south, north))
+
+    def __init__(self, commands: str, outcome_facing_north: Outcome) -> None:
+        self._commands = commands
+        self._outcomes = [outcome_facing_north]
+        for _ in range(len(TRANSITIONS) - 1):
+            self._outcomes.append(self._turned_right(self._outcomes[-1]))
+
+    @staticmethod
+    def _turned_right(outcome: Outcome) -> Outcome:
+        # Starting a quarter turn further clockwise rotates the whole path by (east, north) -> (north, -east).
+        code, horizontal, vertical, west, east, south, north = outcome
+        return ((code + 1) % len(TRANSITIONS), vertical, -horizontal, south, north, -east, -west)
+
+    def commands(self) -> str:
+        return self._commands
+
+    def stays_inside(self, position: Position, surface: Surface) -> bool:
+        _, _, _, west, east, south, north = self._outcomes[position.direction().code()]
+        horizontal = position.coordinates().horizontal()
+        vertical = position.coordinates().vertical()
+        return (
+            surface.includes(horizontal + west, vertical + south) and
+            surface.includes(horizontal + east, vertical + north)
+        )
+
+    def moved(self, position: Position) -> Position:
+        code, horizontal, vertical, *_ = self._outcomes[position.direction().code()]
+        coordinates = position.coordinates()
+        return Position(
+            Direction.for_code(code),
+            Coordinates(coordinates.horizontal() + horizontal, coordinates.vertical() + vertical),
+        )
+
+    def moved_around(self, position: Position, surface: Surface) -> Position:
+        # On a surface that wraps around, only where the path ends matters, and never how far it reaches.
+        code, horizontal, vertical, *_ = self._outcomes[position.direction().code()]
+        coordinates = position.coordinates()
+        return Position(
+            Direction.for_code(code),
+            Coordinates(*surface.wrapped(coordinates.horizontal() + horizontal, coordinates.vertical() + vertical)),
+        )
@@ -1,38 +1,268 @@
+from typing import Callable
+from typing import Optional
+
+from .coordinates import Coordinates
+from .direction import Direction
+from .occupancy import Occupancy
 from .position import Position
+from .program import Program
+from .program import UnknownCommand
 from .surface import Surface
+from .trajectory import STAYED
+from .trajectory import TURNED_LEFT
+from .trajectory import TURNED_RIGHT
+from .trajectory import Trajectory
+from .transitions import TRANSITIONS
+
+# What came of a move: the rover moved, or the edge of the surface, an obstacle or another rover stopped it.
+MOVED = 'moved'
+BLOCKED_BY_EDGE = 'edge'
+BLOCKED_BY_OBSTACLE = 'obstacle'
+BLOCKED_BY_ROVER = 'rover'
 
 
 class RoverOutsideSurface(Exception):
     pass
 
 
+class RoverOnObstacle(Exception):
+    pass
+
+
 class Rover:
 
-    def __init__(self, position: Position) -> None:
-        self._surface = Surface.of_size(5)
+    def __init__(
+            self,
+            position: Position,
+            surface: Optional[Surface] = None,
+            occupancy: Optional[Occupancy] = None,
+            wrapping: bool = False,
+    ) -> None:
+        self._surface = surface or Surface.of_size(5)
+        self._occupancy = occupancy
+        self._wrapping = wrapping
+        self._blocks = self._blocker()
         if self._outside_the_surface(position):
             raise RoverOutsideSurface()
+        if self._on_obstacle(position):
+            raise RoverOnObstacle()
+        if occupancy is not None:
+            occupancy.enter(position.coordinates().horizontal(), position.coordinates().vertical())
         self._position = position
+        self._obstacle: Optional[Coordinates] = None
+        self._trajectory: Optional[Trajectory] = None
 
     def _outside_the_surface(self, position: Position) -> bool:
         return position.coordinates() not in self._surface
 
-    def move_forward(self) -> None:
-        self._move_to(self._position.moved_forward())
+    def _on_obstacle(self, position: Position) -> bool:
+        return self._surface.blocks(position.coordinates().horizontal(), position.coordinates().vertical())
 
-    def move_backward(self) -> None:
-        self._move_to(self._position.moved_backward())
+    def _blocked(self, position: Position) -> bool:
+        blocks = self._blocks
+        return blocks is not None and blocks(position.coordinates().horizontal(), position.coordinates().vertical())
 
-    def _move_to(self, new_position: Position) -> None:
-        if self._outside_the_surface(new_position):
-            return
+    def _blocker(self) -> Optional[Callable[[int, int], bool]]:
+        # Obstacles and other rovers both stop a rover; None when nothing can.
+        obstacles = self._surface.obstacles()
+        occupancy = self._occupancy
+        if occupancy is None:
+            return None if obstacles is None else obstacles.blocks
+        if obstacles is None:
+            return occupancy.occupies
+        on_obstacle = obstacles.blocks
+        occupied = occupancy.occupies
+        return lambda horizontal, vertical: on_obstacle(horizontal, vertical) or occupied(horizontal, vertical)
+
+    def _relocate(self, new_position: Position) -> None:
+        if self._occupancy is not None:
+            old = self._position.coordinates()
+            self._occupancy.leave(old.horizontal(), old.vertical())
+            self._occupancy.enter(new_position.coordinates().horizontal(), new_position.coordinates().vertical())
         self._position = new_position
 
+    def move_forward(self) -> str:
+        return self._move_to(self._position.moved_forward(), self._position.direction())
+
+    def move_backward(self) -> str:
+        return self._move_to(self._position.moved_backward(), self._position.direction().opposite())
+
+    def _move_to(self, new_position: Position, heading: Direction) -> str:
+        self._obstacle = None
+        if self._wrapping:
+            coordinates = new_position.coordinates()
+            new_position = Position(
+                new_position.direction(),
+                Coordinates(*self._surface.wrapped(coordinates.horizontal(), coordinates.vertical())),
+            )
+            if new_position.coordinates() == self._position.coordinates():
+                # Around a surface one point across, the rover comes back to where it stands.
+                self._record(heading.code())
+                return MOVED
+        if self._outside_the_surface(new_position):
+            self._record(STAYED)
+            return BLOCKED_BY_EDGE
+        if self._blocked(new_position):
+            self._obstacle = new_position.coordinates()
+            self._record(STAYED)
+            return BLOCKED_BY_OBSTACLE if self._on_obstacle(new_position) else BLOCKED_BY_ROVER
+        self._relocate(new_position)
+        self._record(heading.code())
+        return MOVED
+
     def turn_right(self) -> None:
+        self._obstacle = None
         self._position = self._position.turned_right()
+        self._record(TURNED_RIGHT)
 
     def turn_left(self) -> None:
+        self._obstacle = None
         self._position = self._position.turned_left()
+        self._record(TURNED_LEFT)
+
+    def record_trajectory(self, checkpoint_every: int = 64) -> Trajectory:
+        if self._wrapping:
+            # Trajectories replay moves as plain displacements, which a wrapping surface cuts short.
+            raise ValueError('Trajectories of rovers on a wrapping surface are not supported')
+        self._trajectory = Trajectory(self._position, checkpoint_every)
+        return self._trajectory
+
+    def _record(self, event: int) -> None:
+        if self._trajectory is not None:
+            self._trajectory.record(event)
+
+    def execute_all(self, commands: str) -> None:
+        # Ends where executing the commands one at a time would: a blocked move is skipped.
+        self._execute(commands, until_blocked=False)
+
+    def execute_until_blocked(self, commands: str) -> None:
+        # An obstacle or another rover stops the rover along with the rest of the commands.
+        self._execute(commands, until_blocked=True)
+
+    def _execute(self, commands: str, until_blocked: bool) -> None:
+        if self._trajectory is not None:
+            self._execute_one_by_one(commands, until_blocked)
+            return
+        if self._wrapping:
+            self._execute_wrapping(commands, until_blocked)
+            return
+        code = self._position.direction().code()
+        horizontal = self._position.coordinates().horizontal()
+        vertical = self._position.coordinates().vertical()
+        # No edge can be reached if the rover has room for every move in the string.
+        moves = len(commands) - commands.count('r') - commands.count('l')
+        unchecked = self._surface.includes_all_within(moves, horizontal, vertical)
+        includes = self._surface.includes
+        blocks = self._blocks
+        # The rover reports an obstacle only if the last command it got to ran into it.
+        obstacle = None
+        blocked_at = -1
+        last = len(commands) - 1
+        if self._occupancy is not None:
+            self._occupancy.leave(horizontal, vertical)
+        try:
+            for index, command in enumerate(commands):
+                try:
+                    code, points_east, points_north = TRANSITIONS[code][command]
+                except KeyError:
+                    last = index - 1
+                    raise UnknownCommand(command, index)
+                if unchecked or includes(horizontal + points_east, vertical + points_north):
+                    if blocks is not None and blocks(horizontal + points_east, vertical + points_north):
+                        obstacle = Coordinates(horizontal + points_east, vertical + points_north)
+                        blocked_at = index
+                        if until_blocked:
+                            last = index
+                            break
+                        continue
+                    horizontal += points_east
+                    vertical += points_north
+        finally:
+            self._obstacle = obstacle if blocked_at == last else None
+            self._position = Position(Direction.for_code(code), Coordinates(horizontal, vertical))
+            if self._occupancy is not None:
+                self._occupancy.enter(horizontal, vertical)
+
+    def _execute_wrapping(self, commands: str, until_blocked: bool) -> None:
+        code = self._position.direction().code()
+        horizontal = self._position.coordinates().horizontal()
+        vertical = self._position.coordinates().vertical()
+        width = self._surface.north_east().horizontal() + 1
+        height = self._surface.north_east().vertical() + 1
+        blocks = self._blocks
+        obstacle = None
+        blocked_at = -1
+        last = len(commands) - 1
+        if self._occupancy is not None:
+            self._occupancy.leave(horizontal, vertical)
+        try:
+            if blocks is None:
+                # Nothing can stop the rover, so its moves are only wrapped around once, at the end.
+                for index, command in enumerate(commands):
+                    try:
+                        code, points_east, points_north = TRANSITIONS[code][command]
+                    except KeyError:
+                        raise UnknownCommand(command, index)
+                    horizontal += points_east
+                    vertical += points_north
+            else:
+                for index, command in enumerate(commands):
+                    try:
+                        code, points_east, points_north = TRANSITIONS[code][command]
+                    except KeyError:
+                        last = index - 1
+                        raise UnknownCommand(command, index)
+                    if points_east or points_north:
+                        next_horizontal = (horizontal + points_east) % width
+                        next_vertical = (vertical + points_north) % height
+                        if blocks(next_horizontal, next_vertical):
+                            obstacle = Coordinates(next_horizontal, next_vertical)
+                            blocked_at = index
+                            if until_blocked:
+                                last = index
+                                break
+                            continue
+                        horizontal = next_horizontal
+                        vertical = next_vertical
+        finally:
+            self._obstacle = obstacle if blocked_at == last else None
+            horizontal %= width
+            vertical %= height
+            self._position = Position(Direction.for_code(code), Coordinates(horizontal, vertical))
+            if self._occupancy is not None:
+                self._occupancy.enter(horizontal, vertical)
+
+    def _execute_one_by_one(self, commands: str, until_blocked: bool) -> None:
+        action_for = {
+            'f': self.move_forward,
+            'b': self.move_backward,
+            'r': self.turn_right,
+            'l': self.turn_left,
+        }.get
+        for index, command in enumerate(commands):
+            action = action_for(command)
+            if action is None:
+                raise UnknownCommand(command, index)
+            action()
+            if until_blocked and self._obstacle is not None:
+                break
+
+    def run(self, program: Program) -> None:
+        if self._blocks is None and self._trajectory is None and self._wrapping:
+            self._position = program.moved_around(self._position, self._surface)
+        elif self._blocks is None and self._trajectory is None and program.stays_inside(self._position, self._surface):
+            self._position = program.moved(self._position)
+        else:
+            self.execute_all(program.commands())
 
     def position(self) -> Position:
         return self._position
+
+    def surface(self) -> Surface:
+        return self._surface
+
+    def obstacle(self) -> Optional[Coordinates]:
+        return self._obstacle
+
+    def wraps(self) -> bool:
+        return self._wrapping
@@ -1,5 +1,7 @@
 class Step:
 
+    __slots__ = ('_points_east', '_points_north')
+
     def __init__(self, points_east: int, points_north: int) -> None:
         self._points_east = points_east
         self._points_north = points_north
@@ -9,3 +11,11 @@ class Step:
 
     def points_north(self) -> int:
         return self._points_north
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Step):  # pragma: nocover
+            return NotImplemented
+        return self._points_east == other._points_east and self._points_north == other._points_north
+
+    def __hash__(self) -> int:
+        return hash((self._points_east, self._points_north))
@@ -1,19 +1,67 @@
 from typing import Container
+from typing import Optional
+from typing import Tuple
 
 from .coordinates import Coordinates
+from .obstacles import Obstacles
 
 
 class Surface(Container[Coordinates]):
 
     @classmethod
-    def of_size(cls, size: int) -> 'Surface':
-        return cls(size)
+    def of_size(cls, width: int, height: Optional[int] = None, obstacles: Optional[Obstacles] = None) -> 'Surface':
+        return cls(width, width if height is None else height, obstacles)
 
-    def __init__(self, size: int) -> None:
-        self._north_east = Coordinates(size, size)
-        self._south_west = Coordinates(0, 0)
+    def __init__(self, width: int, height: int, obstacles: Optional[Obstacles] = None) -> None:
+        if width < 0 or height < 0:
+            raise ValueError(f'Invalid surface size: {width}x{height}')
+        self._east_edge = width
+        self._north_edge = height
+        self._obstacles = obstacles
+
+    def north_east(self) -> Coordinates:
+        return Coordinates(self._east_edge, self._north_edge)
+
+    def south_west(self) -> Coordinates:
+        return Coordinates(0, 0)
+
+    def obstacles(self) -> Optional[Obstacles]:
+        return self._obstacles
+
+    def blocks(self, horizontal: int, vertical: int) -> bool:
+        return self._obstacles is not None and self._obstacles.blocks(horizontal, vertical)
+
+    def includes(self, horizontal: int, vertical: int) -> bool:
+        return 0 <= horizontal <= self._east_edge and 0 <= vertical <= self._north_edge
+
+    def includes_all_within(self, reach: int, horizontal: int, vertical: int) -> bool:
+        # Whether every point at most `reach` steps away from (horizontal, vertical) is on the surface,
+        # so that a rover starting there may make that many moves without checking the edges.
+        return (
+            reach <= horizontal <= self._east_edge - reach and
+            reach <= vertical <= self._north_edge - reach
+        )
+
+    def wrapped(self, horizontal: int, vertical: int) -> Tuple[int, int]:
+        # Where a point lands when the surface wraps around, east edge to west and north edge to south.
+        return horizontal % (self._east_edge + 1), vertical % (self._north_edge + 1)
 
     def __contains__(self, coordinates: object) -> bool:
         if not isinstance(coordinates, Coordinates):  # pragma: nocover
             raise TypeError(coordinates)
-        return not (coordinates > self._north_east or coordinates < self._south_west)
+        return self.includes(coordinates.horizontal(), coordinates.vertical())
+
+    def __repr__(self) -> str:  # pragma: nocover
+        return f'{self.__class__.__name__}({self._east_edge!r}, {self._north_edge!r})'
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Surface):  # pragma: nocover
+            return NotImplemented
+        return (
+            self._east_edge == other._east_edge and
+            self._north_edge == other._north_edge and
+            self._obstacles is other._obstacles
+        )
+
+    def __hash__(self) -> int:
+        return hash((self._east_edge, self._north_edge, id(self._obstacles)))
@@ -0,0 +1,145 @@
+import struct
+import sys
+from array import array
+from bisect import bisect_right
+from typing import BinaryIO
+from typing import Iterator
+from typing import Tuple
+
+from .coordinates import Coordinates
+from .direction import Direction
+from .position import Position
+from .transitions import POINTS_EAST
+from .transitions import POINTS_NORTH
+from .transitions import SYMBOLS
+
+# Every step of a trajectory is one of these events; the first four are moves
+# by one point in the direction with that code, whichever way the rover faced.
+TURNED_RIGHT = 4
+TURNED_LEFT = 5
+STAYED = 6
+
+_LONGEST_RUN = 2 ** 32 - 1
+_HEADER = struct.Struct('<4sqqBIQ')
+_MAGIC = b'MRT1'
+_EXPORT_BYTES = 64 * 1024
+
+
+class Trajectory:
+
+    def __init__(self, start: Position, checkpoint_every: int = 64) -> None:
+        # Runs of equal events, with the absolute state before every checkpoint_every-th run.
+        self._start = start
+        self._checkpoint_every = checkpoint_every
+        self._events = array('B')
+        self._lengths = array('I')
+        self._checkpoint_steps = array('Q')
+        self._checkpoint_horizontal = array('q')
+        self._checkpoint_vertical = array('q')
+        self._checkpoint_directions = array('B')
+        self._steps = 0
+        self._horizontal = start.coordinates().horizontal()
+        self._vertical = start.coordinates().vertical()
+        self._direction = start.direction().code()
+
+    @classmethod
+    def read_from(cls, stream: BinaryIO) -> 'Trajectory':
+        magic, horizontal, vertical, direction, checkpoint_every, runs = _HEADER.unpack(stream.read(_HEADER.size))
+        if magic != _MAGIC:
+            raise ValueError('Invalid trajectory')
+        trajectory = cls(Position(Direction.for_code(direction), Coordinates(horizontal, vertical)), checkpoint_every)
+        events = array('B')
+        events.frombytes(stream.read(runs))
+        lengths = array('I')
+        lengths.frombytes(stream.read(runs * lengths.itemsize))
+        if len(events) != runs or len(lengths) != runs:
+            raise ValueError('Invalid trajectory')
+        if sys.byteorder == 'big':
+            lengths.byteswap()
+        for event, length in zip(events, lengths):
+            trajectory.record(event, length)
+        return trajectory
+
+    def record(self, event: int, times: int = 1) -> None:
+        events = self._events
+        lengths = self._lengths
+        if events and events[-1] == event and lengths[-1] + times <= _LONGEST_RUN:
+            lengths[-1] += times
+        else:
+            if len(events) % self._checkpoint_every == 0:
+                self._checkpoint_steps.append(self._steps)
+                self._checkpoint_horizontal.append(self._horizontal)
+                self._checkpoint_vertical.append(self._vertical)
+                self._checkpoint_directions.append(self._direction)
+            events.append(event)
+            lengths.append(times)
+        self._steps += times
+        self._horizontal, self._vertical, self._direction = _after(
+            event, times, self._horizontal, self._vertical, self._direction,
+        )
+
+    def __len__(self) -> int:
+        return self._steps
+
+    def position_at(self, step: int) -> Position:
+        if not 0 <= step <= self._steps:
+            raise IndexError(f'No step {step} in a trajectory of {self._steps} steps')
+        checkpoint = bisect_right(self._checkpoint_steps, step) - 1
+        if checkpoint < 0:
+            return self._start
+        remaining = step - self._checkpoint_steps[checkpoint]
+        horizontal = self._checkpoint_horizontal[checkpoint]
+        vertical = self._checkpoint_vertical[checkpoint]
+        direction = self._checkpoint_directions[checkpoint]
+        run = checkpoint * self._checkpoint_every
+        while remaining:
+            times = min(remaining, self._lengths[run])
+            horizontal, vertical, direction = _after(self._events[run], times, horizontal, vertical, direction)
+            remaining -= times
+            run += 1
+        return Position(Direction.for_code(direction), Coordinates(horizontal, vertical))
+
+    def runs(self) -> Iterator[Tuple[int, int]]:
+        return zip(self._events, self._lengths)
+
+    def write_to(self, stream: BinaryIO) -> None:
+        stream.write(_HEADER.pack(
+            _MAGIC,
+            self._start.coordinates().horizontal(),
+            self._start.coordinates().vertical(),
+            self._start.direction().code(),
+            self._checkpoint_every,
+            len(self._events),
+        ))
+        # Run lengths are written little-endian, like the header.
+        lengths = self._lengths
+        if sys.byteorder == 'big':
+            lengths = array('I', lengths)
+            lengths.byteswap()
+        for runs in (memoryview(self._events), memoryview(lengths).cast('B')):
+            for start in range(0, len(runs), _EXPORT_BYTES):
+                stream.write(runs[start:start + _EXPORT_BYTES])
+
+    def memory_size(self) -> int:
+        return sum(
+            runs.buffer_info()[1] * runs.itemsize
+            for runs in (
+                self._events,
+                self._lengths,
+                self._checkpoint_steps,
+                self._checkpoint_horizontal,
+                self._checkpoint_vertical,
+                self._checkpoint_directions,
+            )
+        )
+
+
+def _after(event: int, times: int, horizontal: int, vertical: int, direction: int) -> Tuple[int, int, int]:
+    if event < TURNED_RIGHT:
+        return horizontal + POINTS_EAST[event] * times, vertical + POINTS_NORTH[event] * times, direction
+    # Direction codes run clockwise.
+    if event == TURNED_RIGHT:
+        return horizontal, vertical, (direction + times) % len(SYMBOLS)
+    if event == TURNED_LEFT:
+        return horizontal, vertical, (direction - times) % len(SYMBOLS)
+    return horizontal, vertical, direction
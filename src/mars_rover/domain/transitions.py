@@ -0,0 +1,30 @@
+from typing import Dict
+from typing import Tuple
+
+NORTH, EAST, SOUTH, WEST = range(4)
+
+SYMBOLS = ('N', 'E', 'S', 'W')
+
+POINTS_EAST = (0, 1, 0, -1)
+POINTS_NORTH = (1, 0, -1, 0)
+
+OPPOSITE = (SOUTH, WEST, NORTH, EAST)
+TURNED_RIGHT = (EAST, SOUTH, WEST, NORTH)
+TURNED_LEFT = (WEST, NORTH, EAST, SOUTH)
+
+Transition = Tuple[int, int, int]
+
+
+def _transitions_from(code: int) -> Dict[str, Transition]:
+    return {
+        'f': (code, POINTS_EAST[code], POINTS_NORTH[code]),
+        'b': (code, -POINTS_EAST[code], -POINTS_NORTH[code]),
+        'r': (TURNED_RIGHT[code], 0, 0),
+        'l': (TURNED_LEFT[code], 0, 0),
+    }
+
+
+# TRANSITIONS[direction code][command] -> (new direction code, points east, points north)
+TRANSITIONS: Tuple[Dict[str, Transition], ...] = tuple(
+    _transitions_from(code) for code in (NORTH, EAST, SOUTH, WEST)
+)
@@ -0,0 +1,6 @@
+from .partitioned import PartitionedFleet  # noqa: F401
+from .scheduled import ScheduledFleet  # noqa: F401
+from .vectorized import VectorizedFleet  # noqa: F401
+
+# SharedFleetState is imported from mars_rover.fleet.shared, as multiprocessing.shared_memory
+# it's built on needs Python 3.8.
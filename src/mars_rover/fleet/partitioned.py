@@ -0,0 +1,292 @@
+import multiprocessing
+from multiprocessing.connection import Connection
+from typing import Any
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+
+import numpy as np
+
+from mars_rover.domain import CellOccupied
+from mars_rover.domain import Coordinates
+from mars_rover.domain import Direction
+from mars_rover.domain import Position
+from mars_rover.domain import RoverOutsideSurface
+from mars_rover.domain import Surface
+
+from .scheduled import ScheduledFleet
+from .scheduled import _first_to
+from .scheduled import _occupants
+from .vectorized import _POINTS_EAST
+from .vectorized import _POINTS_NORTH
+from .vectorized import _TURNED
+from .vectorized import Commands
+from .vectorized import command_codes
+
+# Rows of the stripes next to its own that every stripe keeps a copy of: rovers moving to
+# a cell in the first of them may be contending with rovers in the second one.
+_GHOST_ROWS = 2
+
+# Rovers sent between stripes, as arrays of their landing indices, horizontal and
+# vertical points, direction codes and, with ghost rows, cells they're moving to.
+Rovers = Tuple[np.ndarray, ...]
+
+
+def _picked(rovers: Rovers, where: np.ndarray) -> Rovers:
+    return tuple(field[where] for field in rovers)
+
+
+def _joined(*rovers: Rovers) -> Rovers:
+    return tuple(np.concatenate(fields) for fields in zip(*rovers))
+
+
+class _Stripe:
+    # Rovers in rows [south, north) of the surface, kept in landing order and worked on by a
+    # process of its own, and copies of rovers in rows of stripes next to it. Each tick runs
+    # in steps between which stripes tell stripes next to them about their rovers, see
+    # PartitionedFleet.tick.
+
+    def __init__(self, rovers: Rovers, south: int, north: int, east_edge: int, north_edge: int) -> None:
+        self._indices, self._horizontal, self._vertical, self._directions = rovers
+        self._south = south
+        self._north = north
+        self._east_edge = east_edge
+        self._north_edge = north_edge
+        self._columns = east_edge + 1
+        # Like ScheduledFleet, for the rows of the stripe, those it copies and the ones next to
+        # them, that rovers it copies move to.
+        self._first_cell = (south - _GHOST_ROWS - 1) * self._columns
+        cells = (north - south + 2 * _GHOST_ROWS + 2) * self._columns
+        self._grid: Optional[np.ndarray] = None
+        self._claims: Optional[np.ndarray] = None
+        if cells <= ScheduledFleet._GRID_CELLS:
+            self._grid = np.full(cells, -1, dtype=np.int64)
+            self._claims = np.full(cells, -1, dtype=np.int64)
+        # Set by the steps of a tick.
+        self._next_horizontal = self._next_vertical = self._next_directions = np.empty(0)
+        self._own: Rovers = ()
+        self._seen: Rovers = ()
+        self._owned = self._makes_move = np.empty(0, dtype=bool)
+        self._entering = self._entered = np.empty(0, dtype=np.int64)
+
+    def _cells(self, horizontal: np.ndarray, vertical: np.ndarray) -> np.ndarray:
+        return vertical * self._columns + horizontal
+
+    def intents(self, codes: np.ndarray) -> Tuple[Rovers, Rovers]:
+        transitions = self._directions.astype(np.intp) << 8 | codes[self._indices]
+        horizontal = self._horizontal + _POINTS_EAST.ravel().take(transitions)
+        vertical = self._vertical + _POINTS_NORTH.ravel().take(transitions)
+        inside = (horizontal >= 0) & (horizontal <= self._east_edge) & (vertical >= 0) & (vertical <= self._north_edge)
+        self._next_directions = _TURNED.ravel().take(transitions)
+        self._next_horizontal = np.where(inside, horizontal, self._horizontal)
+        self._next_vertical = np.where(inside, vertical, self._vertical)
+        cells = self._cells(self._horizontal, self._vertical)
+        self._own = (self._indices, cells, self._cells(self._next_horizontal, self._next_vertical))
+        south = self._vertical < self._south + _GHOST_ROWS
+        north = self._vertical >= self._north - _GHOST_ROWS
+        return _picked(self._own, south), _picked(self._own, north)
+
+    def moves(self, below: Rovers, above: Rovers) -> Tuple[np.ndarray, np.ndarray]:
+        # Settles which of the rovers this stripe sees get the cells they move to and don't swap
+        # places, like ScheduledFleet does. That's settled right for rovers moving to cells of
+        # this stripe and of the first rows of the others, as all rovers moving there are seen.
+        owned = np.concatenate([np.ones(len(self._indices), dtype=bool), np.zeros(len(below[0]) + len(above[0]), bool)])
+        seen = _joined(self._own, below, above) + (owned,)
+        # Each part is in landing order already, which sorting in order of merges.
+        indices, cells, targets, owned = _picked(seen, np.argsort(seen[0], kind='stable'))
+        moving = np.flatnonzero(targets != cells)
+        local_cells = cells - self._first_cell
+        local_targets = targets - self._first_cell
+        first = moving[_first_to(moving, local_targets[moving], self._claims)]
+        makes_move = np.zeros(len(indices), dtype=bool)
+        makes_move[first] = True
+        if self._grid is not None:
+            self._grid[local_cells] = np.arange(len(cells))
+        occupants = _occupants(local_cells, local_targets[first], self._grid)
+        if self._grid is not None:
+            self._grid[local_cells] = -1
+        entering = first[occupants >= 0]
+        occupants = occupants[occupants >= 0]
+        leaving_to = np.where(makes_move, targets, cells)
+        swapping = leaving_to[occupants] == cells[entering]
+        makes_move[entering[swapping]] = False
+        self._seen = (indices, cells, targets)
+        self._owned = owned
+        self._makes_move = makes_move
+        self._entering = entering[~swapping]
+        self._entered = occupants[~swapping]
+        return self._edge_moves()
+
+    def _edge_moves(self) -> Tuple[np.ndarray, np.ndarray]:
+        # Landing indices of rovers in the first row of this stripe on either side that make
+        # their moves, as far as it's settled.
+        indices, cells, _ = self._seen
+        rows = cells // self._columns
+        moved = self._owned & self._makes_move
+        return indices[moved & (rows == self._south)], indices[moved & (rows == self._north - 1)]
+
+    def stopped(self, below: np.ndarray, above: np.ndarray) -> Tuple[np.ndarray, np.ndarray, bool]:
+        # Takes in the edge moves of the stripes next to it, stops rovers moving to cells of
+        # rovers that stay, and tells whether that stopped any rovers in its first rows.
+        indices, cells, _ = self._seen
+        rows = cells // self._columns
+        first = np.flatnonzero(~self._owned & ((rows == self._south - 1) | (rows == self._north)))
+        self._makes_move[first] = np.isin(indices[first], np.concatenate([below, above]))
+        before = self._edge_moves()
+        entering, entered = self._entering, self._entered
+        while entering.size:
+            staying = ~self._makes_move[entered]
+            if not staying.any():
+                break
+            self._makes_move[entering[staying]] = False
+            entering = entering[~staying]
+            entered = entered[~staying]
+        self._entering, self._entered = entering, entered
+        after = self._edge_moves()
+        return after[0], after[1], any(len(edge) != len(last) for edge, last in zip(after, before))
+
+    def commit(self) -> Tuple[Rovers, Rovers]:
+        # Moves the rovers and hands those that leave the stripe over to the ones next to it.
+        makes_move = self._makes_move[self._owned]
+        self._horizontal = np.where(makes_move, self._next_horizontal, self._horizontal)
+        self._vertical = np.where(makes_move, self._next_vertical, self._vertical)
+        self._directions = self._next_directions
+        rovers = (self._indices, self._horizontal, self._vertical, self._directions)
+        south = self._vertical < self._south
+        north = self._vertical >= self._north
+        (self._indices, self._horizontal, self._vertical, self._directions) = _picked(rovers, ~south & ~north)
+        return _picked(rovers, south), _picked(rovers, north)
+
+    def hand_over(self, below: Rovers, above: Rovers) -> None:
+        rovers = _joined((self._indices, self._horizontal, self._vertical, self._directions), below, above)
+        (self._indices, self._horizontal, self._vertical, self._directions) = _picked(
+            rovers, np.argsort(rovers[0], kind='stable'),
+        )
+
+    def rovers(self) -> Rovers:
+        return self._indices, self._horizontal, self._vertical, self._directions
+
+
+def _work_on(connection: Connection, stripe: _Stripe) -> None:
+    # Runs the stripe's steps the fleet asks for, until it asks for none.
+    while True:
+        request = connection.recv()
+        if request is None:
+            break
+        step, arguments = request
+        connection.send(getattr(stripe, step)(*arguments))
+
+
+class PartitionedFleet:
+    # Rovers of a ScheduledFleet split into stripes of rows of the surface, each one worked
+    # on by a process of its own, ending up where they would in a single process.
+
+    @classmethod
+    def landing_at(
+            cls,
+            positions: Sequence[Position],
+            surface: Optional[Surface] = None,
+            workers: int = 2,
+    ) -> 'PartitionedFleet':
+        return cls(
+            np.array([position.coordinates().horizontal() for position in positions], dtype=np.int64),
+            np.array([position.coordinates().vertical() for position in positions], dtype=np.int64),
+            np.array([position.direction().code() for position in positions], dtype=np.uint8),
+            surface or Surface.of_size(5),
+            workers,
+        )
+
+    def __init__(
+            self,
+            horizontal: np.ndarray,
+            vertical: np.ndarray,
+            directions: np.ndarray,
+            surface: Surface,
+            workers: int = 2,
+    ) -> None:
+        horizontal = np.array(horizontal, dtype=np.int64)
+        vertical = np.array(vertical, dtype=np.int64)
+        directions = np.array(directions, dtype=np.uint8)
+        if surface.obstacles() is not None:
+            raise ValueError('PartitionedFleet only supports surfaces without obstacles')
+        east_edge = surface.north_east().horizontal()
+        north_edge = surface.north_east().vertical()
+        if not ((horizontal >= 0) & (horizontal <= east_edge) & (vertical >= 0) & (vertical <= north_edge)).all():
+            raise RoverOutsideSurface()
+        if np.unique(vertical * (east_edge + 1) + horizontal).size != len(horizontal):
+            raise CellOccupied()
+        self._count = len(horizontal)
+        # Stripes are at least as high as the rows they copy from the stripes next to them.
+        stripes = max(min(workers, (north_edge + 1) // _GHOST_ROWS), 1)
+        bounds = [(north_edge + 1) * stripe // stripes for stripe in range(stripes + 1)]
+        self._connections: List[Connection] = []
+        self._processes = []
+        rovers = (np.arange(self._count), horizontal, vertical, directions)
+        for south, north in zip(bounds, bounds[1:]):
+            stripe = _Stripe(_picked(rovers, (vertical >= south) & (vertical < north)), south, north, east_edge,
+                             north_edge)
+            connection, worker_connection = multiprocessing.Pipe()
+            process = multiprocessing.Process(target=_work_on, args=(worker_connection, stripe), daemon=True)
+            process.start()
+            worker_connection.close()
+            self._connections.append(connection)
+            self._processes.append(process)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def workers(self) -> int:
+        return len(self._processes)
+
+    def _step(self, step: str, *arguments: Any) -> List[Any]:
+        for connection in self._connections:
+            connection.send((step, arguments))
+        return [connection.recv() for connection in self._connections]
+
+    def _exchanged(self, step: str, replies: List[Tuple[Any, ...]], empty: Any) -> List[Any]:
+        # Runs the step of every stripe with what the stripes next to it sent to its side.
+        for index, connection in enumerate(self._connections):
+            below = replies[index - 1][1] if index > 0 else empty
+            above = replies[index + 1][0] if index + 1 < len(replies) else empty
+            connection.send((step, (below, above)))
+        return [connection.recv() for connection in self._connections]
+
+    def tick(self, commands: Commands) -> None:
+        # Stripes tell each other which cells rovers in rows next to them move to, settle which
+        # of them do, stop rovers moving to cells of those that stay, over and over until no rover
+        # near another stripe is stopped, then hand rovers moving out of them over.
+        codes = command_codes(commands, self._count)
+        nothing = np.empty(0, dtype=np.int64)
+        edges = self._exchanged('moves', self._step('intents', codes), (nothing,) * 3)
+        while True:
+            stopped = self._exchanged('stopped', edges, nothing)
+            edges = [(south, north) for south, north, _ in stopped]
+            if not any(changed for _, _, changed in stopped):
+                break
+        self._exchanged('hand_over', self._step('commit'), (nothing,) * 3 + (np.empty(0, dtype=np.uint8),))
+
+    def _rovers(self) -> Rovers:
+        return _joined(*self._step('rovers'))
+
+    def positions(self) -> List[Position]:
+        indices, horizontal, vertical, directions = self._rovers()
+        order = np.argsort(indices)
+        return [
+            Position(Direction.for_code(int(code)), Coordinates(int(east), int(north)))
+            for east, north, code in zip(horizontal[order], vertical[order], directions[order])
+        ]
+
+    def close(self) -> None:
+        for connection, process in zip(self._connections, self._processes):
+            connection.send(None)
+            process.join()
+            connection.close()
+        self._connections = []
+        self._processes = []
+
+    def __enter__(self) -> 'PartitionedFleet':
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
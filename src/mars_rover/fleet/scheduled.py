@@ -0,0 +1,120 @@
+from typing import Optional
+
+import numpy as np
+
+from mars_rover.domain import CellOccupied
+from mars_rover.domain import Surface
+
+from .vectorized import _POINTS_EAST
+from .vectorized import _POINTS_NORTH
+from .vectorized import _TURNED
+from .vectorized import Commands
+from .vectorized import VectorizedFleet
+
+
+def _first_to(moving: np.ndarray, targets: np.ndarray, claims: Optional[np.ndarray]) -> np.ndarray:
+    # Positions among the moving rovers, in landing order, of those landed first of the ones
+    # moving to each cell. Claims, if given, has -1 for every cell and is left so.
+    if claims is None:
+        _, first = np.unique(targets, return_index=True)
+        return np.sort(first)
+    # Of values assigned to the same index, the last one stays.
+    claims[targets[::-1]] = moving[::-1]
+    first = np.flatnonzero(claims[targets] == moving)
+    claims[targets] = -1
+    return first
+
+
+def _occupants(cells: np.ndarray, targets: np.ndarray, grid: Optional[np.ndarray]) -> np.ndarray:
+    # Indices of rovers on the target cells, -1 for empty ones. Grid, if given, has the index
+    # of the rover on every cell.
+    if grid is not None:
+        occupants: np.ndarray = grid[targets]
+        return occupants
+    by_cell = np.argsort(cells)
+    sorted_cells = cells[by_cell]
+    found = np.minimum(np.searchsorted(sorted_cells, targets), len(cells) - 1)
+    return np.where(sorted_cells[found] == targets, by_cell[found], -1)
+
+
+class ScheduledFleet(VectorizedFleet):
+    # Rovers on cells of their own taking one command each per tick, all at the same time,
+    # so that where they end up doesn't depend on the order they're kept in:
+    # - of rovers moving to the same cell, the one landed first gets there,
+    # - two rovers moving to each other's cells both stay where they are,
+    # - a rover moving to a cell of a rover that stays where it is stays too,
+    # and the rest of the moves are made at once. Rovers leaving a cell let others in,
+    # so a line of rovers moving one after another moves as a whole. A rover that lost
+    # a cell to one that was stopped after all stays where it is.
+
+    # Surfaces with at most as many cells keep the index of the rover on every cell, others
+    # look rovers up in their cells sorted.
+    _GRID_CELLS = 1 << 24
+
+    def __init__(
+            self,
+            horizontal: np.ndarray,
+            vertical: np.ndarray,
+            directions: np.ndarray,
+            surface: Surface,
+    ) -> None:
+        super().__init__(horizontal, vertical, directions, surface)
+        self._columns = self._east_edge + 1
+        cells = self._columns * (self._north_edge + 1)
+        self._grid: Optional[np.ndarray] = None
+        self._claims: Optional[np.ndarray] = None
+        if cells <= self._GRID_CELLS:
+            self._grid = np.full(cells, -1, dtype=np.int64)
+            self._claims = np.full(cells, -1, dtype=np.int64)
+            self._grid[self._cells()] = np.arange(len(self))
+            if np.count_nonzero(self._grid >= 0) != len(self):
+                raise CellOccupied()
+        elif np.unique(self._cells()).size != len(self):
+            raise CellOccupied()
+
+    def _cells(self) -> np.ndarray:
+        return self._vertical * self._columns + self._horizontal
+
+    def tick(self, commands: Commands) -> None:
+        # Looked up by index into the flattened transition tables, which is faster than by pairs.
+        transitions = self._directions.astype(np.intp) << 8 | self._command_codes(commands)
+        horizontal = self._horizontal + _POINTS_EAST.ravel().take(transitions)
+        vertical = self._vertical + _POINTS_NORTH.ravel().take(transitions)
+        moving = np.flatnonzero(
+            ((horizontal != self._horizontal) | (vertical != self._vertical)) &
+            self._inside_the_surface(horizontal, vertical),
+        )
+        cells = self._cells()
+        targets = vertical[moving] * self._columns + horizontal[moving]
+        moves = self._moves(cells, moving, targets)
+        if self._grid is not None:
+            self._grid[cells[moves]] = -1
+            self._grid[vertical[moves] * self._columns + horizontal[moves]] = moves
+        self._horizontal[moves] = horizontal[moves]
+        self._vertical[moves] = vertical[moves]
+        self._directions = _TURNED.ravel().take(transitions)
+
+    def _moves(self, cells: np.ndarray, moving: np.ndarray, targets: np.ndarray) -> np.ndarray:
+        # Indices of the moving rovers that make their moves.
+        first = _first_to(moving, targets, self._claims)
+        moving, targets = moving[first], targets[first]
+        occupants = _occupants(cells, targets, self._grid)
+        taken = occupants >= 0
+        makes_move = np.zeros(len(cells), dtype=bool)
+        makes_move[moving] = True
+        entering = moving[taken]
+        occupants = occupants[taken]
+        leaving_to = cells.copy()
+        leaving_to[moving] = targets
+        swapping = leaving_to[occupants] == cells[entering]
+        makes_move[entering[swapping]] = False
+        entering = entering[~swapping]
+        occupants = occupants[~swapping]
+        while entering.size:
+            staying = ~makes_move[occupants]
+            if not staying.any():
+                break
+            makes_move[entering[staying]] = False
+            entering = entering[~staying]
+            occupants = occupants[~staying]
+        return np.flatnonzero(makes_move)
@@ -0,0 +1,127 @@
+import time
+import zlib
+from multiprocessing import resource_tracker
+from multiprocessing import shared_memory
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import Union
+
+import numpy as np
+
+from mars_rover.domain import Coordinates
+from mars_rover.domain import Direction
+from mars_rover.domain import Position
+
+from .vectorized import VectorizedFleet
+
+# A generation, the number of rovers and the CRC-32 of their records, then a record for every rover.
+_HEADER = np.dtype([('generation', '<u8'), ('count', '<u8'), ('checksum', '<u8')])
+RECORD = np.dtype([('horizontal', '<u4'), ('vertical', '<u4'), ('direction', 'u1')])
+
+
+class SharedFleetState:
+    # Positions of a fleet in shared memory, written by a single process and read by any
+    # number of others, without pickling. The writer makes the generation odd while it
+    # writes records, stores their checksum and makes it even again once it's done, so
+    # readers copy the records between two reads of the same even generation. Readers never
+    # hold the writer up; they copy again when they catch it writing. CPUs that reorder
+    # stores and loads to the memory, as ARM does, can let a reader see the generation
+    # unchanged around a torn copy, so copies are only taken if their checksum matches too.
+
+    @classmethod
+    def create(cls, count: int, name: Optional[str] = None) -> 'SharedFleetState':
+        memory = shared_memory.SharedMemory(name, create=True, size=_HEADER.itemsize + RECORD.itemsize * count)
+        np.ndarray((), dtype=_HEADER, buffer=memory.buf)['count'] = count
+        return cls(memory, owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> 'SharedFleetState':
+        memory = shared_memory.SharedMemory(name)
+        # Only the process that created the memory removes it; without this, the resource
+        # tracker of a reader would remove it when the reader exits.
+        resource_tracker.unregister(memory._name, 'shared_memory')  # type: ignore[attr-defined]
+        return cls(memory, owner=False)
+
+    def __init__(self, memory: shared_memory.SharedMemory, owner: bool) -> None:
+        self._memory = memory
+        self._owner = owner
+        self._header = np.ndarray((), dtype=_HEADER, buffer=memory.buf)
+        count = int(self._header['count'])
+        self._records = np.ndarray((count,), dtype=RECORD, buffer=memory.buf, offset=_HEADER.itemsize)
+        # The same records as plain bytes, which copy several times faster.
+        self._bytes = np.ndarray((count * RECORD.itemsize,), dtype=np.uint8, buffer=memory.buf, offset=_HEADER.itemsize)
+
+    def name(self) -> str:
+        return self._memory.name
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def generation(self) -> int:
+        return int(self._header['generation'])
+
+    def publish(self, positions: Sequence[Position]) -> None:
+        records = np.array([
+            (position.coordinates().horizontal(), position.coordinates().vertical(), position.direction().code())
+            for position in positions
+        ], dtype=RECORD)
+        self._write(slice(None), records)
+
+    def publish_fleet(self, fleet: VectorizedFleet) -> None:
+        records = np.empty(len(fleet), dtype=RECORD)
+        records['horizontal'] = fleet.horizontal()
+        records['vertical'] = fleet.vertical()
+        records['direction'] = fleet.directions()
+        self._write(slice(None), records)
+
+    def update(self, index: int, position: Position) -> None:
+        # Takes the checksum of all records again, so whole fleets are better published at once.
+        coordinates = position.coordinates()
+        self._write(index, np.array(
+            (coordinates.horizontal(), coordinates.vertical(), position.direction().code()), dtype=RECORD,
+        ))
+
+    def _write(self, where: Union[int, slice], records: np.ndarray) -> None:
+        if not self._owner:
+            raise ValueError('Only the process that created the fleet state writes to it')
+        self._header['generation'] += 1
+        self._records[where] = records
+        self._header['checksum'] = zlib.crc32(self._bytes.data)
+        self._header['generation'] += 1
+
+    def snapshot(self) -> np.ndarray:
+        # A copy of the records of a single generation. Readers caught up with the writer give
+        # up the CPU before trying again, so on a single core they don't spin until preempted.
+        header = self._header
+        while True:
+            generation = int(header['generation'])
+            if not generation & 1:
+                copied = self._bytes.copy()
+                checksum = int(header['checksum'])
+                if int(header['generation']) == generation and zlib.crc32(copied.data) == checksum:
+                    return copied.view(RECORD)
+            time.sleep(0)
+
+    def positions(self) -> List[Position]:
+        directions = [Direction.for_code(code) for code in range(4)]
+        return [
+            Position(directions[code], Coordinates(horizontal, vertical))
+            for horizontal, vertical, code in self.snapshot().tolist()
+        ]
+
+    def close(self) -> None:
+        # Views of the memory have to go before it can be closed.
+        del self._header, self._records, self._bytes
+        self._memory.close()
+        if self._owner:
+            # Readers started by the writer share its resource tracker, and they may have
+            # taken the memory off it when attaching.
+            resource_tracker.register(self._memory._name, 'shared_memory')  # type: ignore[attr-defined]
+            self._memory.unlink()
+
+    def __enter__(self) -> 'SharedFleetState':
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
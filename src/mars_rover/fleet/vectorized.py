@@ -0,0 +1,117 @@
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+from typing import Union
+
+import numpy as np
+
+from mars_rover.domain import Coordinates
+from mars_rover.domain import Direction
+from mars_rover.domain import Position
+from mars_rover.domain import RoverOutsideSurface
+from mars_rover.domain import Surface
+from mars_rover.domain import UnknownCommand
+from mars_rover.domain.transitions import TRANSITIONS
+
+Commands = Union[str, bytes, np.ndarray]
+
+
+def _transition_tables() -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    # Indexed by [direction code, command byte]; unknown command bytes stay invalid.
+    turned = np.zeros((len(TRANSITIONS), 256), dtype=np.uint8)
+    points_east = np.zeros((len(TRANSITIONS), 256), dtype=np.int64)
+    points_north = np.zeros((len(TRANSITIONS), 256), dtype=np.int64)
+    valid = np.zeros(256, dtype=bool)
+    for code, transitions in enumerate(TRANSITIONS):
+        for command, (new_code, east, north) in transitions.items():
+            turned[code, ord(command)] = new_code
+            points_east[code, ord(command)] = east
+            points_north[code, ord(command)] = north
+            valid[ord(command)] = True
+    return turned, points_east, points_north, valid
+
+
+_TURNED, _POINTS_EAST, _POINTS_NORTH, _VALID = _transition_tables()
+
+
+def command_codes(commands: Commands, count: int) -> np.ndarray:
+    # One command byte for each of `count` rovers.
+    if isinstance(commands, str):
+        commands = commands.encode('latin-1')
+    if isinstance(commands, bytes):
+        codes = np.frombuffer(commands, dtype=np.uint8)
+    else:
+        codes = np.asarray(commands, dtype=np.uint8)
+    if codes.shape != (count,):
+        raise ValueError(f'Expected {count} commands, got {codes.size}')
+    unknown = np.flatnonzero(~_VALID[codes])
+    if unknown.size:
+        index = int(unknown[0])
+        raise UnknownCommand(chr(codes[index]), index)
+    return codes
+
+
+class VectorizedFleet:
+
+    @classmethod
+    def landing_at(cls, positions: Sequence[Position], surface: Optional[Surface] = None) -> 'VectorizedFleet':
+        return cls(
+            np.array([position.coordinates().horizontal() for position in positions], dtype=np.int64),
+            np.array([position.coordinates().vertical() for position in positions], dtype=np.int64),
+            np.array([position.direction().code() for position in positions], dtype=np.uint8),
+            surface or Surface.of_size(5),
+        )
+
+    def __init__(
+            self,
+            horizontal: np.ndarray,
+            vertical: np.ndarray,
+            directions: np.ndarray,
+            surface: Surface,
+    ) -> None:
+        self._horizontal = np.array(horizontal, dtype=np.int64)
+        self._vertical = np.array(vertical, dtype=np.int64)
+        self._directions = np.array(directions, dtype=np.uint8)
+        if surface.obstacles() is not None:
+            raise ValueError('VectorizedFleet only supports surfaces without obstacles')
+        self._east_edge = surface.north_east().horizontal()
+        self._north_edge = surface.north_east().vertical()
+        if not self._inside_the_surface(self._horizontal, self._vertical).all():
+            raise RoverOutsideSurface()
+
+    def __len__(self) -> int:
+        return len(self._directions)
+
+    def _inside_the_surface(self, horizontal: np.ndarray, vertical: np.ndarray) -> np.ndarray:
+        return (
+            (horizontal >= 0) & (horizontal <= self._east_edge) &
+            (vertical >= 0) & (vertical <= self._north_edge)
+        )
+
+    def tick(self, commands: Commands) -> None:
+        codes = self._command_codes(commands)
+        directions = self._directions
+        horizontal = self._horizontal + _POINTS_EAST[directions, codes]
+        vertical = self._vertical + _POINTS_NORTH[directions, codes]
+        inside = self._inside_the_surface(horizontal, vertical)
+        np.copyto(self._horizontal, horizontal, where=inside)
+        np.copyto(self._vertical, vertical, where=inside)
+        self._directions = _TURNED[directions, codes]
+
+    def _command_codes(self, commands: Commands) -> np.ndarray:
+        return command_codes(commands, len(self))
+
+    def horizontal(self) -> np.ndarray:
+        return self._horizontal
+
+    def vertical(self) -> np.ndarray:
+        return self._vertical
+
+    def directions(self) -> np.ndarray:
+        return self._directions
+
+    def position(self, index: int) -> Position:
+        return Position(
+            Direction.for_code(int(self._directions[index])),
+            Coordinates(int(self._horizontal[index]), int(self._vertical[index])),
+        )
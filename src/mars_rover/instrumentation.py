@@ -0,0 +1,195 @@
+import contextlib
+import threading
+import time
+from contextvars import ContextVar
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from mars_rover.application import MarsRoverApplication
+from mars_rover.application import PositionFormat
+from mars_rover.application import UserInputError
+from mars_rover.domain import Program
+from mars_rover.domain import Rover
+from mars_rover.domain.rover import MOVED
+
+Method = Callable[..., Any]
+
+
+class Histogram:
+
+    def __init__(self) -> None:
+        # Bucket i counts observations under 2**i microseconds, and over half of that.
+        self._buckets: List[int] = []
+        self._count = 0
+        self._total = 0.0
+
+    def observe(self, seconds: float) -> None:
+        bucket = int(seconds * 1e6).bit_length()
+        if bucket >= len(self._buckets):
+            self._buckets.extend([0] * (bucket + 1 - len(self._buckets)))
+        self._buckets[bucket] += 1
+        self._count += 1
+        self._total += seconds
+
+    def count(self) -> int:
+        return self._count
+
+    def total(self) -> float:
+        return self._total
+
+    def buckets(self) -> Dict[int, int]:
+        # Observations by the microseconds they stayed under.
+        return {2 ** bucket: count for bucket, count in enumerate(self._buckets) if count}
+
+    def __repr__(self) -> str:  # pragma: nocover
+        return f'{self.__class__.__name__}(count={self._count!r}, total={self._total!r})'
+
+
+class Registry:
+
+    def __init__(self) -> None:
+        self._counters: Dict[str, int] = {}
+        self._histograms: Dict[str, Histogram] = {}
+
+    def count(self, name: str, amount: int = 1) -> None:
+        self._counters[name] = self._counters.get(name, 0) + amount
+
+    def observe(self, name: str, seconds: float) -> None:
+        histogram = self._histograms.get(name)
+        if histogram is None:
+            histogram = self._histograms[name] = Histogram()
+        histogram.observe(seconds)
+
+    def counter(self, name: str) -> int:
+        return self._counters.get(name, 0)
+
+    def histogram(self, name: str) -> Histogram:
+        return self._histograms.get(name, Histogram())
+
+    def dump(self) -> str:
+        lines = [f'counter {name} {value}' for name, value in sorted(self._counters.items())]
+        for name, histogram in sorted(self._histograms.items()):
+            buckets = ' '.join(f'<{bound}us={count}' for bound, count in histogram.buckets().items())
+            lines.append(f'histogram {name} count={histogram.count()} total={histogram.total():.6f}s {buckets}')
+        return ''.join(f'{line}\n' for line in lines)
+
+
+# The registry instrumented code counts into, in this thread or task; None outside of instrumented blocks.
+_registry: 'ContextVar[Optional[Registry]]' = ContextVar('registry', default=None)
+# Blocks running in any thread, and the plain methods to put back once none are.
+_lock = threading.Lock()
+_blocks = 0
+_plain: List[Tuple[type, str, Any]] = []
+
+
+@contextlib.contextmanager
+def instrumented(registry: Registry) -> Iterator[Registry]:
+    # Instrumented methods replace the plain ones only while a block like this one runs, so
+    # missions run otherwise take exactly the code paths they always did. Code run in the
+    # block counts into the registry of the innermost one; other threads, and tasks started
+    # outside of it, fall back to the plain methods.
+    _patch()
+    token = _registry.set(registry)
+    try:
+        yield registry
+    finally:
+        _registry.reset(token)
+        _unpatch()
+
+
+def _patch() -> None:
+    global _blocks, _plain
+    with _lock:
+        if not _blocks:
+            methods = _instrumented_methods()
+            _plain = [(owner, name, owner.__dict__[name]) for owner, name, _ in methods]
+            for owner, name, method in methods:
+                setattr(owner, name, method)
+        _blocks += 1
+
+
+def _unpatch() -> None:
+    global _blocks, _plain
+    with _lock:
+        _blocks -= 1
+        if not _blocks:
+            for owner, name, original in _plain:
+                setattr(owner, name, original)
+            _plain = []
+
+
+def _instrumented_methods() -> List[Tuple[type, str, Any]]:
+    return [
+        (Rover, 'move_forward', _moving(Rover.move_forward, 'f')),
+        (Rover, 'move_backward', _moving(Rover.move_backward, 'b')),
+        (Rover, 'turn_right', _counting(Rover.turn_right, 'commands.r')),
+        (Rover, 'turn_left', _counting(Rover.turn_left, 'commands.l')),
+        # Every step goes through the instrumented commands instead of the integer fast path.
+        (Rover, '_execute', _timed(Rover._execute_one_by_one, 'phase.execute', plain=Rover._execute)),
+        (Rover, 'run', _switched(Rover.run, _run_step_by_step)),
+        (MarsRoverApplication, 'execute', _timed(MarsRoverApplication.execute, 'phase.dispatch')),
+        (PositionFormat, 'position_from', _timed(PositionFormat.position_from, 'phase.parse')),
+        (PositionFormat, 'positions_from', _timed(PositionFormat.positions_from, 'phase.parse_lines')),
+    ] + [
+        (UserInputError, kind, _counting_errors(getattr(UserInputError, kind).__func__, kind))
+        for kind in ('invalid_position', 'invalid_direction', 'unknown_command', 'rover_outside_surface',
+                     'rover_on_obstacle')
+    ]
+
+
+def _counting(method: Method, name: str) -> Method:
+    def counted(*args: Any) -> Any:
+        registry = _registry.get()
+        if registry is not None:
+            registry.count(name)
+        return method(*args)
+    return counted
+
+
+def _counting_errors(factory: Method, kind: str) -> classmethod:
+    def counted(cls: type, *args: Any) -> Any:
+        registry = _registry.get()
+        if registry is not None:
+            registry.count(f'errors.{kind}')
+        return factory(cls, *args)
+    return classmethod(counted)
+
+
+def _moving(move: Callable[[Rover], str], command: str) -> Method:
+    def moved(rover: Rover) -> str:
+        result = move(rover)
+        registry = _registry.get()
+        if registry is not None:
+            registry.count(f'commands.{command}')
+            if result != MOVED:
+                registry.count(f'blocked.{result}')
+        return result
+    return moved
+
+
+def _timed(method: Method, name: str, plain: Optional[Method] = None) -> Method:
+    def timed(*args: Any, **kwargs: Any) -> Any:
+        registry = _registry.get()
+        if registry is None:
+            return (plain or method)(*args, **kwargs)
+        started = time.perf_counter()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            registry.observe(name, time.perf_counter() - started)
+    return timed
+
+
+def _switched(plain: Method, method: Method) -> Method:
+    def switched(*args: Any) -> Any:
+        return (plain if _registry.get() is None else method)(*args)
+    return switched
+
+
+def _run_step_by_step(rover: Rover, program: Program) -> None:
+    rover.execute_all(program.commands())
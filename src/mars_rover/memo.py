@@ -0,0 +1,156 @@
+from collections import OrderedDict
+from sys import getsizeof
+from typing import List
+from typing import Optional
+from typing import Tuple
+from typing import Union
+
+from mars_rover.application import PositionFormat
+from mars_rover.application import UserInputError
+from mars_rover.domain import Coordinates
+from mars_rover.domain import Position
+from mars_rover.domain import Rover
+from mars_rover.domain import RoverOnObstacle
+from mars_rover.domain import RoverOutsideSurface
+from mars_rover.domain import Surface
+from mars_rover.domain import UnknownCommand
+
+# The number of a prefix of commands, the rover after it, and the obstacle that stopped it, if any.
+State = Tuple[int, Position, Optional[Coordinates]]
+# Prefixes make a trie: each is keyed by the number of the prefix a stride shorter, or by the
+# landing position for the first stride, and its last stride of commands.
+Key = Tuple[Union[int, Position], str]
+
+# Roughly what an OrderedDict takes for an entry besides its key and value: a slot of the
+# hash table and a link in the order of use.
+_ENTRY_OVERHEAD = 112
+
+
+def _size_of(key: Key, state: State) -> int:
+    # Bytes an entry is estimated to hold, leaving out what other entries hold already: the
+    # landing position, or the number of the prefix a stride shorter.
+    _, commands = key
+    number, position, obstacle = state
+    size = _ENTRY_OVERHEAD + getsizeof(key) + getsizeof(commands) + getsizeof(state) + getsizeof(number)
+    for coordinates in (position.coordinates(), obstacle):
+        if coordinates is not None:
+            size += getsizeof(coordinates) + getsizeof(coordinates.horizontal()) + getsizeof(coordinates.vertical())
+    return size + getsizeof(position)
+
+
+class CacheStatistics:
+
+    def __init__(self, hits: int, misses: int, evictions: int, entries: int, estimated_bytes: int) -> None:
+        self._hits = hits
+        self._misses = misses
+        self._evictions = evictions
+        self._entries = entries
+        self._estimated_bytes = estimated_bytes
+
+    def hits(self) -> int:
+        return self._hits
+
+    def misses(self) -> int:
+        return self._misses
+
+    def evictions(self) -> int:
+        return self._evictions
+
+    def entries(self) -> int:
+        return self._entries
+
+    def estimated_bytes(self) -> int:
+        return self._estimated_bytes
+
+    def __repr__(self) -> str:  # pragma: nocover
+        return (
+            f'{self.__class__.__name__}({self._hits!r}, {self._misses!r}, '
+            f'{self._evictions!r}, {self._entries!r}, {self._estimated_bytes!r})'
+        )
+
+
+class MemoizingExecutor:
+
+    def __init__(self, surface: Optional[Surface] = None, stride: int = 1024, max_bytes: int = 64 << 20) -> None:
+        # Rover states are kept after every `stride` commands, keyed by the prefix of commands
+        # itself, and evicted least recently used first once their estimated size goes over
+        # max_bytes. Longer prefixes are evicted before the shorter ones they extend.
+        self._surface = surface or Surface.of_size(5)
+        self._stride = stride
+        self._max_bytes = max_bytes
+        self._bytes = 0
+        self._states: 'OrderedDict[Key, State]' = OrderedDict()
+        self._prefixes = 0
+        self._format = PositionFormat()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def execute(self, landing: str, commands: str) -> str:
+        start = self._format.position_from(landing)
+        stride = self._stride
+        parent: Union[int, Position] = start
+        position: Position = start
+        obstacle: Optional[Coordinates] = None
+        used: List[Key] = []
+        offset = 0
+        while offset + stride <= len(commands) and obstacle is None:
+            key = (parent, commands[offset:offset + stride])
+            cached = self._states.get(key)
+            if cached is None:
+                break
+            used.append(key)
+            parent, position, obstacle = cached
+            offset += stride
+        # Shorter prefixes are used after the longer ones, so they're evicted after them.
+        for key in reversed(used):
+            self._states.move_to_end(key)
+        if used:
+            self._hits += 1
+        else:
+            self._misses += 1
+        if obstacle is None:
+            position = self._executed(position, parent, commands, offset)
+        return self._format.output_from(position)
+
+    def _executed(self, position: Position, parent: Union[int, Position], commands: str, offset: int) -> Position:
+        rover = self._rover_at(position)
+        stride = self._stride
+        while offset + stride <= len(commands):
+            self._execute(rover, commands, offset, offset + stride)
+            self._prefixes += 1
+            key = (parent, commands[offset:offset + stride])
+            self._remember(key, (self._prefixes, rover.position(), rover.obstacle()))
+            if rover.obstacle() is not None:
+                return rover.position()
+            parent = self._prefixes
+            offset += stride
+        self._execute(rover, commands, offset, len(commands))
+        return rover.position()
+
+    def _rover_at(self, position: Position) -> Rover:
+        try:
+            return Rover(position, self._surface)
+        except RoverOutsideSurface:
+            raise UserInputError.rover_outside_surface()
+        except RoverOnObstacle:
+            raise UserInputError.rover_on_obstacle()
+
+    def _execute(self, rover: Rover, commands: str, start: int, end: int) -> None:
+        try:
+            rover.execute_until_blocked(commands[start:end])
+        except UnknownCommand as error:
+            raise UserInputError.unknown_command(error.command(), start + error.index())
+
+    def _remember(self, key: Key, state: State) -> None:
+        replaced = self._states.pop(key, None)
+        if replaced is not None:
+            self._bytes -= _size_of(key, replaced)
+        self._states[key] = state
+        self._bytes += _size_of(key, state)
+        while self._bytes > self._max_bytes:
+            self._bytes -= _size_of(*self._states.popitem(last=False))
+            self._evictions += 1
+
+    def statistics(self) -> CacheStatistics:
+        return CacheStatistics(self._hits, self._misses, self._evictions, len(self._states), self._bytes)
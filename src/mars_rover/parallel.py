@@ -0,0 +1,154 @@
+import collections
+import itertools
+import os
+from typing import BinaryIO
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Tuple
+from typing import cast
+
+from mars_rover.domain import Surface
+from mars_rover.streaming import DEFAULT_CHUNK_SIZE
+from mars_rover.streaming import MissionReader
+from mars_rover.streaming import MissionReport
+
+DEFAULT_RECORDS_PER_SHARD = 1024
+_SHARDS_AHEAD_PER_WORKER = 2
+
+
+class Shard:
+
+    def __init__(self, line: int, start: int, end: int) -> None:
+        self._line = line
+        self._start = start
+        self._end = end
+
+    def line(self) -> int:
+        return self._line
+
+    def start(self) -> int:
+        return self._start
+
+    def end(self) -> int:
+        return self._end
+
+    def __repr__(self) -> str:  # pragma: nocover
+        return f'{self.__class__.__name__}({self._line!r}, {self._start!r}, {self._end!r})'
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Shard):  # pragma: nocover
+            return NotImplemented
+        return (self._line, self._start, self._end) == (other._line, other._start, other._end)
+
+
+class MissionShards:
+
+    def __init__(
+            self,
+            records_per_shard: int = DEFAULT_RECORDS_PER_SHARD,
+            chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> None:
+        self._records_per_shard = records_per_shard
+        self._chunk_size = chunk_size
+
+    def shards_of(self, stream: BinaryIO) -> Iterator[Shard]:
+        # Splits the stream at landing lines, following the same record rules as MissionReader:
+        # a landing line is any non-blank line that is not the command line of the previous record.
+        # Shards are cut while the stream is read, so only the first landing of one is held.
+        first = (1, 0)
+        records = 0
+        for landing in self._landings_in(stream):
+            if records == self._records_per_shard:
+                yield Shard(*first, landing[1])
+                records = 0
+            if not records:
+                first = landing
+            records += 1
+        if records:
+            yield Shard(*first, -1)
+
+    def _landings_in(self, stream: BinaryIO) -> Iterator[Tuple[int, int]]:
+        awaiting_commands = False
+        blank = True
+        line = 1
+        line_offset = offset = 0
+        while True:
+            chunk = stream.read(self._chunk_size)
+            if not chunk:
+                break
+            start = 0
+            while start <= len(chunk):
+                newline = chunk.find(b'\n', start)
+                end = len(chunk) if newline == -1 else newline
+                if not awaiting_commands and blank:
+                    blank = not chunk[start:end].strip()
+                if newline == -1:
+                    break
+                if awaiting_commands:
+                    awaiting_commands = False
+                elif not blank:
+                    yield line, line_offset
+                    awaiting_commands = True
+                blank = True
+                line += 1
+                line_offset = offset + newline + 1
+                start = newline + 1
+            offset += len(chunk)
+        if not awaiting_commands and not blank:
+            yield line, line_offset
+
+
+class _Slice:
+
+    def __init__(self, stream: BinaryIO, length: int) -> None:
+        self._stream = stream
+        self._remaining = length
+
+    def read(self, size: int) -> bytes:
+        if self._remaining >= 0:
+            size = min(size, self._remaining)
+            self._remaining -= size
+        return self._stream.read(size) if size else b''
+
+
+def _reports_from_shard(path: str, shard: Shard, chunk_size: int, surface: Optional[Surface]) -> List[MissionReport]:
+    with open(path, 'rb') as missions:
+        missions.seek(shard.start())
+        length = shard.end() - shard.start() if shard.end() >= 0 else -1
+        reader = MissionReader(chunk_size, surface)
+        return list(reader.reports_from(cast(BinaryIO, _Slice(missions, length)), shard.line(), shard.start()))
+
+
+class ParallelMissionRunner:
+
+    def __init__(
+            self,
+            workers: Optional[int] = None,
+            records_per_shard: int = DEFAULT_RECORDS_PER_SHARD,
+            chunk_size: int = DEFAULT_CHUNK_SIZE,
+            surface: Optional[Surface] = None,
+    ) -> None:
+        self._workers = workers
+        self._records_per_shard = records_per_shard
+        self._chunk_size = chunk_size
+        self._surface = surface
+
+    def reports_from(self, path: str) -> Iterator[MissionReport]:
+        # Imported here, as multiprocessing takes longer to load than many mission files take to run.
+        from concurrent.futures import ProcessPoolExecutor
+        workers = self._workers or os.cpu_count() or 1
+        with open(path, 'rb') as missions, ProcessPoolExecutor(workers) as executor:
+            shards = MissionShards(self._records_per_shard, self._chunk_size).shards_of(missions)
+            # A few shards per worker are submitted ahead of the one being reported, so that
+            # neither shards nor their reports pile up when the reports are read slowly.
+            pending = collections.deque(
+                executor.submit(_reports_from_shard, path, shard, self._chunk_size, self._surface)
+                for shard in itertools.islice(shards, _SHARDS_AHEAD_PER_WORKER * workers)
+            )
+            for shard in shards:
+                reports = pending.popleft().result()
+                pending.append(executor.submit(_reports_from_shard, path, shard, self._chunk_size, self._surface))
+                yield from reports
+            while pending:
+                yield from pending.popleft().result()
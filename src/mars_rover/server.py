@@ -0,0 +1,182 @@
+import asyncio
+import re
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from mars_rover.application import MarsRoverApplication
+from mars_rover.application import UserInputError
+from mars_rover.domain import Surface
+
+# One request per line, answered in order on the same connection:
+#   land <rover> <h> <v> <direction>  ->  ok <h> <v> <direction>
+#   exec <rover> <commands>           ->  ok
+#   position <rover>                  ->  ok <h> <v> <direction>
+# and `error <message>` when a request cannot be carried out.
+DEFAULT_MAX_PENDING = 1024
+DEFAULT_MAX_LINE = 1024 * 1024
+
+_UNKNOWN_COMMAND = re.compile('[^fblr]')
+_OK = b'ok\n'
+
+Request = Tuple[str, str, str]
+
+# Verbs are single words, so no line parses into this request.
+_TOO_LONG: Request = ('too long', '', '')
+
+
+class RequestError(Exception):
+
+    @classmethod
+    def unknown_request(cls, request: str) -> 'RequestError':
+        return cls(f'Unknown request: {request}')
+
+    @classmethod
+    def unknown_rover(cls, name: str) -> 'RequestError':
+        return cls(f'Unknown rover: {name}')
+
+    @classmethod
+    def request_too_long(cls) -> 'RequestError':
+        return cls('Request too long')
+
+
+class RoverServer:
+
+    def __init__(
+            self,
+            surface: Optional[Surface] = None,
+            max_pending: int = DEFAULT_MAX_PENDING,
+            max_line: int = DEFAULT_MAX_LINE,
+    ) -> None:
+        # At most max_pending requests of a connection wait for execution; beyond that the
+        # server stops reading from it and lets the transport push back on the client.
+        self._surface = surface
+        self._max_pending = max_pending
+        self._max_line = max_line
+        self._rovers: Dict[str, MarsRoverApplication] = {}
+
+    async def listen(self, host: str = '127.0.0.1', port: int = 0) -> asyncio.Server:
+        return await asyncio.start_server(self._serve, host, port, limit=self._max_line)
+
+    async def listen_on_socket(self, path: str) -> asyncio.Server:
+        return await asyncio.start_unix_server(self._serve, path, limit=self._max_line)
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        pending: 'asyncio.Queue[Optional[Request]]' = asyncio.Queue(self._max_pending)
+        receiving = asyncio.ensure_future(self._receive(reader, pending))
+        try:
+            while True:
+                requests = [await pending.get()]
+                while not pending.empty() and requests[-1] is not None:
+                    requests.append(pending.get_nowait())
+                writer.write(b''.join(self.replies_to([request for request in requests if request is not None])))
+                await writer.drain()
+                if requests[-1] is None:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            receiving.cancel()
+            writer.close()
+
+    async def _receive(self, reader: asyncio.StreamReader, pending: 'asyncio.Queue[Optional[Request]]') -> None:
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                await pending.put(request_from(line))
+        except ValueError:
+            # The rest of an overlong line cannot be told apart from the next request.
+            await pending.put(_TOO_LONG)
+        except ConnectionError:
+            pass
+        await pending.put(None)
+
+    def replies_to(self, requests: List[Request]) -> List[bytes]:
+        replies: List[bytes] = []
+        start = 0
+        while start < len(requests):
+            verb, name, argument = requests[start]
+            end = start + 1
+            if verb == 'exec':
+                # Consecutive commands for the same rover are executed together.
+                while end < len(requests) and requests[end][:2] == ('exec', name):
+                    end += 1
+                replies += self._executed(name, [request[2] for request in requests[start:end]])
+            else:
+                replies.append(self._reply_to(verb, name, argument))
+            start = end
+        return replies
+
+    def _reply_to(self, verb: str, name: str, argument: str) -> bytes:
+        try:
+            if verb == 'land':
+                self._rovers[name] = MarsRoverApplication.landing_with(argument, self._surface)
+                return self._position_of(name)
+            if verb == 'position':
+                return self._position_of(name)
+            if (verb, name, argument) == _TOO_LONG:
+                raise RequestError.request_too_long()
+            raise RequestError.unknown_request(verb)
+        except (RequestError, UserInputError) as error:
+            return _error(error)
+
+    def _position_of(self, name: str) -> bytes:
+        return b'ok %s\n' % self._rover(name).rover_position().encode()
+
+    def _rover(self, name: str) -> MarsRoverApplication:
+        rover = self._rovers.get(name)
+        if rover is None:
+            raise RequestError.unknown_rover(name)
+        return rover
+
+    def _executed(self, name: str, batch: List[str]) -> List[bytes]:
+        try:
+            rover = self._rover(name)
+        except RequestError as error:
+            return [_error(error)] * len(batch)
+        if len(batch) == 1 or self._has_obstacles():
+            return [self._executed_alone(rover, commands) for commands in batch]
+        return self._executed_together(rover, batch)
+
+    def _has_obstacles(self) -> bool:
+        return self._surface is not None and self._surface.obstacles() is not None
+
+    def _executed_alone(self, rover: MarsRoverApplication, commands: str) -> bytes:
+        try:
+            rover.execute_until_blocked(commands)
+        except UserInputError as error:
+            return _error(error)
+        return _OK
+
+    def _executed_together(self, rover: MarsRoverApplication, batch: List[str]) -> List[bytes]:
+        # Without obstacles nothing stops a rover early, so one long command string ends where
+        # the separate ones would. An unknown command is found upfront, and the rover executes
+        # everything before it, just like the separate strings up to that point.
+        replies: List[bytes] = []
+        while batch:
+            commands = ''.join(batch)
+            unknown = _UNKNOWN_COMMAND.search(commands)
+            if unknown is None:
+                rover.execute_all(commands)
+                return replies + [_OK] * len(batch)
+            rover.execute_all(commands[:unknown.start()])
+            failed = offset = 0
+            while offset + len(batch[failed]) <= unknown.start():
+                offset += len(batch[failed])
+                failed += 1
+            error = UserInputError.unknown_command(unknown.group(), unknown.start() - offset)
+            replies += [_OK] * failed + [_error(error)]
+            batch = batch[failed + 1:]
+        return replies
+
+
+def request_from(line: bytes) -> Request:
+    words = line.decode('latin-1').strip().split(maxsplit=2)
+    return words[0] if words else '', words[1] if len(words) > 1 else '', ' '.join(words[2:])
+
+
+def _error(error: Exception) -> bytes:
+    return b'error %s\n' % str(error).encode('latin-1', 'replace')
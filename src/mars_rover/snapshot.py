@@ -0,0 +1,249 @@
+import os
+import struct
+import time
+from typing import List
+from typing import Optional
+from typing import Sequence
+
+from mars_rover.domain import Coordinates
+from mars_rover.domain import Direction
+from mars_rover.domain import Fleet
+from mars_rover.domain import Position
+from mars_rover.domain import Rover
+from mars_rover.domain import Surface
+
+_ROVER = struct.Struct('<4sQQqqBQ')
+_ROVER_MAGIC = b'MRS1'
+# Set in the byte of the direction code of a rover wrapping around the edges of the surface.
+_WRAPS = 4
+_FLEET = struct.Struct('<4sQQQ')
+_FLEET_MAGIC = b'MRF1'
+_FLEET_ROVER = struct.Struct('<qqBQ')
+
+
+class RoverSnapshot:
+
+    @classmethod
+    def of(cls, rover: Rover, offset: int) -> 'RoverSnapshot':
+        return cls(rover.position(), rover.surface(), offset, rover.wraps())
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'RoverSnapshot':
+        if len(data) != _ROVER.size:
+            raise ValueError('Invalid rover snapshot')
+        magic, east_edge, north_edge, horizontal, vertical, direction, offset = _ROVER.unpack(data)
+        if magic != _ROVER_MAGIC:
+            raise ValueError('Invalid rover snapshot')
+        return cls(
+            _position(horizontal, vertical, direction & 3),
+            Surface.of_size(east_edge, north_edge),
+            offset,
+            bool(direction & _WRAPS),
+        )
+
+    @classmethod
+    def load(cls, path: str) -> 'RoverSnapshot':
+        with open(path, 'rb') as snapshot:
+            return cls.from_bytes(snapshot.read())
+
+    def __init__(self, position: Position, surface: Surface, offset: int, wrapping: bool = False) -> None:
+        self._position = position
+        self._surface = surface
+        self._offset = offset
+        self._wrapping = wrapping
+
+    def position(self) -> Position:
+        return self._position
+
+    def surface(self) -> Surface:
+        return self._surface
+
+    def offset(self) -> int:
+        return self._offset
+
+    def wraps(self) -> bool:
+        return self._wrapping
+
+    def rover(self, surface: Optional[Surface] = None) -> Rover:
+        # Obstacles are not part of a snapshot; pass the surface again to keep them.
+        return Rover(self._position, _same_size(self._surface, surface), wrapping=self._wrapping)
+
+    def to_bytes(self) -> bytes:
+        north_east = self._surface.north_east()
+        coordinates = self._position.coordinates()
+        return _ROVER.pack(
+            _ROVER_MAGIC,
+            north_east.horizontal(),
+            north_east.vertical(),
+            coordinates.horizontal(),
+            coordinates.vertical(),
+            self._position.direction().code() | (_WRAPS if self._wrapping else 0),
+            self._offset,
+        )
+
+    def save(self, path: str) -> None:
+        _replace(path, self.to_bytes())
+
+
+class FleetSnapshot:
+
+    @classmethod
+    def of(cls, fleet: Fleet, offsets: Sequence[int]) -> 'FleetSnapshot':
+        return cls(fleet.positions(), fleet.surface(), offsets)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'FleetSnapshot':
+        magic, east_edge, north_edge, count = _FLEET.unpack_from(data)
+        if magic != _FLEET_MAGIC or len(data) != _FLEET.size + count * _FLEET_ROVER.size:
+            raise ValueError('Invalid fleet snapshot')
+        positions = []
+        offsets = []
+        for horizontal, vertical, direction, offset in _FLEET_ROVER.iter_unpack(memoryview(data)[_FLEET.size:]):
+            positions.append(_position(horizontal, vertical, direction))
+            offsets.append(offset)
+        return cls(positions, Surface.of_size(east_edge, north_edge), offsets)
+
+    @classmethod
+    def load(cls, path: str) -> 'FleetSnapshot':
+        with open(path, 'rb') as snapshot:
+            return cls.from_bytes(snapshot.read())
+
+    def __init__(self, positions: Sequence[Position], surface: Surface, offsets: Sequence[int]) -> None:
+        self._positions = list(positions)
+        self._surface = surface
+        self._offsets = list(offsets)
+
+    def positions(self) -> List[Position]:
+        return list(self._positions)
+
+    def offsets(self) -> List[int]:
+        return list(self._offsets)
+
+    def fleet(self, surface: Optional[Surface] = None) -> Fleet:
+        fleet = Fleet(_same_size(self._surface, surface))
+        for position in self._positions:
+            fleet.land(position)
+        return fleet
+
+    def to_bytes(self) -> bytes:
+        north_east = self._surface.north_east()
+        data = bytearray(
+            _FLEET.pack(_FLEET_MAGIC, north_east.horizontal(), north_east.vertical(), len(self._positions)),
+        )
+        for position, offset in zip(self._positions, self._offsets):
+            coordinates = position.coordinates()
+            data += _FLEET_ROVER.pack(
+                coordinates.horizontal(), coordinates.vertical(), position.direction().code(), offset,
+            )
+        return bytes(data)
+
+    def save(self, path: str) -> None:
+        _replace(path, self.to_bytes())
+
+
+class CheckpointedMission:
+
+    def __init__(self, path: str, every_commands: int = 1_000_000, every_seconds: Optional[float] = None) -> None:
+        self._path = path
+        self._every_commands = every_commands
+        self._every_seconds = every_seconds
+
+    def run(self, rover: Rover, commands: str, offset: int = 0) -> None:
+        # Executes commands[offset:] a batch at a time, saving a snapshot as the schedule says.
+        schedule = _Schedule(self._every_commands, self._every_seconds)
+        while offset < len(commands):
+            end = min(offset + schedule.batch(), len(commands))
+            rover.execute_until_blocked(commands[offset:end])
+            executed = end - offset
+            offset = end if rover.obstacle() is None else len(commands)
+            if schedule.due(executed):
+                RoverSnapshot.of(rover, offset).save(self._path)
+        RoverSnapshot.of(rover, offset).save(self._path)
+
+    def resume(self, commands: str, surface: Optional[Surface] = None) -> Rover:
+        snapshot = RoverSnapshot.load(self._path)
+        rover = snapshot.rover(surface)
+        self.run(rover, commands, snapshot.offset())
+        return rover
+
+
+class CheckpointedFleet:
+
+    def __init__(self, path: str, every_commands: int = 1_000_000, every_seconds: Optional[float] = None) -> None:
+        self._path = path
+        self._every_commands = every_commands
+        self._every_seconds = every_seconds
+
+    def run(self, fleet: Fleet, commands: Sequence[str], offsets: Optional[Sequence[int]] = None) -> None:
+        # Rovers move in landing order as Fleet.execute_all has them, each stopping at an obstacle
+        # as in a CheckpointedMission, and snapshots keep how far every rover got.
+        rovers = fleet.rovers()
+        offsets = [0] * len(rovers) if offsets is None else list(offsets)
+        schedule = _Schedule(self._every_commands, self._every_seconds)
+        for index, (rover, rover_commands) in enumerate(zip(rovers, commands)):
+            while offsets[index] < len(rover_commands):
+                offset = offsets[index]
+                end = min(offset + schedule.batch(), len(rover_commands))
+                rover.execute_until_blocked(rover_commands[offset:end])
+                offsets[index] = end if rover.obstacle() is None else len(rover_commands)
+                if schedule.due(end - offset):
+                    FleetSnapshot.of(fleet, offsets).save(self._path)
+        FleetSnapshot.of(fleet, offsets).save(self._path)
+
+    def resume(self, commands: Sequence[str], surface: Optional[Surface] = None) -> Fleet:
+        snapshot = FleetSnapshot.load(self._path)
+        fleet = snapshot.fleet(surface)
+        self.run(fleet, commands, snapshot.offsets())
+        return fleet
+
+
+class _Schedule:
+    # Snapshots are due after every_commands commands or, when every_seconds is set, after the
+    # first batch that ends past the deadline.
+
+    def __init__(self, every_commands: int, every_seconds: Optional[float]) -> None:
+        self._every_commands = every_commands
+        self._every_seconds = every_seconds
+        self._since_saved = 0
+        self._last_saved = time.monotonic()
+
+    def batch(self) -> int:
+        left = self._every_commands - self._since_saved
+        return left if self._every_seconds is None else min(left, 64 * 1024)
+
+    def due(self, executed: int) -> bool:
+        self._since_saved += executed
+        overdue = self._every_seconds is not None and time.monotonic() - self._last_saved >= self._every_seconds
+        if self._since_saved < self._every_commands and not overdue:
+            return False
+        self._since_saved = 0
+        self._last_saved = time.monotonic()
+        return True
+
+
+def _position(horizontal: int, vertical: int, direction: int) -> Position:
+    return Position(Direction.for_code(direction), Coordinates(horizontal, vertical))
+
+
+def _same_size(saved: Surface, surface: Optional[Surface]) -> Surface:
+    if surface is None:
+        return saved
+    if surface.north_east() != saved.north_east():
+        raise ValueError(f'Snapshot taken on a surface of size {saved.north_east()!r}')
+    return surface
+
+
+def _replace(path: str, data: bytes) -> None:
+    # Write next to the old snapshot, get it on disk and swap it in, then get the swap on disk
+    # too, so that neither a crash nor a power loss leaves a torn or missing file behind.
+    temporary = f'{path}.tmp'
+    with open(temporary, 'wb') as snapshot:
+        snapshot.write(data)
+        snapshot.flush()
+        os.fsync(snapshot.fileno())
+    os.replace(temporary, path)
+    directory = os.open(os.path.dirname(path) or '.', os.O_RDONLY)
+    try:
+        os.fsync(directory)
+    finally:
+        os.close(directory)
@@ -0,0 +1,160 @@
+from typing import BinaryIO
+from typing import Iterator
+from typing import Optional
+from typing import Tuple
+
+from mars_rover.application import PositionFormat
+from mars_rover.application import UserInputError
+from mars_rover.domain import Rover
+from mars_rover.domain import RoverOnObstacle
+from mars_rover.domain import RoverOutsideSurface
+from mars_rover.domain import Surface
+from mars_rover.domain import UnknownCommand
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+# Landing lines are buffered until their newline, so their length is capped;
+# command lines are executed piece by piece and may be of any length.
+MAX_LANDING_LINE = 64
+
+
+class MissionReport:
+
+    @classmethod
+    def position(cls, line: int, offset: int, output: str) -> 'MissionReport':
+        return cls(line, offset, output=output)
+
+    @classmethod
+    def malformed(cls, line: int, offset: int, error: UserInputError) -> 'MissionReport':
+        return cls(line, offset, error=str(error))
+
+    def __init__(self, line: int, offset: int, output: Optional[str] = None, error: Optional[str] = None) -> None:
+        self._line = line
+        self._offset = offset
+        self._output = output
+        self._error = error
+
+    def line(self) -> int:
+        return self._line
+
+    def offset(self) -> int:
+        return self._offset
+
+    def output(self) -> Optional[str]:
+        return self._output
+
+    def error(self) -> Optional[str]:
+        return self._error
+
+    def __repr__(self) -> str:  # pragma: nocover
+        return (
+            f'{self.__class__.__name__}({self._line!r}, {self._offset!r}, '
+            f'output={self._output!r}, error={self._error!r})'
+        )
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, MissionReport):  # pragma: nocover
+            return NotImplemented
+        return (
+            (self._line, self._offset, self._output, self._error) ==
+            (other._line, other._offset, other._output, other._error)
+        )
+
+
+class MissionReader:
+
+    def __init__(self, chunk_size: int = DEFAULT_CHUNK_SIZE, surface: Optional[Surface] = None) -> None:
+        self._chunk_size = chunk_size
+        self._surface = surface
+        self._format = PositionFormat()
+
+    def reports_from(self, stream: BinaryIO, line: int = 1, offset: int = 0) -> Iterator[MissionReport]:
+        # line and offset locate the start of the stream within a larger mission file.
+        landing = bytearray()
+        landing_line = landing_offset = 0
+        rover: Optional[Rover] = None
+        awaiting_commands = False
+        line_offset = offset
+        for piece, offset, ends_line in self._pieces_from(stream, offset):
+            if ends_line and piece.endswith(b'\r'):
+                piece = piece[:-1]
+            if awaiting_commands:
+                # An obstacle stops the rover along with the rest of its command line, however
+                # the line is split into pieces.
+                if rover is not None and rover.obstacle() is None:
+                    try:
+                        rover.execute_until_blocked(piece.decode('latin-1'))
+                    except UnknownCommand as error:
+                        yield MissionReport.malformed(
+                            line,
+                            offset + error.index(),
+                            UserInputError.unknown_command(error.command(), offset - line_offset + error.index()),
+                        )
+                        rover = None
+                if ends_line:
+                    if rover is not None:
+                        yield self._final_position_of(rover, landing_line, landing_offset)
+                    awaiting_commands = False
+            else:
+                if not landing:
+                    landing_offset = offset
+                landing += piece[:MAX_LANDING_LINE + 1 - len(landing)]
+                if ends_line:
+                    if landing.strip():
+                        landing_line = line
+                        rover, report = self._landed(landing, landing_line, landing_offset)
+                        if report is not None:
+                            yield report
+                        awaiting_commands = True
+                    landing = bytearray()
+            if ends_line:
+                line += 1
+                line_offset = offset + len(piece) + 1
+        if landing.strip():
+            landing_line = line
+            rover, report = self._landed(landing, landing_line, landing_offset)
+            if report is not None:
+                yield report
+            awaiting_commands = True
+        if awaiting_commands and rover is not None:
+            yield self._final_position_of(rover, landing_line, landing_offset)
+
+    def _final_position_of(self, rover: Rover, line: int, offset: int) -> MissionReport:
+        return MissionReport.position(line, offset, self._format.output_from(rover.position()))
+
+    def _landed(self, landing: bytearray, line: int, offset: int) -> Tuple[Optional[Rover], Optional[MissionReport]]:
+        user_input = landing.decode('latin-1').rstrip('\r')
+        try:
+            if len(user_input) > MAX_LANDING_LINE:
+                raise UserInputError.invalid_position(user_input)
+            return Rover(self._format.position_from(user_input), self._surface), None
+        except RoverOutsideSurface:
+            return None, MissionReport.malformed(line, offset, UserInputError.rover_outside_surface())
+        except RoverOnObstacle:
+            return None, MissionReport.malformed(line, offset, UserInputError.rover_on_obstacle())
+        except UserInputError as error:
+            return None, MissionReport.malformed(line, offset, error)
+
+    def _pieces_from(self, stream: BinaryIO, offset: int) -> Iterator[Tuple[bytes, int, bool]]:
+        # Yields (piece of a line, its byte offset, whether the piece ends its line),
+        # never holding more than one chunk of the stream.
+        pending = b''
+        while True:
+            chunk = stream.read(self._chunk_size)
+            if not chunk:
+                break
+            data = pending + chunk
+            start = 0
+            newline = data.find(b'\n')
+            while newline != -1:
+                yield data[start:newline], offset + start, True
+                start = newline + 1
+                newline = data.find(b'\n', start)
+            # A trailing carriage return may belong to a line ending split across chunks.
+            end = len(data) - 1 if data.endswith(b'\r') else len(data)
+            if start < end:
+                yield data[start:end], offset + start, False
+            pending = data[end:]
+            offset += end
+        if pending:
+            yield pending, offset, False
@@ -7,4 +7,7 @@ setup(
     packages=find_packages(include=('mars_rover*',)),
     include_package_data=True,
     zip_safe=False,
+    extras_require={
+        'fleet': ['numpy'],
+    },
 )
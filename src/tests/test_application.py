@@ -1,7 +1,81 @@
+from typing import Any
+
 import pytest
 
 from mars_rover.application import MarsRoverApplication
+from mars_rover.application import PositionFormat
 from mars_rover.application import UserInputError
+from mars_rover.domain import Coordinates
+from mars_rover.domain import Direction
+from mars_rover.domain import Position
+from mars_rover.domain import Program
+from mars_rover.domain import SparseObstacles
+from mars_rover.domain import Surface
+
+
+class TestPositionFormat:
+
+    LINES = ['3 4 N', '0 0 S', '12 7 E', '5 3 W']
+
+    @pytest.mark.parametrize(
+        'lines', [
+            '3 4 N\n0 0 S\n12 7 E\n5 3 W',
+            '3 4 N\n0 0 S\n12 7 E\n5 3 W\n',
+            b'3 4 N\n0 0 S\n12 7 E\n5 3 W\n',
+            bytearray(b'3 4 N\n0 0 S\n12 7 E\n5 3 W'),
+            LINES,
+            [line.encode() for line in LINES],
+        ],
+        ids=['text', 'text-ending-with-newline', 'bytes', 'bytearray', 'lines', 'byte-lines']
+    )
+    def test_parses_many_positions_at_once(self, lines: Any) -> None:
+        assert PositionFormat().positions_from(lines) == [
+            Position(Direction.north(), Coordinates(3, 4)),
+            Position(Direction.south(), Coordinates(0, 0)),
+            Position(Direction.east(), Coordinates(12, 7)),
+            Position(Direction.west(), Coordinates(5, 3)),
+        ]
+
+    @pytest.mark.parametrize('lines', ['', b'', '\n\n', [], ['', '\r\n']])
+    def test_parses_no_positions_out_of_empty_lines(self, lines: Any) -> None:
+        assert PositionFormat().positions_from(lines) == []
+
+    @pytest.mark.parametrize(
+        'lines', [
+            '3 4 N\r\n0 0 S\r\n',
+            b'\n3 4 N\n\n0 0 S\n\n\n',
+            ['3 4 N\n', '\n', '0 0 S\r\n'],
+        ],
+        ids=['windows-line-endings', 'blank-lines', 'lines-with-endings']
+    )
+    def test_skips_line_endings_and_blank_lines(self, lines: Any) -> None:
+        assert PositionFormat().positions_from(lines) == [
+            Position(Direction.north(), Coordinates(3, 4)),
+            Position(Direction.south(), Coordinates(0, 0)),
+        ]
+
+    @pytest.mark.parametrize(
+        'line', [
+            '34 N',
+            'a 4 N',
+            '4 a N',
+            '3  4 N',
+            '3 4 NS',
+            '3 4 ',
+            '\u00b2 4 N',
+        ]
+    )
+    def test_rejects_positions_like_one_at_a_time(self, line: str) -> None:
+        with pytest.raises(UserInputError) as one_at_a_time:
+            PositionFormat().position_from(line)
+        with pytest.raises(UserInputError) as all_at_once:
+            PositionFormat().positions_from(['3 4 N', line])
+        assert str(all_at_once.value) == str(one_at_a_time.value)
+
+    def test_writes_many_positions_into_a_buffer(self) -> None:
+        buffer = bytearray(b'> ')
+        PositionFormat().write_outputs(PositionFormat().positions_from(self.LINES), buffer)
+        assert buffer == b'> 3 4 N\n0 0 S\n12 7 E\n5 3 W\n'
 
 
 class TestMarsRoverApplication:
@@ -103,3 +177,84 @@ class TestMarsRoverApplication:
         with pytest.raises(UserInputError) as error:
             app.execute('x')
         assert str(error.value) == "Unknown command: 'x'"
+
+    @pytest.mark.parametrize(
+        ('position', 'commands'), [
+            ('3 4 N', 'ffrff'),
+            ('0 0 S', 'fblbrrff'),
+            ('5 5 E', 'ffflffbbrrrfff'),
+            ('2 2 W', ''),
+        ]
+    )
+    def test_executes_command_string_like_single_commands(self, position: str, commands: str) -> None:
+        app = self.land_rover_with_position(position)
+        app.execute_all(commands)
+        expected = self.land_rover_with_position(position)
+        for command in commands:
+            expected.execute(command)
+        assert app.rover_position() == expected.rover_position()
+
+    def test_obstacle_skips_a_move_of_a_command_string_but_aborts_it_until_blocked(self) -> None:
+        surface = Surface.of_size(5, obstacles=SparseObstacles.at([Coordinates(0, 2)]))
+        one_by_one = MarsRoverApplication.landing_with('0 0 N', surface)
+        for command in 'ffrf':
+            one_by_one.execute(command)
+        all_at_once = MarsRoverApplication.landing_with('0 0 N', surface)
+        all_at_once.execute_all('ffrf')
+        until_blocked = MarsRoverApplication.landing_with('0 0 N', surface)
+        until_blocked.execute_until_blocked('ffrf')
+        assert (one_by_one.rover_position(), one_by_one.obstacle_position()) == ('1 1 E', None)
+        assert (all_at_once.rover_position(), all_at_once.obstacle_position()) == ('1 1 E', None)
+        assert (until_blocked.rover_position(), until_blocked.obstacle_position()) == ('0 1 N', '0 2')
+
+    def test_rejects_unknown_command_in_command_string_with_its_index(self) -> None:
+        app = self.land_rover_with_position('3 4 N')
+        with pytest.raises(UserInputError) as error:
+            app.execute_all('frxf')
+        assert str(error.value) == "Unknown command: 'x' at index 2"
+        assert app.rover_position() == '3 5 E'
+
+    def test_runs_compiled_program(self) -> None:
+        program = Program.compiled_from('ffrff')
+        first = self.land_rover_with_position('1 1 N')
+        second = self.land_rover_with_position('3 4 N')
+        first.run(program)
+        second.run(program)
+        assert first.rover_position() == '3 3 E'
+        assert second.rover_position() == '5 5 E'
+
+    def test_lands_rover_on_given_surface(self) -> None:
+        app = MarsRoverApplication.landing_with('100 3 E', Surface.of_size(1000, 3))
+        app.execute_all('flf')
+        assert app.rover_position() == '101 3 N'
+
+    def test_lands_rover_on_a_wrapping_surface(self) -> None:
+        app = MarsRoverApplication.landing_with('4 3 E', Surface.of_size(4, 3), wrapping=True)
+        app.execute_all('flf')
+        assert app.rover_position() == '0 0 N'
+
+    def test_can_not_land_outside_of_given_surface(self) -> None:
+        with pytest.raises(UserInputError) as error:
+            MarsRoverApplication.landing_with('3 4 N', Surface.of_size(1000, 3))
+        assert str(error.value) == 'Rover outside the surface'
+
+    def test_reports_obstacle_that_stopped_the_rover(self) -> None:
+        surface = Surface.of_size(5, obstacles=SparseObstacles.at([Coordinates(3, 5)]))
+        app = MarsRoverApplication.landing_with('3 3 N', surface)
+        assert app.obstacle_position() is None
+        app.execute_all('fff')
+        assert app.rover_position() == '3 4 N'
+        assert app.obstacle_position() == '3 5'
+
+    def test_can_not_land_on_an_obstacle(self) -> None:
+        surface = Surface.of_size(5, obstacles=SparseObstacles.at([Coordinates(3, 5)]))
+        with pytest.raises(UserInputError) as error:
+            MarsRoverApplication.landing_with('3 5 N', surface)
+        assert str(error.value) == 'Rover on an obstacle'
+
+    def test_records_rover_trajectory(self) -> None:
+        app = self.land_rover_with_position('3 4 N')
+        trajectory = app.record_trajectory()
+        app.execute_all('frff')
+        assert len(trajectory) == 4
+        assert trajectory.position_at(2) == Position(Direction.east(), Coordinates(3, 5))
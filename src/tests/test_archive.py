@@ -0,0 +1,107 @@
+import io
+import pathlib
+
+import pytest
+
+from mars_rover.application import MarsRoverApplication
+from mars_rover.application import UserInputError
+from mars_rover.archive import MissionArchive
+from mars_rover.archive import archive_from_text
+from mars_rover.archive import text_from_archive
+from mars_rover.archive import write_archive
+from mars_rover.domain import Coordinates
+from mars_rover.domain import Direction
+from mars_rover.domain import Position
+from mars_rover.domain import Surface
+
+
+class TestMissionArchive:
+
+    def test_round_trips_text_missions(self, tmp_path: pathlib.Path) -> None:
+        path = str(tmp_path / 'missions.mrm')
+        text = '1 2 N\nlflflflff\n3 3 E\nffrffrfrrf\n0 0 S\n\n5 5 W\nlfb\n'
+        assert archive_from_text(io.StringIO(text), path, Surface.of_size(5)) == 4
+        archive = MissionArchive.load(path)
+        assert len(archive) == 4
+        assert archive.surface() == Surface.of_size(5)
+        restored = io.StringIO()
+        text_from_archive(archive, restored)
+        assert restored.getvalue() == text
+
+    def test_packs_four_commands_to_a_byte(self, tmp_path: pathlib.Path) -> None:
+        path = tmp_path / 'missions.mrm'
+        commands = 'fbrl' * 1000 + 'ff'
+        landing = Position(Direction.for_symbol('N'), Coordinates(1, 1))
+        write_archive(str(path), Surface.of_size(5), [(landing, commands)])
+        assert path.stat().st_size == 28 + 16 + 1001
+        [mission] = MissionArchive.load(str(path)).missions()
+        assert (len(mission), mission.commands()) == (4002, commands)
+
+    @pytest.mark.parametrize('size', [1, 4, 10, 5000])
+    def test_decodes_commands_a_bounded_piece_at_a_time(self, tmp_path: pathlib.Path, size: int) -> None:
+        path = str(tmp_path / 'missions.mrm')
+        commands = 'fbrl' * 1000 + 'lrb'
+        write_archive(path, Surface.of_size(5), [(Position(Direction.north(), Coordinates(1, 1)), commands)])
+        [mission] = MissionArchive.load(path).missions()
+        pieces = list(mission.pieces(size))
+        assert ''.join(pieces) == commands
+        assert max(len(piece) for piece in pieces) == min(-(-size // 4) * 4, len(commands))
+
+    def test_keeps_large_coordinates_and_every_direction(self, tmp_path: pathlib.Path) -> None:
+        path = str(tmp_path / 'missions.mrm')
+        positions = [
+            Position(Direction.for_symbol(symbol), Coordinates(2 ** 32 - 1 - index, index))
+            for index, symbol in enumerate('NESW')
+        ]
+        write_archive(path, Surface.of_size(2 ** 32 - 1), [(position, '') for position in positions])
+        assert [mission.position() for mission in MissionArchive.load(path).missions()] == positions
+
+    def test_missions_run_like_their_text(self, tmp_path: pathlib.Path) -> None:
+        path = str(tmp_path / 'missions.mrm')
+        archive_from_text(io.StringIO('1 2 N\r\nlflflflff\r\n\r\n3 3 E\r\nffrffrfrrf'), path, Surface.of_size(5))
+        outputs = []
+        for mission in MissionArchive.load(path).missions():
+            app = MarsRoverApplication(mission.position())
+            app.execute_all(mission.commands())
+            outputs.append(app.rover_position())
+        assert outputs == ['1 3 N', '5 1 E']
+
+    @pytest.mark.parametrize('chunk_size', [1, 2, 3, 5, 1024])
+    def test_reads_command_lines_a_piece_at_a_time(self, tmp_path: pathlib.Path, chunk_size: int) -> None:
+        path = str(tmp_path / 'missions.mrm')
+        text = '1 2 N\r\nlflflflff\r\n \t \r\n3 3 E\r\nffrffrfrrf\r\n\r\n0 0 S\r\n'
+        assert archive_from_text(io.StringIO(text), path, Surface.of_size(5), chunk_size) == 3
+        assert [mission.commands() for mission in MissionArchive.load(path).missions()] == [
+            'lflflflff', 'ffrffrfrrf', '',
+        ]
+
+    @pytest.mark.parametrize('chunk_size', [1, 3, 1024])
+    @pytest.mark.parametrize(
+        ('text', 'message'), [
+            ('1 a N\nff\n', 'Line 1: Invalid position: 1 a N'),
+            ('1 1 N\nffrfxf\n', "Line 2: Unknown command: 'x' at index 4"),
+            ('1 1 N\nff\n\n \n2 2 S\nffrflfbbx\n', "Line 6: Unknown command: 'x' at index 8"),
+            ('1 1 N\nf\rf\n', "Line 2: Unknown command: '\\r' at index 1"),
+        ]
+    )
+    def test_rejects_malformed_text_with_its_line(
+            self, tmp_path: pathlib.Path, text: str, message: str, chunk_size: int,
+    ) -> None:
+        with pytest.raises(UserInputError) as error:
+            archive_from_text(io.StringIO(text), str(tmp_path / 'missions.mrm'), Surface.of_size(5), chunk_size)
+        assert str(error.value) == message
+
+    def test_rejects_overlong_landing_lines_without_reading_them_whole(self, tmp_path: pathlib.Path) -> None:
+        with pytest.raises(UserInputError) as error:
+            text = io.StringIO('\n1 ' + '1' * 100_000 + ' N\nff\n')
+            archive_from_text(text, str(tmp_path / 'missions.mrm'), Surface.of_size(5), chunk_size=16)
+        assert str(error.value) == 'Line 2: Invalid position: 1 ' + '1' * 64
+
+    @pytest.mark.parametrize('truncated_at', [0, 10, 28 + 8, 28 + 16 + 1])
+    def test_rejects_damaged_archives(self, tmp_path: pathlib.Path, truncated_at: int) -> None:
+        path = tmp_path / 'missions.mrm'
+        archive_from_text(io.StringIO('1 1 N\nffffffff\n'), str(path), Surface.of_size(5))
+        path.write_bytes(path.read_bytes()[:truncated_at])
+        with pytest.raises(ValueError) as error:
+            list(MissionArchive.load(str(path)).missions())
+        assert str(error.value) == f'Invalid mission archive: {path}'
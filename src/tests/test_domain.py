@@ -1,10 +1,42 @@
+import io
+import pathlib
+import random
+import struct
+import sys
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Set
+
 import pytest
 
+from mars_rover.domain import CellOccupied
+from mars_rover.domain import CommandDistances
 from mars_rover.domain import Coordinates
+from mars_rover.domain import DenseObstacles
 from mars_rover.domain import Direction
+from mars_rover.domain import Fleet
+from mars_rover.domain import Obstacles
+from mars_rover.domain import Occupancy
+from mars_rover.domain import Planner
 from mars_rover.domain import Position
+from mars_rover.domain import Program
 from mars_rover.domain import Rover
+from mars_rover.domain import RoverOnObstacle
 from mars_rover.domain import RoverOutsideSurface
+from mars_rover.domain import SparseObstacles
+from mars_rover.domain import Surface
+from mars_rover.domain import Trajectory
+from mars_rover.domain import UnknownCommand
+from mars_rover.domain import Unreachable
+
+
+def test_star_import_exports_every_name_of_the_domain() -> None:
+    namespace: Dict[str, Any] = {}
+    exec('from mars_rover.domain import *', namespace)
+    assert namespace['Coordinates'] is Coordinates
+    assert {'Rover', 'Surface', 'Unreachable'} <= set(namespace)
 
 
 class TestCoordinates:
@@ -25,6 +57,9 @@ class TestCoordinates:
         assert Coordinates(-1, 3) < Coordinates(0, 2)
         assert Coordinates(3, -1) < Coordinates(2, 0)
 
+    def test_equal_coordinates_are_interchangeable_as_keys(self) -> None:
+        assert {Coordinates(3, 4), Coordinates(3, 4), Coordinates(4, 3)} == {Coordinates(4, 3), Coordinates(3, 4)}
+
 
 class TestDirection:
 
@@ -50,6 +85,35 @@ class TestDirection:
     def test_two_different_directions(self) -> None:
         assert Direction.north() != Direction.south()
 
+    def test_is_interned(self) -> None:
+        assert Direction.north() is Direction.for_symbol('N')
+        assert Direction.north().next_to_the_right() is Direction.east()
+
+    @pytest.mark.parametrize(
+        'direction', [
+            Direction.north(),
+            Direction.south(),
+            Direction.east(),
+            Direction.west(),
+        ],
+        ids=repr
+    )
+    def test_can_be_recreated_from_its_code(self, direction: Direction) -> None:
+        assert Direction.for_code(direction.code()) == direction
+
+    @pytest.mark.parametrize(
+        ('direction', 'points_east', 'points_north'), [
+            (Direction.north(), 0, 1),
+            (Direction.south(), 0, -1),
+            (Direction.east(), 1, 0),
+            (Direction.west(), -1, 0),
+        ],
+        ids=repr
+    )
+    def test_steps_one_point_towards_itself(self, direction: Direction, points_east: int, points_north: int) -> None:
+        assert direction.step().points_east() == points_east
+        assert direction.step().points_north() == points_north
+
 
 class TestPosition:
 
@@ -74,6 +138,106 @@ class TestPosition:
             Direction.north(), Coordinates(3, 4)
         )
 
+    def test_equal_positions_are_interchangeable_as_keys(self) -> None:
+        visits = {Position(Direction.north(), Coordinates(2, 3)): 1}
+        visits[Position(Direction.north(), Coordinates(2, 3))] += 1
+        visits[Position(Direction.east(), Coordinates(2, 3))] = 1
+        assert visits[Position(Direction.north(), Coordinates(2, 3))] == 2
+        assert len(visits) == 2
+
+
+class TestSurface:
+
+    @pytest.mark.parametrize(
+        ('coordinates', 'included'), [
+            (Coordinates(0, 0), True),
+            (Coordinates(7, 3), True),
+            (Coordinates(8, 3), False),
+            (Coordinates(7, 4), False),
+            (Coordinates(-1, 2), False),
+            (Coordinates(2, -1), False),
+        ],
+        ids=repr
+    )
+    def test_includes_coordinates_up_to_its_north_east_corner(self, coordinates: Coordinates, included: bool) -> None:
+        assert (coordinates in Surface.of_size(7, 3)) is included
+
+    def test_can_be_a_billion_points_wide(self) -> None:
+        surface = Surface.of_size(10 ** 9, 10 ** 9)
+        assert Coordinates(10 ** 9, 0) in surface
+        assert Coordinates(10 ** 9 + 1, 0) not in surface
+
+    def test_can_not_have_negative_size(self) -> None:
+        with pytest.raises(ValueError) as error:
+            Surface.of_size(3, -1)
+        assert str(error.value) == 'Invalid surface size: 3x-1'
+
+    @pytest.mark.parametrize(
+        ('reach', 'coordinates', 'included'), [
+            (0, Coordinates(0, 0), True),
+            (2, Coordinates(2, 2), True),
+            (2, Coordinates(5, 8), True),
+            (2, Coordinates(1, 2), False),
+            (2, Coordinates(6, 2), False),
+            (2, Coordinates(2, 9), False),
+            (5, Coordinates(4, 5), False),
+        ],
+        ids=repr
+    )
+    def test_includes_everything_within_reach_of_interior_coordinates(
+            self,
+            reach: int,
+            coordinates: Coordinates,
+            included: bool,
+    ) -> None:
+        surface = Surface.of_size(7, 10)
+        assert surface.includes_all_within(reach, coordinates.horizontal(), coordinates.vertical()) is included
+
+
+class TestObstacles:
+
+    ROCKS = [Coordinates(0, 0), Coordinates(3, 4), Coordinates(7, 2)]
+
+    @pytest.mark.parametrize(
+        'obstacles', [
+            SparseObstacles.at(ROCKS),
+            DenseObstacles.at(ROCKS, columns=8, rows=5),
+        ],
+        ids=['sparse', 'dense']
+    )
+    def test_block_only_their_coordinates(self, obstacles: Obstacles) -> None:
+        blocked = {
+            Coordinates(horizontal, vertical)
+            for horizontal in range(-1, 10)
+            for vertical in range(-1, 10)
+            if Coordinates(horizontal, vertical) in obstacles
+        }
+        assert blocked == set(self.ROCKS)
+
+    def test_can_be_memory_mapped_from_a_file(self, tmp_path: pathlib.Path) -> None:
+        path = str(tmp_path / 'rocks.bin')
+        DenseObstacles.at(self.ROCKS, columns=8, rows=5).save(path)
+        obstacles = DenseObstacles.load(path)
+        assert [rock in obstacles for rock in self.ROCKS] == [True, True, True]
+        assert Coordinates(4, 3) not in obstacles
+
+    def test_can_not_be_loaded_from_a_file_of_the_wrong_size(self, tmp_path: pathlib.Path) -> None:
+        path = tmp_path / 'rocks.bin'
+        DenseObstacles.at(self.ROCKS, columns=8, rows=5).save(str(path))
+        path.write_bytes(path.read_bytes() + b'\0')
+        with pytest.raises(ValueError) as error:
+            DenseObstacles.load(str(path))
+        assert str(error.value) == f'Invalid obstacle bitmap: {path}'
+
+    @pytest.mark.parametrize('size', [0, 3, 10])
+    def test_can_not_be_loaded_from_a_file_shorter_than_the_header(self, tmp_path: pathlib.Path, size: int) -> None:
+        path = tmp_path / 'rocks.bin'
+        DenseObstacles.at(self.ROCKS, columns=8, rows=5).save(str(path))
+        path.write_bytes(path.read_bytes()[:size])
+        with pytest.raises(ValueError) as error:
+            DenseObstacles.load(str(path))
+        assert str(error.value) == f'Invalid obstacle bitmap: {path}'
+
 
 class TestRover:
 
@@ -191,3 +355,530 @@ class TestRover:
         rover = Rover(Position(initial_direction, Coordinates(3, 3)))
         rover.turn_left()
         assert rover.position() == Position(final_direction, Coordinates(3, 3))
+
+    def test_executes_command_string(self) -> None:
+        rover = Rover(Position(Direction.north(), Coordinates(3, 3)))
+        rover.execute_all('ffrbbl')
+        assert rover.position() == Position(Direction.north(), Coordinates(1, 5))
+
+    def test_stops_at_unknown_command(self) -> None:
+        rover = Rover(Position(Direction.north(), Coordinates(3, 3)))
+        with pytest.raises(UnknownCommand) as error:
+            rover.execute_all('fr?f')
+        assert error.value.command() == '?'
+        assert error.value.index() == 2
+        assert rover.position() == Position(Direction.east(), Coordinates(3, 4))
+
+    def test_moves_on_a_rectangular_surface(self) -> None:
+        rover = Rover(Position(Direction.east(), Coordinates(8, 1)), Surface.of_size(9, 2))
+        rover.execute_all('ffflfff')
+        assert rover.position() == Position(Direction.north(), Coordinates(9, 2))
+
+    def test_can_not_land_outside_of_a_given_surface(self) -> None:
+        with pytest.raises(RoverOutsideSurface):
+            Rover(Position(Direction.north(), Coordinates(3, 3)), Surface.of_size(9, 2))
+
+    @pytest.mark.parametrize('size', [3, 20, 200])
+    def test_executes_random_commands_like_one_by_one(self, size: int) -> None:
+        generator = random.Random(size)
+        surface = Surface.of_size(size)
+        for _ in range(50):
+            position = Position(Direction.for_code(generator.randrange(4)), Coordinates(size // 2, size // 2))
+            commands = ''.join(generator.choice('fblr') for _ in range(generator.randint(0, 40)))
+            all_at_once = Rover(position, surface)
+            all_at_once.execute_all(commands)
+            one_by_one = Rover(position, surface)
+            for command in commands:
+                one_by_one.execute_all(command)
+            assert all_at_once.position() == one_by_one.position()
+
+    @pytest.mark.parametrize(
+        'obstacles', [
+            SparseObstacles.at([Coordinates(3, 5)]),
+            DenseObstacles.at([Coordinates(3, 5)], columns=6, rows=6),
+        ],
+        ids=['sparse', 'dense']
+    )
+    def test_stops_in_front_of_an_obstacle(self, obstacles: Obstacles) -> None:
+        rover = Rover(Position(Direction.north(), Coordinates(3, 3)), Surface.of_size(5, obstacles=obstacles))
+        rover.execute_all('fff')
+        assert rover.position() == Position(Direction.north(), Coordinates(3, 4))
+        assert rover.obstacle() == Coordinates(3, 5)
+
+    def test_skips_a_blocked_move_unless_executing_until_blocked(self) -> None:
+        surface = Surface.of_size(5, obstacles=SparseObstacles.at([Coordinates(3, 5)]))
+        all_at_once = Rover(Position(Direction.north(), Coordinates(3, 3)), surface)
+        all_at_once.execute_all('ffrf')
+        until_blocked = Rover(Position(Direction.north(), Coordinates(3, 3)), surface)
+        until_blocked.execute_until_blocked('ffrf')
+        assert (all_at_once.position(), all_at_once.obstacle()) == (Position(Direction.east(), Coordinates(4, 4)), None)
+        assert until_blocked.position() == Position(Direction.north(), Coordinates(3, 4))
+        assert until_blocked.obstacle() == Coordinates(3, 5)
+
+    @pytest.mark.parametrize('until_blocked', [False, True])
+    def test_executes_commands_around_obstacles_like_one_by_one(self, until_blocked: bool) -> None:
+        generator = random.Random(22)
+        surface = Surface.of_size(6, obstacles=SparseObstacles.at([Coordinates(2, 2), Coordinates(4, 3)]))
+        for _ in range(300):
+            commands = ''.join(generator.choice('fffblr') for _ in range(generator.randint(0, 30)))
+            position = Position(Direction.for_code(generator.randrange(4)), Coordinates(3, 3))
+            together = Rover(position, surface)
+            if until_blocked:
+                together.execute_until_blocked(commands)
+            else:
+                together.execute_all(commands)
+            stepped = Rover(position, surface)
+            actions = {'f': stepped.move_forward, 'b': stepped.move_backward, 'r': stepped.turn_right,
+                       'l': stepped.turn_left}
+            for command in commands:
+                actions[command]()
+                if until_blocked and stepped.obstacle() is not None:
+                    break
+            assert (together.position(), together.obstacle()) == (stepped.position(), stepped.obstacle())
+
+    def test_forgets_the_obstacle_once_it_moves_on(self) -> None:
+        surface = Surface.of_size(5, obstacles=SparseObstacles.at([Coordinates(3, 2)]))
+        rover = Rover(Position(Direction.north(), Coordinates(3, 3)), surface)
+        rover.move_backward()
+        assert rover.obstacle() == Coordinates(3, 2)
+        assert rover.position() == Position(Direction.north(), Coordinates(3, 3))
+        rover.move_forward()
+        assert rover.obstacle() is None
+        assert rover.position() == Position(Direction.north(), Coordinates(3, 4))
+
+    def test_runs_programs_step_by_step_around_obstacles(self) -> None:
+        surface = Surface.of_size(5, obstacles=SparseObstacles.at([Coordinates(1, 4)]))
+        rover = Rover(Position(Direction.north(), Coordinates(1, 1)), surface)
+        rover.run(Program.compiled_from('fffrf'))
+        assert rover.position() == Position(Direction.east(), Coordinates(2, 3))
+        assert rover.obstacle() is None
+
+    def test_can_not_land_on_an_obstacle(self) -> None:
+        surface = Surface.of_size(5, obstacles=SparseObstacles.at([Coordinates(1, 4)]))
+        with pytest.raises(RoverOnObstacle):
+            Rover(Position(Direction.north(), Coordinates(1, 4)), surface)
+
+
+class TestWrappingRover:
+
+    def stepped(self, rover: Rover, commands: str, until_blocked: bool) -> Rover:
+        actions = {'f': rover.move_forward, 'b': rover.move_backward, 'r': rover.turn_right, 'l': rover.turn_left}
+        for command in commands:
+            actions[command]()
+            if until_blocked and rover.obstacle() is not None:
+                break
+        return rover
+
+    def test_comes_back_on_the_other_side_of_the_surface(self) -> None:
+        rover = Rover(Position(Direction.north(), Coordinates(1, 5)), Surface.of_size(5), wrapping=True)
+        rover.execute_all('ffrbb')
+        assert rover.position() == Position(Direction.east(), Coordinates(5, 1))
+        assert rover.wraps()
+
+    def test_comes_back_to_where_it_stands_around_a_surface_one_point_across(self) -> None:
+        rover = Rover(Position(Direction.east(), Coordinates(0, 2)), Surface.of_size(0, 3), wrapping=True)
+        rover.move_forward()
+        assert rover.position() == Position(Direction.east(), Coordinates(0, 2))
+
+    @pytest.mark.parametrize('obstacles', [None, SparseObstacles.at([Coordinates(0, 2), Coordinates(3, 4)])])
+    def test_executes_commands_like_one_by_one(self, obstacles: Optional[Obstacles]) -> None:
+        generator = random.Random(20)
+        surface = Surface.of_size(4, 5, obstacles)
+        for _ in range(300):
+            commands = ''.join(generator.choice('fffblr') for _ in range(generator.randint(0, 40)))
+            position = Position(
+                Direction.for_symbol(generator.choice('NESW')),
+                Coordinates(generator.choice([1, 2, 4]), generator.randint(0, 3)),
+            )
+            together = Rover(position, surface, wrapping=True)
+            together.execute_all(commands)
+            compiled = Rover(position, surface, wrapping=True)
+            compiled.run(Program.compiled_from(commands))
+            stepped = self.stepped(Rover(position, surface, wrapping=True), commands, until_blocked=False)
+            assert together.position() == compiled.position() == stepped.position()
+            assert together.obstacle() == compiled.obstacle() == stepped.obstacle()
+            until_blocked = Rover(position, surface, wrapping=True)
+            until_blocked.execute_until_blocked(commands)
+            stepped = self.stepped(Rover(position, surface, wrapping=True), commands, until_blocked=True)
+            assert (until_blocked.position(), until_blocked.obstacle()) == (stepped.position(), stepped.obstacle())
+
+    def test_is_stopped_by_rovers_across_the_edge(self) -> None:
+        occupancy = Occupancy()
+        surface = Surface.of_size(5)
+        Rover(Position(Direction.north(), Coordinates(2, 0)), surface, occupancy)
+        rover = Rover(Position(Direction.north(), Coordinates(2, 4)), surface, occupancy, wrapping=True)
+        rover.execute_until_blocked('fffrf')
+        assert rover.position() == Position(Direction.north(), Coordinates(2, 5))
+        assert rover.obstacle() == Coordinates(2, 0)
+        assert occupancy.occupies(2, 5) and not occupancy.occupies(2, 4)
+
+    def test_keeps_moves_made_before_an_unknown_command(self) -> None:
+        rover = Rover(Position(Direction.north(), Coordinates(1, 5)), Surface.of_size(5), wrapping=True)
+        with pytest.raises(UnknownCommand):
+            rover.execute_all('ffxf')
+        assert rover.position() == Position(Direction.north(), Coordinates(1, 1))
+
+    def test_does_not_record_trajectories(self) -> None:
+        rover = Rover(Position(Direction.north(), Coordinates(1, 1)), wrapping=True)
+        with pytest.raises(ValueError):
+            rover.record_trajectory()
+
+
+class TestFleet:
+
+    def test_rover_stops_behind_another_rover(self) -> None:
+        fleet = Fleet()
+        fleet.land(Position(Direction.north(), Coordinates(2, 4)))
+        follower = fleet.land(Position(Direction.north(), Coordinates(2, 1)))
+        follower.execute_until_blocked('fffr')
+        assert follower.position() == Position(Direction.north(), Coordinates(2, 3))
+        assert follower.obstacle() == Coordinates(2, 4)
+
+    def test_rovers_move_in_landing_order(self) -> None:
+        fleet = Fleet()
+        fleet.land(Position(Direction.east(), Coordinates(0, 0)))
+        fleet.land(Position(Direction.north(), Coordinates(1, 1)))
+        fleet.execute_all(['f', 'b'])
+        assert fleet.positions() == [
+            Position(Direction.east(), Coordinates(1, 0)),
+            Position(Direction.north(), Coordinates(1, 1)),
+        ]
+        assert fleet.rovers()[1].obstacle() == Coordinates(1, 0)
+
+    def test_rover_can_pass_where_another_one_has_left(self) -> None:
+        fleet = Fleet()
+        fleet.land(Position(Direction.east(), Coordinates(1, 0)))
+        fleet.land(Position(Direction.east(), Coordinates(0, 0)))
+        fleet.execute_all(['ff', 'ff'])
+        assert fleet.positions() == [
+            Position(Direction.east(), Coordinates(3, 0)),
+            Position(Direction.east(), Coordinates(2, 0)),
+        ]
+
+    def test_rover_can_return_to_where_it_started(self) -> None:
+        fleet = Fleet()
+        rover = fleet.land(Position(Direction.east(), Coordinates(1, 0)))
+        rover.execute_all('fbb')
+        rover.move_forward()
+        assert rover.position() == Position(Direction.east(), Coordinates(1, 0))
+        assert rover.obstacle() is None
+
+    def test_rovers_can_not_land_on_each_other(self) -> None:
+        fleet = Fleet()
+        fleet.land(Position(Direction.north(), Coordinates(2, 4)))
+        with pytest.raises(CellOccupied):
+            fleet.land(Position(Direction.south(), Coordinates(2, 4)))
+
+    def test_rover_stops_at_obstacles_and_rovers(self) -> None:
+        fleet = Fleet(Surface.of_size(5, obstacles=SparseObstacles.at([Coordinates(0, 3)])))
+        fleet.land(Position(Direction.north(), Coordinates(2, 2)))
+        rover = fleet.land(Position(Direction.north(), Coordinates(0, 0)))
+        rover.execute_all('ffff')
+        assert rover.obstacle() == Coordinates(0, 3)
+        rover.execute_all('rff')
+        assert rover.obstacle() == Coordinates(2, 2)
+        assert rover.position() == Position(Direction.east(), Coordinates(1, 2))
+
+
+class TestTrajectory:
+
+    def test_keeps_moves_as_runs(self) -> None:
+        rover = Rover(Position(Direction.north(), Coordinates(0, 0)))
+        trajectory = rover.record_trajectory()
+        rover.execute_all('fffrrbbbff')
+        assert list(trajectory.runs()) == [(0, 3), (4, 2), (0, 2), (6, 1), (2, 2)]
+        assert len(trajectory) == 10
+
+    @pytest.mark.parametrize('checkpoint_every', [1, 2, 5, 64])
+    def test_knows_position_at_every_step(self, checkpoint_every: int) -> None:
+        generator = random.Random(checkpoint_every)
+        surface = Surface.of_size(6, obstacles=SparseObstacles.at([Coordinates(2, 2)]))
+        rover = Rover(Position(Direction.north(), Coordinates(3, 3)), surface)
+        trajectory = rover.record_trajectory(checkpoint_every)
+        positions = [rover.position()]
+        for _ in range(500):
+            rover.execute_all(generator.choice('ffffbbrl'))
+            positions.append(rover.position())
+        assert [trajectory.position_at(step) for step in range(len(positions))] == positions
+
+    def test_has_no_positions_beyond_its_steps(self) -> None:
+        trajectory = Trajectory(Position(Direction.north(), Coordinates(0, 0)))
+        trajectory.record(0, 3)
+        assert trajectory.position_at(3) == Position(Direction.north(), Coordinates(0, 3))
+        with pytest.raises(IndexError) as error:
+            trajectory.position_at(4)
+        assert str(error.value) == 'No step 4 in a trajectory of 3 steps'
+
+    def test_stops_where_an_obstacle_stopped_the_rover(self) -> None:
+        surface = Surface.of_size(5, obstacles=SparseObstacles.at([Coordinates(0, 2)]))
+        rover = Rover(Position(Direction.north(), Coordinates(0, 0)), surface)
+        trajectory = rover.record_trajectory()
+        rover.execute_until_blocked('fffrf')
+        assert list(trajectory.runs()) == [(0, 1), (6, 1)]
+        assert rover.obstacle() == Coordinates(0, 2)
+
+    def test_can_be_written_and_read_back(self) -> None:
+        generator = random.Random(0)
+        trajectory = Trajectory(Position(Direction.east(), Coordinates(10, 20)), checkpoint_every=4)
+        for _ in range(1000):
+            trajectory.record(generator.randrange(7), generator.randint(1, 3))
+        stream = io.BytesIO()
+        trajectory.write_to(stream)
+        stream.seek(0)
+        copy = Trajectory.read_from(stream)
+        assert list(copy.runs()) == list(trajectory.runs())
+        assert [copy.position_at(step) for step in range(0, len(trajectory), 7)] == [
+            trajectory.position_at(step) for step in range(0, len(trajectory), 7)
+        ]
+
+    def test_writes_run_lengths_little_endian(self) -> None:
+        trajectory = Trajectory(Position(Direction.east(), Coordinates(10, 20)))
+        for event, times in [(0, 1), (4, 258), (5, 70000)]:
+            trajectory.record(event, times)
+        stream = io.BytesIO()
+        trajectory.write_to(stream)
+        assert stream.getvalue()[-12:] == struct.pack('<3I', 1, 258, 70000)
+
+    def test_can_be_read_back_on_hosts_of_either_byte_order(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        trajectory = Trajectory(Position(Direction.east(), Coordinates(10, 20)))
+        for event, times in [(0, 1), (4, 258), (5, 70000)]:
+            trajectory.record(event, times)
+        little = io.BytesIO()
+        trajectory.write_to(little)
+        # A host of the other byte order swaps the run lengths both ways.
+        monkeypatch.setattr(sys, 'byteorder', 'big' if sys.byteorder == 'little' else 'little')
+        other = io.BytesIO()
+        trajectory.write_to(other)
+        assert other.getvalue()[-12:] == struct.pack('>3I', 1, 258, 70000)
+        other.seek(0)
+        assert list(Trajectory.read_from(other).runs()) == list(trajectory.runs())
+
+
+class TestProgram:
+
+    @pytest.mark.parametrize(
+        'commands', [
+            'ffrff',
+            'flbrrb',
+            'rrrr',
+            'fffrffflfff',
+            'ffrrff' * 100,
+        ]
+    )
+    def test_moves_rover_like_the_commands_one_by_one(self, commands: str) -> None:
+        program = Program.compiled_from(commands)
+        for horizontal in range(6):
+            for vertical in range(6):
+                for direction in 'NESW':
+                    position = Position(Direction.for_symbol(direction), Coordinates(horizontal, vertical))
+                    compiled = Rover(position)
+                    compiled.run(program)
+                    stepped = Rover(position)
+                    stepped.execute_all(commands)
+                    assert compiled.position() == stepped.position()
+
+    def test_moves_rover_like_random_commands(self) -> None:
+        generator = random.Random(0)
+        for _ in range(200):
+            commands = ''.join(generator.choice('fblr') for _ in range(generator.randint(0, 12)))
+            position = Position(
+                Direction.for_symbol(generator.choice('NESW')),
+                Coordinates(generator.randint(0, 5), generator.randint(0, 5)),
+            )
+            compiled = Rover(position)
+            compiled.run(Program.compiled_from(commands))
+            stepped = Rover(position)
+            stepped.execute_all(commands)
+            assert compiled.position() == stepped.position()
+
+    @pytest.mark.parametrize(
+        ('position', 'stays_inside'), [
+            (Position(Direction.north(), Coordinates(2, 2)), True),
+            (Position(Direction.north(), Coordinates(2, 4)), False),
+            (Position(Direction.east(), Coordinates(2, 4)), True),
+            (Position(Direction.east(), Coordinates(4, 4)), False),
+            (Position(Direction.west(), Coordinates(1, 0)), False),
+        ],
+        ids=repr
+    )
+    def test_knows_when_the_surface_edges_matter(self, position: Position, stays_inside: bool) -> None:
+        assert Program.compiled_from('ffrf').stays_inside(position, Surface.of_size(5)) is stays_inside
+
+    def test_can_not_be_compiled_from_unknown_commands(self) -> None:
+        with pytest.raises(UnknownCommand) as error:
+            Program.compiled_from('ffz')
+        assert error.value.index() == 2
+
+
+class TestPlanner:
+
+    def fewest_commands(self, start: Position, target: Position, surface: Surface) -> Optional[int]:
+        # Breadth-first search through every position the rover can reach without being stopped.
+        steps = {start: 0}
+        frontier = [start]
+        while frontier:
+            reached = []
+            for position in frontier:
+                if position == target:
+                    return steps[position]
+                for moved in [
+                    position.moved_forward(), position.moved_backward(), position.turned_right(),
+                    position.turned_left(),
+                ]:
+                    coordinates = moved.coordinates()
+                    if moved not in steps and coordinates in surface and not surface.blocks(
+                            coordinates.horizontal(), coordinates.vertical()):
+                        steps[moved] = steps[position] + 1
+                        reached.append(moved)
+            frontier = reached
+        return None
+
+    def test_plans_shortest_command_strings_around_obstacles(self) -> None:
+        generator = random.Random(21)
+        for _ in range(60):
+            obstacles = SparseObstacles.at([
+                Coordinates(generator.randint(0, 7), generator.randint(0, 5)) for _ in range(generator.randint(0, 14))
+            ])
+            surface = Surface.of_size(7, 5, obstacles)
+            start, target = [
+                Position(
+                    Direction.for_symbol(generator.choice('NESW')),
+                    Coordinates(generator.randint(0, 7), generator.randint(0, 5)),
+                )
+                for _ in range(2)
+            ]
+            if obstacles.blocks(start.coordinates().horizontal(), start.coordinates().vertical()):
+                continue
+            fewest = self.fewest_commands(start, target, surface)
+            if fewest is None:
+                with pytest.raises(Unreachable):
+                    Planner(surface).commands_between(start, target)
+                continue
+            commands = Planner(surface).commands_between(start, target)
+            assert len(commands) == fewest
+            rover = Rover(start, surface)
+            rover.execute_all(commands)
+            assert rover.position() == target
+            assert rover.obstacle() is None
+
+    def test_plans_one_path_after_another(self) -> None:
+        generator = random.Random(12)
+        surface = Surface.of_size(9, 7, SparseObstacles.at([
+            Coordinates(generator.randint(0, 9), generator.randint(0, 7)) for _ in range(25)
+        ]))
+        planner = Planner(surface)
+        for _ in range(40):
+            start, target = [
+                Position(
+                    Direction.for_symbol(generator.choice('NESW')),
+                    Coordinates(generator.randint(0, 9), generator.randint(0, 7)),
+                )
+                for _ in range(2)
+            ]
+            if surface.blocks(start.coordinates().horizontal(), start.coordinates().vertical()):
+                continue
+            try:
+                commands: Optional[int] = len(planner.commands_between(start, target))
+            except Unreachable:
+                commands = None
+            assert commands == self.fewest_commands(start, target, surface)
+
+    def test_needs_no_commands_to_stay(self) -> None:
+        position = Position(Direction.east(), Coordinates(2, 2))
+        assert Planner(Surface.of_size(5)).commands_between(position, position) == ''
+
+    def test_turns_once_to_change_axis(self) -> None:
+        planner = Planner(Surface.of_size(5))
+        start = Position(Direction.north(), Coordinates(0, 0))
+        assert planner.commands_between(start, Position(Direction.east(), Coordinates(3, 0))) == 'rfff'
+        assert planner.commands_between(start, Position(Direction.north(), Coordinates(0, 0)).turned_left()) == 'l'
+
+    def test_moves_along_a_surface_one_point_wide(self) -> None:
+        planner = Planner(Surface.of_size(0, 6))
+        start = Position(Direction.west(), Coordinates(0, 0))
+        assert planner.commands_between(start, Position(Direction.west(), Coordinates(0, 6))) == 'rffffffl'
+
+    def test_gives_up_on_a_walled_off_target_without_searching_the_whole_surface(self) -> None:
+        class CountedObstacles(SparseObstacles):
+            lookups = 0
+
+            def blocks(self, horizontal: int, vertical: int) -> bool:
+                CountedObstacles.lookups += 1
+                return super().blocks(horizontal, vertical)
+
+        walls = CountedObstacles.at([Coordinates(201, 200), Coordinates(199, 200), Coordinates(200, 201)] + [
+            Coordinates(horizontal, 199) for horizontal in range(198, 203)
+        ])
+        planner = Planner(Surface.of_size(399, obstacles=walls))
+        for start, target in [(Coordinates(0, 0), Coordinates(200, 200)), (Coordinates(200, 200), Coordinates(0, 0))]:
+            with pytest.raises(Unreachable):
+                planner.commands_between(Position(Direction.north(), start), Position(Direction.east(), target))
+        assert CountedObstacles.lookups < 100
+
+    def test_can_not_plan_to_or_from_an_obstacle_or_outside_the_surface(self) -> None:
+        planner = Planner(Surface.of_size(5, obstacles=SparseObstacles.at([Coordinates(2, 2)])))
+        inside = Position(Direction.north(), Coordinates(0, 0))
+        for coordinates in [Coordinates(2, 2), Coordinates(6, 0)]:
+            elsewhere = Position(Direction.north(), coordinates)
+            with pytest.raises(Unreachable):
+                planner.commands_between(inside, elsewhere)
+            with pytest.raises(Unreachable):
+                planner.commands_between(elsewhere, inside)
+
+
+class TestCommandDistances:
+
+    def surface_with(self, obstacles: Set[Coordinates]) -> Surface:
+        return Surface.of_size(7, 5, SparseObstacles.at(obstacles))
+
+    def assert_plannable(self, distances: CommandDistances, surface: Surface, sites: List[Position]) -> None:
+        planner = Planner(surface)
+        for horizontal in range(8):
+            for vertical in range(6):
+                for symbol in 'NESW':
+                    position = Position(Direction.for_symbol(symbol), Coordinates(horizontal, vertical))
+                    for site, target in enumerate(sites):
+                        try:
+                            fewest: Optional[int] = len(planner.commands_between(position, target))
+                        except Unreachable:
+                            fewest = None
+                        try:
+                            commands: Optional[int] = distances.commands_to(position, site)
+                        except Unreachable:
+                            commands = None
+                        assert commands == fewest
+
+    def test_knows_how_many_commands_take_a_rover_to_every_site(self) -> None:
+        generator = random.Random(22)
+        obstacles = {Coordinates(generator.randint(0, 7), generator.randint(0, 5)) for _ in range(12)}
+        surface = self.surface_with(obstacles)
+        sites = [Position(Direction.east(), Coordinates(0, 0)), Position(Direction.south(), Coordinates(7, 5))]
+        self.assert_plannable(CommandDistances.to_sites(surface, sites), surface, sites)
+
+    def test_follows_obstacles_added_and_removed(self) -> None:
+        generator = random.Random(22)
+        obstacles: Set[Coordinates] = set()
+        sites = [Position(Direction.north(), Coordinates(3, 2)), Position(Direction.west(), Coordinates(6, 1))]
+        distances = CommandDistances.to_sites(self.surface_with(obstacles), sites)
+        for _ in range(30):
+            point = Coordinates(generator.randint(0, 7), generator.randint(0, 5))
+            if point in obstacles:
+                obstacles.remove(point)
+                distances.remove_obstacle(point)
+            else:
+                obstacles.add(point)
+                distances.add_obstacle(point)
+            self.assert_plannable(distances, self.surface_with(obstacles), sites)
+
+    def test_can_not_reach_sites_from_obstacles_or_outside_the_surface(self) -> None:
+        site = Position(Direction.north(), Coordinates(0, 0))
+        surface = Surface.of_size(5, obstacles=SparseObstacles.at([Coordinates(2, 2)]))
+        distances = CommandDistances.to_sites(surface, [site])
+        for coordinates in [Coordinates(2, 2), Coordinates(6, 0)]:
+            with pytest.raises(Unreachable):
+                distances.commands_to(Position(Direction.north(), coordinates), 0)
+
+    def test_holds_distances_of_long_ways(self) -> None:
+        site = Position(Direction.north(), Coordinates(0, 0))
+        distances = CommandDistances.to_sites(Surface.of_size(0, 70_000), [site])
+        assert distances.commands_to(Position(Direction.south(), Coordinates(0, 70_000)), 0) == 70_002
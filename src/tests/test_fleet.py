@@ -0,0 +1,214 @@
+import random
+from typing import List
+
+import pytest
+
+from mars_rover.domain import CellOccupied
+from mars_rover.domain import Coordinates
+from mars_rover.domain import Direction
+from mars_rover.domain import Position
+from mars_rover.domain import Rover
+from mars_rover.domain import RoverOutsideSurface
+from mars_rover.domain import Surface
+from mars_rover.domain import UnknownCommand
+
+np = pytest.importorskip('numpy')
+
+from mars_rover.fleet import PartitionedFleet  # noqa: E402
+from mars_rover.fleet import ScheduledFleet  # noqa: E402
+from mars_rover.fleet import VectorizedFleet  # noqa: E402
+
+
+def random_positions(generator: random.Random, count: int) -> List[Position]:
+    return [
+        Position(
+            Direction.for_symbol(generator.choice('NESW')),
+            Coordinates(generator.randint(0, 5), generator.randint(0, 5)),
+        )
+        for _ in range(count)
+    ]
+
+
+class TestVectorizedFleet:
+
+    def test_applies_one_command_to_each_rover(self) -> None:
+        fleet = VectorizedFleet.landing_at([
+            Position(Direction.north(), Coordinates(3, 4)),
+            Position(Direction.north(), Coordinates(3, 4)),
+            Position(Direction.east(), Coordinates(3, 4)),
+            Position(Direction.west(), Coordinates(3, 4)),
+        ])
+        fleet.tick('fbrl')
+        assert [fleet.position(index) for index in range(len(fleet))] == [
+            Position(Direction.north(), Coordinates(3, 5)),
+            Position(Direction.north(), Coordinates(3, 3)),
+            Position(Direction.south(), Coordinates(3, 4)),
+            Position(Direction.south(), Coordinates(3, 4)),
+        ]
+
+    def test_ignores_moves_outside_the_surface(self) -> None:
+        fleet = VectorizedFleet.landing_at([
+            Position(Direction.north(), Coordinates(3, 5)),
+            Position(Direction.east(), Coordinates(0, 3)),
+        ])
+        fleet.tick('fb')
+        assert fleet.position(0) == Position(Direction.north(), Coordinates(3, 5))
+        assert fleet.position(1) == Position(Direction.east(), Coordinates(0, 3))
+
+    def test_can_not_land_outside_of_the_surface(self) -> None:
+        with pytest.raises(RoverOutsideSurface):
+            VectorizedFleet.landing_at([Position(Direction.north(), Coordinates(6, 3))])
+
+    def test_rejects_unknown_commands_with_the_rover_index(self) -> None:
+        fleet = VectorizedFleet.landing_at(random_positions(random.Random(0), 3))
+        with pytest.raises(UnknownCommand) as error:
+            fleet.tick('fxf')
+        assert error.value.command() == 'x'
+        assert error.value.index() == 1
+
+    @pytest.mark.parametrize('seed', range(5))
+    def test_matches_rovers_moved_one_by_one(self, seed: int) -> None:
+        generator = random.Random(seed)
+        positions = random_positions(generator, 200)
+        ticks = [''.join(generator.choice('fblr') for _ in positions) for _ in range(50)]
+        fleet = VectorizedFleet.landing_at(positions)
+        for commands in ticks:
+            fleet.tick(np.frombuffer(commands.encode(), dtype=np.uint8))
+        for index, position in enumerate(positions):
+            rover = Rover(position)
+            rover.execute_all(''.join(commands[index] for commands in ticks))
+            assert fleet.position(index) == rover.position()
+
+
+class SortingFleet(ScheduledFleet):
+    _GRID_CELLS = 0
+
+
+class TestScheduledFleet:
+
+    def positions(self, fleet: VectorizedFleet) -> List[Position]:
+        return [fleet.position(index) for index in range(len(fleet))]
+
+    def test_rover_landed_first_gets_to_a_cell_others_move_to(self) -> None:
+        fleet = ScheduledFleet.landing_at([
+            Position(Direction.west(), Coordinates(3, 2)),
+            Position(Direction.north(), Coordinates(2, 1)),
+            Position(Direction.east(), Coordinates(1, 2)),
+        ])
+        fleet.tick('fff')
+        assert self.positions(fleet) == [
+            Position(Direction.west(), Coordinates(2, 2)),
+            Position(Direction.north(), Coordinates(2, 1)),
+            Position(Direction.east(), Coordinates(1, 2)),
+        ]
+
+    def test_rovers_can_not_swap_cells(self) -> None:
+        fleet = ScheduledFleet.landing_at([
+            Position(Direction.east(), Coordinates(1, 1)),
+            Position(Direction.east(), Coordinates(2, 1)),
+        ])
+        fleet.tick('fb')
+        assert self.positions(fleet) == [
+            Position(Direction.east(), Coordinates(1, 1)),
+            Position(Direction.east(), Coordinates(2, 1)),
+        ]
+
+    def test_rovers_move_one_after_another_unless_the_first_one_stays(self) -> None:
+        fleet = ScheduledFleet.landing_at([
+            Position(Direction.north(), Coordinates(0, 2)),
+            Position(Direction.north(), Coordinates(0, 1)),
+            Position(Direction.north(), Coordinates(0, 0)),
+        ])
+        fleet.tick('fff')
+        assert [position.coordinates() for position in self.positions(fleet)] == [
+            Coordinates(0, 3), Coordinates(0, 2), Coordinates(0, 1),
+        ]
+        fleet.tick('rff')
+        assert [position.coordinates() for position in self.positions(fleet)] == [
+            Coordinates(0, 3), Coordinates(0, 2), Coordinates(0, 1),
+        ]
+
+    def test_rovers_moving_around_in_a_circle_all_move(self) -> None:
+        fleet = ScheduledFleet.landing_at([
+            Position(Direction.north(), Coordinates(0, 0)),
+            Position(Direction.east(), Coordinates(0, 1)),
+            Position(Direction.south(), Coordinates(1, 1)),
+            Position(Direction.west(), Coordinates(1, 0)),
+        ])
+        fleet.tick('ffff')
+        assert [position.coordinates() for position in self.positions(fleet)] == [
+            Coordinates(0, 1), Coordinates(1, 1), Coordinates(1, 0), Coordinates(0, 0),
+        ]
+
+    def test_rovers_can_not_land_on_each_other(self) -> None:
+        with pytest.raises(CellOccupied):
+            ScheduledFleet.landing_at([
+                Position(Direction.north(), Coordinates(2, 2)),
+                Position(Direction.east(), Coordinates(2, 2)),
+            ])
+
+    @pytest.mark.parametrize('seed', range(5))
+    def test_rovers_never_share_a_cell(self, seed: int) -> None:
+        generator = random.Random(seed)
+        cells = [Coordinates(horizontal, vertical) for horizontal in range(6) for vertical in range(6)]
+        positions = [
+            Position(Direction.for_symbol(generator.choice('NESW')), cell) for cell in generator.sample(cells, 24)
+        ]
+        fleet = ScheduledFleet.landing_at(positions)
+        sorting_fleet = SortingFleet.landing_at(positions)
+        for _ in range(50):
+            commands = ''.join(generator.choice('fblr') for _ in positions)
+            fleet.tick(commands)
+            sorting_fleet.tick(commands)
+            assert len({position.coordinates().packed() for position in self.positions(fleet)}) == len(positions)
+            assert self.positions(sorting_fleet) == self.positions(fleet)
+
+    def test_matches_a_rover_on_its_own(self) -> None:
+        generator = random.Random(0)
+        position = Position(Direction.north(), Coordinates(2, 2))
+        commands = ''.join(generator.choice('fblr') for _ in range(100))
+        fleet = ScheduledFleet.landing_at([position])
+        for command in commands:
+            fleet.tick(command)
+        rover = Rover(position)
+        rover.execute_all(commands)
+        assert fleet.position(0) == rover.position()
+
+
+class TestPartitionedFleet:
+
+    @pytest.mark.parametrize(('seed', 'workers'), [(0, 1), (1, 2), (2, 3), (3, 5)])
+    def test_moves_rovers_like_a_single_process(self, seed: int, workers: int) -> None:
+        generator = random.Random(seed)
+        surface = Surface.of_size(6, 13)
+        cells = [Coordinates(horizontal, vertical) for horizontal in range(7) for vertical in range(14)]
+        positions = [
+            Position(Direction.for_symbol(generator.choice('NESW')), cell) for cell in generator.sample(cells, 60)
+        ]
+        expected = ScheduledFleet.landing_at(positions, surface)
+        with PartitionedFleet.landing_at(positions, surface, workers) as fleet:
+            assert fleet.workers() == workers
+            for _ in range(30):
+                commands = ''.join(generator.choice('ffffbblr') for _ in positions)
+                expected.tick(commands)
+                fleet.tick(commands)
+                assert fleet.positions() == [expected.position(index) for index in range(len(positions))]
+
+    def test_rovers_in_a_line_through_all_stripes_stop_behind_one_that_stays(self) -> None:
+        positions = [Position(Direction.north(), Coordinates(0, vertical)) for vertical in range(12)]
+        with PartitionedFleet.landing_at(positions, Surface.of_size(0, 11), workers=4) as fleet:
+            fleet.tick('f' * 12)
+            assert fleet.positions() == positions
+            fleet.tick('f' * 11 + 'b')
+            assert fleet.positions() == positions
+
+    def test_has_stripes_at_least_two_rows_high(self) -> None:
+        with PartitionedFleet.landing_at([], Surface.of_size(3, 4), workers=4) as fleet:
+            assert fleet.workers() == 2
+
+    def test_rovers_can_not_land_on_each_other(self) -> None:
+        with pytest.raises(CellOccupied):
+            PartitionedFleet.landing_at([
+                Position(Direction.north(), Coordinates(2, 2)),
+                Position(Direction.east(), Coordinates(2, 2)),
+            ])
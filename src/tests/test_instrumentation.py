@@ -0,0 +1,129 @@
+import threading
+
+import pytest
+
+from mars_rover.application import MarsRoverApplication
+from mars_rover.application import PositionFormat
+from mars_rover.application import UserInputError
+from mars_rover.domain import Coordinates
+from mars_rover.domain import Direction
+from mars_rover.domain import Fleet
+from mars_rover.domain import Position
+from mars_rover.domain import Program
+from mars_rover.domain import Rover
+from mars_rover.domain import SparseObstacles
+from mars_rover.domain import Surface
+from mars_rover.instrumentation import Histogram
+from mars_rover.instrumentation import Registry
+from mars_rover.instrumentation import instrumented
+
+
+class TestHistogram:
+
+    def test_counts_observations_by_power_of_two_microseconds(self) -> None:
+        histogram = Histogram()
+        for seconds in [0.0, 0.000_003, 0.000_003_5, 0.000_100]:
+            histogram.observe(seconds)
+        assert histogram.buckets() == {1: 1, 4: 2, 128: 1}
+        assert histogram.count() == 4
+        assert histogram.total() == pytest.approx(0.000_106_5)
+
+
+class TestInstrumentation:
+
+    def test_counts_commands_by_type_and_blocked_moves(self) -> None:
+        surface = Surface.of_size(5, obstacles=SparseObstacles.at([Coordinates(2, 3)]))
+        with instrumented(Registry()) as registry:
+            app = MarsRoverApplication.landing_with('0 0 N', surface)
+            app.execute_all('bbrfflfffff')
+            app.execute('r')
+        assert app.rover_position() == '2 2 E'
+        assert [registry.counter(f'commands.{command}') for command in 'fblr'] == [7, 2, 1, 2]
+        assert registry.counter('blocked.edge') == 2
+        assert registry.counter('blocked.obstacle') == 3
+
+    def test_times_phases(self) -> None:
+        with instrumented(Registry()) as registry:
+            app = MarsRoverApplication.landing_with('1 1 N')
+            app.execute_all('ffrff')
+            app.run(Program.compiled_from('ll'))
+            app.execute('f')
+            PositionFormat().positions_from(['1 2 N', '3 3 E'])
+        assert registry.histogram('phase.parse').count() == 3
+        assert registry.histogram('phase.parse_lines').count() == 1
+        assert registry.histogram('phase.execute').count() == 2
+        assert registry.histogram('phase.dispatch').count() == 1
+        assert registry.counter('commands.l') == 2
+
+    def test_counts_errors_by_kind(self) -> None:
+        with instrumented(Registry()) as registry:
+            for landing in ['1 a N', '1 1 X', '9 9 N', '1 1 N']:
+                with pytest.raises(UserInputError):
+                    MarsRoverApplication.landing_with(landing).execute_all('fz')
+        lines = registry.dump().splitlines()
+        assert lines[:5] == [
+            'counter commands.f 1',
+            'counter errors.invalid_direction 1',
+            'counter errors.invalid_position 1',
+            'counter errors.rover_outside_surface 1',
+            'counter errors.unknown_command 1',
+        ]
+        assert lines[6].startswith('histogram phase.parse count=4 total=')
+
+    def test_counts_rovers_blocked_by_other_rovers_and_wrapping_rovers_as_moving(self) -> None:
+        fleet = Fleet(Surface.of_size(5))
+        fleet.land(Position(Direction.north(), Coordinates(1, 2)))
+        fleet.land(Position(Direction.north(), Coordinates(1, 1)))
+        wrapping = Rover(Position(Direction.east(), Coordinates(0, 0)), Surface.of_size(0, 3), wrapping=True)
+        with instrumented(Registry()) as registry:
+            fleet.execute_all(['', 'f'])
+            wrapping.execute_all('f')
+        assert registry.counter('commands.f') == 2
+        assert [registry.counter(f'blocked.{reason}') for reason in ('edge', 'obstacle', 'rover')] == [0, 0, 1]
+
+    def test_counts_into_the_innermost_block(self) -> None:
+        with instrumented(Registry()) as outer:
+            MarsRoverApplication.landing_with('1 1 N').execute_all('ff')
+            with instrumented(Registry()) as inner:
+                MarsRoverApplication.landing_with('1 1 N').execute_all('f')
+            MarsRoverApplication.landing_with('1 1 N').execute_all('ff')
+        assert (outer.counter('commands.f'), inner.counter('commands.f')) == (4, 1)
+
+    def test_leaves_other_threads_alone(self) -> None:
+        entered = threading.Event()
+        done = threading.Event()
+        registries = []
+
+        def instrumenting() -> None:
+            with instrumented(Registry()) as registry:
+                registries.append(registry)
+                entered.set()
+                done.wait()
+
+        thread = threading.Thread(target=instrumenting)
+        thread.start()
+        entered.wait()
+        try:
+            app = MarsRoverApplication.landing_with('1 1 N')
+            app.execute_all('ff')
+            app.execute('f')
+        finally:
+            done.set()
+            thread.join()
+        assert app.rover_position() == '1 4 N'
+        assert registries[0].dump() == ''
+
+    def test_restores_plain_methods_once_the_last_block_ends(self) -> None:
+        plain = [Rover.__dict__['_execute'], UserInputError.__dict__['unknown_command']]
+        with instrumented(Registry()):
+            thread = threading.Thread(target=self._run_instrumented)
+            thread.start()
+            thread.join()
+            assert Rover.__dict__['_execute'] is not plain[0]
+        assert [Rover.__dict__['_execute'], UserInputError.__dict__['unknown_command']] == plain
+        assert Rover._execute is plain[0]
+
+    @staticmethod
+    def _run_instrumented() -> None:
+        with instrumented(Registry()):
+            MarsRoverApplication.landing_with('1 1 N').execute_all('f')
@@ -0,0 +1,93 @@
+import random
+
+import pytest
+
+from mars_rover.application import MarsRoverApplication
+from mars_rover.application import UserInputError
+from mars_rover.domain import Coordinates
+from mars_rover.domain import SparseObstacles
+from mars_rover.domain import Surface
+from mars_rover.memo import MemoizingExecutor
+
+
+def random_commands(generator: random.Random, length: int) -> str:
+    return ''.join(generator.choice('fblr') for _ in range(length))
+
+
+def executed(landing: str, commands: str, surface: Surface) -> str:
+    app = MarsRoverApplication.landing_with(landing, surface)
+    app.execute_until_blocked(commands)
+    return app.rover_position()
+
+
+class TestMemoizingExecutor:
+
+    @pytest.mark.parametrize('stride', [1, 3, 16, 1000])
+    def test_ends_where_the_application_executing_until_blocked_does(self, stride: int) -> None:
+        generator = random.Random(stride)
+        surface = Surface.of_size(8, obstacles=SparseObstacles.at([Coordinates(1, 1), Coordinates(6, 5)]))
+        executor = MemoizingExecutor(surface, stride=stride, max_bytes=20_000)
+        route = random_commands(generator, 100)
+        for _ in range(100):
+            landing = generator.choice(['3 3 N', '4 4 E', '0 7 S'])
+            commands = route[:generator.randint(0, 100)] + random_commands(generator, generator.randint(0, 30))
+            assert executor.execute(landing, commands) == executed(landing, commands, surface)
+
+    def test_resumes_from_the_longest_shared_prefix(self) -> None:
+        executor = MemoizingExecutor(Surface.of_size(100), stride=4)
+        executor.execute('50 50 N', 'ffffrfffffff')
+        assert executor.execute('50 50 N', 'ffffrfffbbbb') == '49 54 E'
+        statistics = executor.statistics()
+        assert (statistics.hits(), statistics.misses(), statistics.entries()) == (1, 1, 4)
+
+    def test_does_not_share_prefixes_between_landings(self) -> None:
+        executor = MemoizingExecutor(Surface.of_size(100), stride=4)
+        executor.execute('50 50 N', 'ffff')
+        assert executor.execute('10 10 N', 'ffff') == '10 14 N'
+        assert executor.statistics().misses() == 2
+
+    def test_tells_the_same_commands_apart_after_different_prefixes(self) -> None:
+        executor = MemoizingExecutor(Surface.of_size(100), stride=4)
+        executor.execute('50 50 N', 'ffffrrff')
+        assert executor.execute('50 50 N', 'bbbbrrff') == '50 44 S'
+        statistics = executor.statistics()
+        assert (statistics.hits(), statistics.misses(), statistics.entries()) == (0, 2, 4)
+
+    def test_evicts_least_recently_used_states_over_its_memory_budget(self) -> None:
+        unbounded = MemoizingExecutor(Surface.of_size(100), stride=1)
+        unbounded.execute('50 50 N', 'ffff')
+        entry = unbounded.statistics().estimated_bytes() // 4
+        executor = MemoizingExecutor(Surface.of_size(100), stride=1, max_bytes=3 * entry + entry // 2)
+        executor.execute('50 50 N', 'ffff')
+        executor.execute('50 50 N', 'f')
+        executor.execute('50 50 N', 'rr')
+        statistics = executor.statistics()
+        assert (statistics.evictions(), statistics.entries()) == (4, 3)
+        assert statistics.estimated_bytes() <= 3 * entry + entry // 2
+        assert executor.execute('50 50 N', 'fb') == '50 50 N'
+        assert executor.statistics().hits() == 1
+
+    def test_keeps_a_rover_stopped_by_an_obstacle_in_place(self) -> None:
+        surface = Surface.of_size(10, obstacles=SparseObstacles.at([Coordinates(2, 4)]))
+        executor = MemoizingExecutor(surface, stride=2)
+        assert executor.execute('2 2 N', 'ffff') == '2 3 N'
+        assert executor.execute('2 2 N', 'ffffrf') == '2 3 N'
+        assert executor.statistics().hits() == 1
+
+    def test_reports_unknown_commands_at_their_index_in_the_whole_string(self) -> None:
+        executor = MemoizingExecutor(stride=4)
+        executor.execute('1 1 N', 'frfl')
+        with pytest.raises(UserInputError) as error:
+            executor.execute('1 1 N', 'frflffxf')
+        assert str(error.value) == "Unknown command: 'x' at index 6"
+
+    @pytest.mark.parametrize(
+        ('landing', 'message'), [
+            ('1 a N', 'Invalid position: 1 a N'),
+            ('9 1 N', 'Rover outside the surface'),
+        ]
+    )
+    def test_rejects_invalid_landings(self, landing: str, message: str) -> None:
+        with pytest.raises(UserInputError) as error:
+            MemoizingExecutor().execute(landing, 'ff')
+        assert str(error.value) == message
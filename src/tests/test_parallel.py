@@ -0,0 +1,51 @@
+import io
+import pathlib
+import random
+
+import pytest
+
+from mars_rover.parallel import MissionShards
+from mars_rover.parallel import ParallelMissionRunner
+from mars_rover.parallel import Shard
+from mars_rover.streaming import MissionReader
+
+
+def generated_missions(records: int, seed: int = 0) -> bytes:
+    generator = random.Random(seed)
+    lines = []
+    for _ in range(records):
+        lines.append(f'{generator.randint(0, 6)} {generator.randint(0, 5)} {generator.choice("NESWX")}')
+        lines.append(''.join(generator.choice('fblr' * 20 + 'x') for _ in range(generator.randint(0, 40))))
+        if generator.random() < 0.1:
+            lines.append('')
+    return '\n'.join(lines).encode()
+
+
+class TestMissionShards:
+
+    def test_splits_missions_at_landing_lines(self) -> None:
+        missions = b'1 2 N\nff\n\n3 3 E\n\n1 1 S\nrf\n'
+        shards = MissionShards(records_per_shard=2, chunk_size=3).shards_of(io.BytesIO(missions))
+        assert list(shards) == [Shard(1, 0, 17), Shard(6, 17, -1)]
+
+    def test_skips_blank_lines_between_records(self) -> None:
+        shards = MissionShards(records_per_shard=1).shards_of(io.BytesIO(b'\n \n1 2 N\nff\n\n\n3 3 E'))
+        assert list(shards) == [Shard(3, 3, 14), Shard(7, 14, -1)]
+
+    def test_cuts_shards_while_reading_the_stream(self) -> None:
+        missions = io.BytesIO(generated_missions(1000))
+        shards = MissionShards(records_per_shard=10, chunk_size=64).shards_of(missions)
+        first, second = next(shards), next(shards)
+        assert first == Shard(1, 0, second.start())
+        assert missions.tell() < len(missions.getvalue()) // 10
+
+
+class TestParallelMissionRunner:
+
+    @pytest.mark.parametrize(('workers', 'records_per_shard'), [(1, 1000), (2, 7), (3, 1)])
+    def test_reports_like_a_single_process(self, tmp_path: pathlib.Path, workers: int, records_per_shard: int) -> None:
+        missions = tmp_path / 'missions.txt'
+        missions.write_bytes(generated_missions(200))
+        expected = list(MissionReader().reports_from(io.BytesIO(missions.read_bytes())))
+        runner = ParallelMissionRunner(workers, records_per_shard, chunk_size=64)
+        assert list(runner.reports_from(str(missions))) == expected
@@ -0,0 +1,98 @@
+import asyncio
+import random
+from typing import List
+from typing import Optional
+
+import pytest
+
+from mars_rover.domain import Coordinates
+from mars_rover.domain import SparseObstacles
+from mars_rover.domain import Surface
+from mars_rover.server import RoverServer
+from mars_rover.server import request_from
+
+
+def exchanged(server: RoverServer, requests: List[bytes], connections: int = 1) -> List[List[bytes]]:
+    async def exchange() -> List[List[bytes]]:
+        listening = await server.listen()
+        port = listening.sockets[0].getsockname()[1]
+        replies = []
+        async with listening:
+            for _ in range(connections):
+                reader, writer = await asyncio.open_connection('127.0.0.1', port)
+                writer.write(b''.join(requests))
+                writer.write_eof()
+                replies.append((await reader.read()).splitlines())
+                writer.close()
+        return replies
+    return asyncio.run(exchange())
+
+
+def replies_one_by_one(surface: Optional[Surface], requests: List[bytes]) -> List[bytes]:
+    server = RoverServer(surface)
+    return [reply.rstrip() for request in requests for reply in server.replies_to([request_from(request)])]
+
+
+class TestRoverServer:
+
+    def test_answers_pipelined_requests_in_order(self) -> None:
+        replies = exchanged(RoverServer(), [
+            b'land one 1 2 N\n',
+            b'land two 3 3 E\n',
+            b'exec one lflflflff\n',
+            b'exec two ffrff\n',
+            b'exec two rfrrf\n',
+            b'position one\n',
+            b'position two\n',
+        ])
+        assert replies == [[b'ok 1 2 N', b'ok 3 3 E', b'ok', b'ok', b'ok', b'ok 1 3 N', b'ok 5 1 E']]
+
+    def test_rovers_are_shared_between_connections(self) -> None:
+        replies = exchanged(RoverServer(), [b'land one 1 1 N\n', b'exec one f\n', b'position one\n'], connections=2)
+        assert replies[1] == [b'ok 1 1 N', b'ok', b'ok 1 2 N']
+
+    def test_reports_malformed_requests_and_carries_on(self) -> None:
+        replies = exchanged(RoverServer(), [
+            b'land one 1 a N\n',
+            b'exec one ff\n',
+            b'land one 1 1 N\r\n',
+            b'exec one ff\n',
+            b'exec one fxf\n',
+            b'exec one f\n',
+            b'fly one\n',
+            b'position one\n',
+        ])
+        assert replies == [[
+            b'error Invalid position: 1 a N',
+            b'error Unknown rover: one',
+            b'ok 1 1 N',
+            b'ok',
+            b"error Unknown command: 'x' at index 1",
+            b'ok',
+            b'error Unknown request: fly',
+            b'ok 1 5 N',
+        ]]
+
+    def test_rejects_overlong_requests_and_hangs_up(self) -> None:
+        replies = exchanged(RoverServer(max_line=16), [b'land one 1 1 N\n', b'exec one ' + b'f' * 32 + b'\n'])
+        assert replies == [[b'ok 1 1 N', b'error Request too long']]
+
+    def test_keeps_up_with_clients_sending_more_than_it_holds(self) -> None:
+        requests = [b'land one 0 0 N\n'] + [b'exec one rrrr\n'] * 5000 + [b'position one\n']
+        replies = exchanged(RoverServer(max_pending=8), requests)
+        assert len(replies[0]) == 5002
+        assert replies[0][-1] == b'ok 0 0 N'
+
+    @pytest.mark.parametrize('obstacles', [None, SparseObstacles.at([Coordinates(2, 2), Coordinates(4, 1)])])
+    def test_executes_batches_as_if_one_by_one(self, obstacles: Optional[SparseObstacles]) -> None:
+        generator = random.Random(15)
+        surface = Surface.of_size(5, obstacles=obstacles)
+        requests = [b'land one 0 0 N\n', b'land two 5 5 S\n']
+        for _ in range(300):
+            rover = generator.choice([b'one', b'two'])
+            commands = ''.join(generator.choice('fblrfblrx') for _ in range(generator.randint(0, 6))).encode()
+            if generator.random() < 0.2:
+                requests.append(b'position %s\n' % rover)
+            else:
+                requests.append(b'exec %s %s\n' % (rover, commands))
+        assert exchanged(RoverServer(surface), requests) == [replies_one_by_one(surface, requests)]
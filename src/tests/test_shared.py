@@ -0,0 +1,99 @@
+import multiprocessing
+import threading
+from multiprocessing.connection import Connection
+from typing import List
+
+import pytest
+
+from mars_rover.domain import Coordinates
+from mars_rover.domain import Direction
+from mars_rover.domain import Position
+from mars_rover.domain import Rover
+from mars_rover.domain import Surface
+
+np = pytest.importorskip('numpy')
+# Added in Python 3.8.
+pytest.importorskip('multiprocessing.shared_memory')
+
+from mars_rover.fleet import VectorizedFleet  # noqa: E402
+from mars_rover.fleet.shared import SharedFleetState  # noqa: E402
+
+
+def positions(count: int) -> List[Position]:
+    return [
+        Position(Direction.for_symbol('NESW'[index % 4]), Coordinates(index % 6, index // 6 % 6))
+        for index in range(count)
+    ]
+
+
+def snapshots_of(name: str, count: int, connection: Connection) -> None:
+    # Tells whether every snapshot had all rovers at the same point, as the writer puts them.
+    state = SharedFleetState.attach(name)
+    consistent = True
+    for _ in range(count):
+        records = state.snapshot()
+        consistent &= bool((records['vertical'] == records['vertical'][0]).all())
+    state.close()
+    connection.send(consistent)
+
+
+class TestSharedFleetState:
+
+    def test_readers_see_positions_the_writer_publishes(self) -> None:
+        landed = positions(10)
+        with SharedFleetState.create(len(landed)) as state:
+            state.publish(landed)
+            reader = SharedFleetState.attach(state.name())
+            assert reader.positions() == landed
+            assert reader.generation() == 2
+            reader.close()
+
+    def test_publishes_rovers_as_they_move(self) -> None:
+        landed = positions(3)
+        rovers = [Rover(position) for position in landed]
+        with SharedFleetState.create(len(rovers)) as state:
+            state.publish(landed)
+            rovers[1].execute_all('ffr')
+            state.update(1, rovers[1].position())
+            assert state.positions() == [rover.position() for rover in rovers]
+
+    def test_publishes_vectorized_fleets(self) -> None:
+        landed = positions(20)
+        fleet = VectorizedFleet.landing_at(landed)
+        fleet.tick('f' * 20)
+        with SharedFleetState.create(len(fleet)) as state:
+            state.publish_fleet(fleet)
+            assert state.positions() == [fleet.position(index) for index in range(len(fleet))]
+
+    def test_only_the_creator_writes(self) -> None:
+        with SharedFleetState.create(1) as state:
+            reader = SharedFleetState.attach(state.name())
+            with pytest.raises(ValueError):
+                reader.update(0, Position(Direction.north(), Coordinates(0, 0)))
+            reader.close()
+
+    def test_snapshots_skip_records_not_matching_their_checksum(self) -> None:
+        landed = positions(10)
+        with SharedFleetState.create(len(landed)) as state:
+            state.publish(landed)
+            # A record changed behind the writer's back, as a torn copy would have it.
+            records = state._records
+            records['vertical'][3] += 1
+            restored = threading.Timer(0.05, records['vertical'].__setitem__, (3, records['vertical'][3] - 1))
+            restored.start()
+            assert state.positions() == landed
+            restored.join()
+
+    def test_snapshots_hold_positions_of_a_single_generation(self) -> None:
+        count = 50_000
+        with SharedFleetState.create(count) as state:
+            receiving, sending = multiprocessing.Pipe(duplex=False)
+            reader = multiprocessing.Process(target=snapshots_of, args=(state.name(), 200, sending))
+            reader.start()
+            horizontal = np.zeros(count, dtype=np.int64)
+            fleet = VectorizedFleet(horizontal, horizontal, horizontal, Surface.of_size(10 ** 6))
+            while not receiving.poll():
+                fleet.tick('f' * count)
+                state.publish_fleet(fleet)
+            reader.join()
+            assert receiving.recv()
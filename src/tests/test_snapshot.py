@@ -0,0 +1,163 @@
+import pathlib
+import random
+from typing import List
+
+import pytest
+
+from mars_rover.domain import Coordinates
+from mars_rover.domain import Direction
+from mars_rover.domain import Fleet
+from mars_rover.domain import Position
+from mars_rover.domain import Rover
+from mars_rover.domain import SparseObstacles
+from mars_rover.domain import Surface
+from mars_rover.snapshot import CheckpointedFleet
+from mars_rover.snapshot import CheckpointedMission
+from mars_rover.snapshot import FleetSnapshot
+from mars_rover.snapshot import RoverSnapshot
+
+
+def random_commands(length: int, seed: int = 0) -> str:
+    generator = random.Random(seed)
+    return ''.join(generator.choice('fblr') for _ in range(length))
+
+
+class TestRoverSnapshot:
+
+    def test_restores_rover_and_command_offset(self) -> None:
+        rover = Rover(Position(Direction.west(), Coordinates(10 ** 9, 7)), Surface.of_size(10 ** 9, 8))
+        snapshot = RoverSnapshot.from_bytes(RoverSnapshot.of(rover, 12345).to_bytes())
+        assert snapshot.rover().position() == rover.position()
+        assert snapshot.surface() == rover.surface()
+        assert snapshot.offset() == 12345
+
+    def test_is_compact(self) -> None:
+        rover = Rover(Position(Direction.west(), Coordinates(1, 2)))
+        assert len(RoverSnapshot.of(rover, 0).to_bytes()) == 45
+
+    @pytest.mark.parametrize('wrapping', [False, True])
+    def test_restores_whether_the_rover_wraps_around(self, wrapping: bool) -> None:
+        rover = Rover(Position(Direction.south(), Coordinates(1, 2)), wrapping=wrapping)
+        snapshot = RoverSnapshot.from_bytes(RoverSnapshot.of(rover, 0).to_bytes())
+        assert (snapshot.wraps(), snapshot.rover().wraps()) == (wrapping, wrapping)
+        assert snapshot.rover().position() == rover.position()
+
+    def test_can_not_be_read_from_other_data(self) -> None:
+        with pytest.raises(ValueError) as error:
+            RoverSnapshot.from_bytes(b'nonsense')
+        assert str(error.value) == 'Invalid rover snapshot'
+
+    def test_can_not_restore_rover_on_surface_of_another_size(self) -> None:
+        snapshot = RoverSnapshot.of(Rover(Position(Direction.west(), Coordinates(1, 2))), 0)
+        with pytest.raises(ValueError):
+            snapshot.rover(Surface.of_size(6))
+
+
+class TestFleetSnapshot:
+
+    def test_restores_fleet_and_command_offsets(self, tmp_path: pathlib.Path) -> None:
+        fleet = Fleet(Surface.of_size(20, 10))
+        fleet.land(Position(Direction.north(), Coordinates(3, 4)))
+        fleet.land(Position(Direction.south(), Coordinates(20, 10)))
+        path = str(tmp_path / 'fleet.snapshot')
+        FleetSnapshot.of(fleet, [7, 9]).save(path)
+        snapshot = FleetSnapshot.load(path)
+        assert snapshot.fleet().positions() == fleet.positions()
+        assert snapshot.offsets() == [7, 9]
+
+
+class TestCheckpointedMission:
+
+    @pytest.mark.parametrize('every_commands', [1, 7, 1000, 10 ** 6])
+    def test_ends_where_executing_all_commands_at_once_does(self, tmp_path: pathlib.Path, every_commands: int) -> None:
+        commands = random_commands(5000)
+        expected = Rover(Position(Direction.north(), Coordinates(2, 2)))
+        expected.execute_all(commands)
+        rover = Rover(Position(Direction.north(), Coordinates(2, 2)))
+        CheckpointedMission(str(tmp_path / 'rover.snapshot'), every_commands).run(rover, commands)
+        assert rover.position() == expected.position()
+        assert RoverSnapshot.load(str(tmp_path / 'rover.snapshot')).offset() == len(commands)
+
+    def test_resumes_from_the_latest_snapshot(self, tmp_path: pathlib.Path) -> None:
+        commands = random_commands(5000)
+        path = str(tmp_path / 'rover.snapshot')
+        expected = Rover(Position(Direction.north(), Coordinates(2, 2)))
+        expected.execute_all(commands)
+        # The process took a snapshot at command 3000 and died before the next one.
+        lost = Rover(Position(Direction.north(), Coordinates(2, 2)))
+        lost.execute_all(commands[:3000])
+        RoverSnapshot.of(lost, 3000).save(path)
+        lost.execute_all(commands[3000:3500])
+        resumed = CheckpointedMission(path, every_commands=1000).resume(commands)
+        assert resumed.position() == expected.position()
+        assert RoverSnapshot.load(path).offset() == len(commands)
+
+    def test_resumes_a_rover_wrapping_around_the_edges(self, tmp_path: pathlib.Path) -> None:
+        path = str(tmp_path / 'rover.snapshot')
+        expected = Rover(Position(Direction.north(), Coordinates(2, 2)), wrapping=True)
+        expected.execute_all('ffffff')
+        interrupted = Rover(Position(Direction.north(), Coordinates(2, 2)), wrapping=True)
+        interrupted.execute_all('ff')
+        RoverSnapshot.of(interrupted, 2).save(path)
+        resumed = CheckpointedMission(path).resume('ffffff')
+        assert (resumed.position(), resumed.wraps()) == (expected.position(), True)
+
+    def test_takes_snapshots_on_a_timer(self, tmp_path: pathlib.Path) -> None:
+        commands = random_commands(1000)
+        expected = Rover(Position(Direction.north(), Coordinates(2, 2)))
+        expected.execute_all(commands)
+        rover = Rover(Position(Direction.north(), Coordinates(2, 2)))
+        CheckpointedMission(str(tmp_path / 'rover.snapshot'), every_commands=100, every_seconds=0).run(rover, commands)
+        assert rover.position() == expected.position()
+
+    def test_stops_at_an_obstacle_like_executing_all_commands_at_once(self, tmp_path: pathlib.Path) -> None:
+        surface = Surface.of_size(5, obstacles=SparseObstacles.at([Coordinates(2, 4)]))
+        rover = Rover(Position(Direction.north(), Coordinates(2, 2)), surface)
+        CheckpointedMission(str(tmp_path / 'rover.snapshot'), every_commands=2).run(rover, 'ffffrff')
+        assert rover.position() == Position(Direction.north(), Coordinates(2, 3))
+
+
+def landed_fleet() -> Fleet:
+    # With these commands, the first rover runs into the obstacle and the fifth one into the sixth.
+    fleet = Fleet(Surface.of_size(99, obstacles=SparseObstacles.at([Coordinates(3, 5)])))
+    for horizontal in range(0, 100, 10):
+        fleet.land(Position(Direction.north(), Coordinates(horizontal, horizontal)))
+    return fleet
+
+
+def executed_until_blocked(fleet: Fleet, commands: List[str]) -> Fleet:
+    for rover, rover_commands in zip(fleet.rovers(), commands):
+        rover.execute_until_blocked(rover_commands)
+    return fleet
+
+
+class TestCheckpointedFleet:
+
+    @pytest.mark.parametrize('every_commands', [1, 7, 1000, 10 ** 6])
+    def test_ends_where_rovers_executing_until_blocked_do(self, tmp_path: pathlib.Path, every_commands: int) -> None:
+        commands = [random_commands(500, seed) for seed in range(10)]
+        expected = executed_until_blocked(landed_fleet(), commands)
+        fleet = landed_fleet()
+        path = str(tmp_path / 'fleet.snapshot')
+        CheckpointedFleet(path, every_commands).run(fleet, commands)
+        assert fleet.positions() == expected.positions()
+        assert FleetSnapshot.load(path).offsets() == [len(rover_commands) for rover_commands in commands]
+
+    def test_resumes_from_the_latest_snapshot(self, tmp_path: pathlib.Path) -> None:
+        commands = [random_commands(500, seed) for seed in range(10)]
+        path = str(tmp_path / 'fleet.snapshot')
+        expected = executed_until_blocked(landed_fleet(), commands)
+        # The process took a snapshot with the seventh rover halfway and died before the next one.
+        lost = executed_until_blocked(landed_fleet(), commands[:6] + [commands[6][:250]])
+        FleetSnapshot.of(lost, [500] * 6 + [250] + [0] * 3).save(path)
+        lost.rovers()[6].execute_all(commands[6][250:300])
+        resumed = CheckpointedFleet(path, every_commands=100).resume(commands)
+        assert resumed.positions() == expected.positions()
+        assert FleetSnapshot.load(path).offsets() == [500] * 10
+
+    def test_takes_snapshots_on_a_timer(self, tmp_path: pathlib.Path) -> None:
+        commands = [random_commands(100, seed) for seed in range(10)]
+        expected = executed_until_blocked(landed_fleet(), commands)
+        fleet = landed_fleet()
+        CheckpointedFleet(str(tmp_path / 'fleet.snapshot'), every_commands=30, every_seconds=0).run(fleet, commands)
+        assert fleet.positions() == expected.positions()
@@ -0,0 +1,79 @@
+import io
+import pathlib
+from typing import Any
+from typing import List
+
+import pytest
+
+from mars_rover.__main__ import main
+from mars_rover.domain import Coordinates
+from mars_rover.domain import SparseObstacles
+from mars_rover.domain import Surface
+from mars_rover.streaming import MissionReader
+from mars_rover.streaming import MissionReport
+
+
+class TestMissionReader:
+
+    def reports_from(self, missions: bytes, chunk_size: int) -> List[MissionReport]:
+        return list(MissionReader(chunk_size).reports_from(io.BytesIO(missions)))
+
+    @pytest.mark.parametrize('chunk_size', [1, 2, 3, 7, 1024])
+    def test_reports_final_position_of_each_rover(self, chunk_size: int) -> None:
+        reports = self.reports_from(b'1 2 N\nlflflflff\n3 3 E\nffrffrfrrf\n', chunk_size)
+        assert reports == [
+            MissionReport.position(1, 0, '1 3 N'),
+            MissionReport.position(3, 16, '5 1 E'),
+        ]
+
+    @pytest.mark.parametrize('chunk_size', [1, 2, 1024])
+    def test_accepts_windows_line_endings_and_missing_last_newline(self, chunk_size: int) -> None:
+        reports = self.reports_from(b'1 2 N\r\nff\r\n\r\n3 3 E\r\nf', chunk_size)
+        assert [report.output() for report in reports] == ['1 4 N', '4 3 E']
+
+    def test_rover_without_command_line_stays_where_it_landed(self) -> None:
+        assert self.reports_from(b'1 2 N', 1024) == [MissionReport.position(1, 0, '1 2 N')]
+
+    @pytest.mark.parametrize('chunk_size', [1, 4, 1024])
+    def test_reports_malformed_records_and_carries_on(self, chunk_size: int) -> None:
+        reports = self.reports_from(b'9 2 N\nff\n1 a N\nf\n1 1 N\nffxf\n2 2 S\nf\n', chunk_size)
+        assert [(report.line(), report.offset(), report.error()) for report in reports] == [
+            (1, 0, 'Rover outside the surface'),
+            (3, 9, 'Invalid position: 1 a N'),
+            (6, 25, "Unknown command: 'x' at index 2"),
+            (7, 28, None),
+        ]
+        assert reports[-1].output() == '2 1 S'
+
+    def test_rejects_overlong_landing_line(self) -> None:
+        reports = self.reports_from(b'1 ' + b'1' * 1000 + b' N\nf\n1 1 N\nf\n', 16)
+        assert str(reports[0].error()).startswith('Invalid position: 1 111')
+        assert reports[1:] == [MissionReport.position(3, 1007, '1 2 N')]
+
+    def test_executes_command_lines_longer_than_a_chunk(self) -> None:
+        reports = self.reports_from(b'0 0 N\n' + b'fb' * 100_000 + b'rf\n', 4096)
+        assert reports == [MissionReport.position(1, 0, '1 0 E')]
+
+    @pytest.mark.parametrize('chunk_size', [1, 2, 3, 4, 8, 1024])
+    def test_obstacle_stops_the_rest_of_the_command_line_in_any_chunk_size(self, chunk_size: int) -> None:
+        surface = Surface.of_size(5, obstacles=SparseObstacles.at([Coordinates(0, 2)]))
+        reader = MissionReader(chunk_size, surface)
+        reports = list(reader.reports_from(io.BytesIO(b'0 0 N\nffrfxf\n3 3 E\nf\n')))
+        assert reports == [MissionReport.position(1, 0, '0 1 N'), MissionReport.position(3, 13, '4 3 E')]
+
+
+class TestCommandLineInterface:
+
+    def test_prints_final_positions_and_reports_errors(self, tmp_path: pathlib.Path, capsys: Any) -> None:
+        missions = tmp_path / 'missions.txt'
+        missions.write_bytes(b'1 2 N\nlflflflff\n1 1 N\nx\n')
+        assert main([str(missions)]) == 1
+        output, errors = capsys.readouterr()
+        assert output == '1 3 N\n'
+        assert errors == "line 4, byte 22: Unknown command: 'x' at index 0\n"
+
+    def test_runs_missions_in_several_processes(self, tmp_path: pathlib.Path, capsys: Any) -> None:
+        missions = tmp_path / 'missions.txt'
+        missions.write_bytes(b'1 2 N\nlflflflff\n3 3 E\nffrffrfrrf\n')
+        assert main([str(missions), '--workers', '2', '--records-per-shard', '1']) == 0
+        assert capsys.readouterr() == ('1 3 N\n5 1 E\n', '')